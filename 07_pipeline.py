@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from src.usecases.load_csv_to_mariadb import load_data_from_csv
-from src.usecases.search_mongo import search_text_index
+from src.usecases.search_mongo import iter_search_text
 from src.usecases.transfer_mariadb_to_mongo import export_from_db
 
 
@@ -14,10 +14,8 @@ def main() -> None:
     mongo_articles = export_from_db()
     print("len mongo articles:", len(mongo_articles))
 
-    results = search_text_index(mongo_articles, "Hubble")
-    print("len results:", len(results))
-    for article in results:
-        print(f"{article.arxiv_id}: {article.title}")
+    for hit in iter_search_text("Hubble"):
+        print(f"{hit.arxiv_id}: {hit.title} ({hit.score:.2f})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from mongoengine import ValidationError
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+from mongoDB.mongodb_mongoengine import (
+    Profile,
+    User,
+    me_create_user,
+    me_get_user_by_id,
+    me_get_user_by_username,
+    me_update_user_email,
+)
+
+# Same shape as the me_get_user_* results.
+USER_PROJECTION = {"username": 1, "email": 1, "profile": 1, "created_at": 1}
+
+
+def users() -> Collection:
+    """The collection behind User, with its indexes (including unique username) ensured."""
+    collection: Collection = User._get_collection()
+    return collection
+
+
+def _object_id(user_id: str) -> ObjectId | None:
+    try:
+        return ObjectId(user_id)
+    except (InvalidId, TypeError):
+        return None
+
+
+def _to_user_dict(doc: dict[str, Any] | None) -> dict[str, Any] | None:
+    if doc is None:
+        return None
+    return {
+        "id": str(doc["_id"]),
+        "username": doc.get("username"),
+        "email": doc.get("email"),
+        "profile": doc.get("profile"),
+        "created_at": doc.get("created_at"),
+    }
+
+
+def raw_create_user(
+    username: str,
+    email: str,
+    first_name: str | None = None,
+    last_name: str | None = None,
+    age: int | None = None,
+) -> str | None:
+    """me_create_user without the existence check: the unique index rejects duplicates."""
+    profile: Profile | None = None
+    if first_name or last_name or age is not None:
+        profile = Profile(first_name=first_name, last_name=last_name, age=age)
+
+    user = User(username=username, email=email, profile=profile)
+    try:
+        user.validate()
+        result = users().insert_one(user.to_mongo())
+    except (ValidationError, DuplicateKeyError):
+        return None
+    return str(result.inserted_id)
+
+
+def raw_get_user_by_id(user_id: str) -> dict[str, Any] | None:
+    oid = _object_id(user_id)
+    if oid is None:
+        return None
+    return _to_user_dict(users().find_one({"_id": oid}, USER_PROJECTION))
+
+
+def raw_get_user_by_username(username: str) -> dict[str, Any] | None:
+    return _to_user_dict(users().find_one({"username": username}, USER_PROJECTION))
+
+
+def raw_update_user_email(user_id: str, new_email: str) -> bool:
+    oid = _object_id(user_id)
+    if oid is None:
+        return False
+    User.email.validate(new_email)
+    result = users().update_one({"_id": oid}, {"$set": {"email": new_email}})
+    return result.matched_count > 0
+
+
+def raw_update_user_profile(
+    user_id: str,
+    first_name: str | None = None,
+    last_name: str | None = None,
+    age: int | None = None,
+) -> bool:
+    oid = _object_id(user_id)
+    if oid is None:
+        return False
+
+    changes = {"first_name": first_name, "last_name": last_name, "age": age}
+    update: dict[str, Any] = {}
+    for name, value in changes.items():
+        if value is not None:
+            Profile._fields[name].validate(value)
+            update[f"profile.{name}"] = value
+    if not update:
+        return users().count_documents({"_id": oid}, limit=1) > 0
+
+    result = users().update_one({"_id": oid}, {"$set": update})
+    return result.matched_count > 0
+
+
+def _ops_per_sec(label: str, fn: Callable[[int], Any], n: int) -> float:
+    t0 = perf_counter()
+    for i in range(n):
+        fn(i)
+    rate = n / (perf_counter() - t0)
+    print(f"[bench] {label:<28} {rate:>10.0f} ops/s")
+    return rate
+
+
+def _bench_path(
+    prefix: str,
+    create: Callable[..., str | None],
+    get_by_id: Callable[[str], Any],
+    get_by_username: Callable[[str], Any],
+    update_email: Callable[[str, str], bool],
+    n: int,
+) -> dict[str, float]:
+    # Start each path from an empty collection so neither pays for the other's documents.
+    users().delete_many({})
+    ids: list[str] = []
+
+    def _create(i: int) -> None:
+        new_id = create(f"{prefix}-user-{i}", f"{prefix}{i}@example.com", age=30)
+        if new_id:
+            ids.append(new_id)
+
+    ops: dict[str, Callable[[int], Any]] = {
+        "create": _create,
+        "get_by_id": lambda i: get_by_id(ids[i]),
+        "get_by_username": lambda i: get_by_username(f"{prefix}-user-{i}"),
+        "update_email": lambda i: update_email(ids[i], f"new{i}@example.com"),
+        "duplicate create": lambda i: create(f"{prefix}-user-{i}", "dup@example.com"),
+    }
+    return {f"{prefix} {name}": _ops_per_sec(f"{prefix} {name}", fn, n) for name, fn in ops.items()}
+
+
+def benchmark(n: int = 2000) -> dict[str, float]:
+    """ops/sec of the ODM and raw paths on the currently connected database."""
+    return {
+        **_bench_path(
+            "odm",
+            me_create_user,
+            me_get_user_by_id,
+            me_get_user_by_username,
+            me_update_user_email,
+            n,
+        ),
+        **_bench_path(
+            "raw",
+            raw_create_user,
+            raw_get_user_by_id,
+            raw_get_user_by_username,
+            raw_update_user_email,
+            n,
+        ),
+    }
+
+
+if __name__ == "__main__":
+    from mongoengine import connect, disconnect
+
+    # MONGO_BENCH_URI points the benchmark at a real mongod; mongomock otherwise.
+    disconnect()
+    bench_uri = os.getenv("MONGO_BENCH_URI")
+    if bench_uri:
+        connect(db="dataeng_bench", host=bench_uri)
+    else:
+        import mongomock
+
+        connect(db="dataeng_bench", mongo_client_class=mongomock.MongoClient)
+    benchmark(int(os.getenv("BENCH_OPS", "2000")))
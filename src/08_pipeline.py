@@ -4,9 +4,9 @@ from .database import SessionLocal
 from .storage.mongodb import init_mongo
 from .usecases.arxiv_client import fetch_arxiv_to_dataframe
 from .usecases.html_content import add_html_content, add_text_from_html
-from .usecases.load_dataframe_mariadb import load_dataframe_into_mariadb
+from .usecases.load_dataframe_mariadb import load_dataframe_into_mariadb_bulk
 from .usecases.load_dataframe_mongodb import load_dataframe_into_mongodb
-from .usecases.mongo_search import search_by_text
+from .usecases.mongo_search import ensure_search_indexes, search_by_text
 
 
 def run_pipeline() -> None:
@@ -16,9 +16,10 @@ def run_pipeline() -> None:
 
     df = df.drop_duplicates(subset="arxiv_id").reset_index(drop=True)
 
-    df = load_dataframe_into_mariadb(df, SessionLocal)
+    df = load_dataframe_into_mariadb_bulk(df, SessionLocal)
 
     collection = init_mongo()
+    ensure_search_indexes(collection)
     load_dataframe_into_mongodb(df, collection)
 
     results = search_by_text(collection, "inflation")
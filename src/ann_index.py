@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from src.local_index import normalize_rows, top_k_indices
+
+# Rows scored per matmul when assigning vectors to centroids, bounding peak memory.
+_ASSIGN_CHUNK = 65_536
+
+
+def assign_to_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], _ASSIGN_CHUNK):
+        part = vectors[start : start + _ASSIGN_CHUNK]
+        labels[start : start + part.shape[0]] = np.argmax(part @ centroids.T, axis=1)
+    return labels
+
+
+def kmeans(
+    vectors: np.ndarray,
+    n_clusters: int,
+    n_iter: int = 20,
+    sample_size: int = 100_000,
+    seed: int = 0,
+    spherical: bool = True,
+) -> np.ndarray:
+    """Lloyd's k-means on a sample; spherical (cosine) by default."""
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    if n_clusters > n:
+        raise ValueError(f"Cannot train {n_clusters} clusters on {n} vectors")
+
+    sample = vectors[rng.choice(n, size=min(n, sample_size), replace=False)]
+    sample = np.asarray(sample, dtype=np.float32)
+    centroids = sample[rng.choice(sample.shape[0], size=n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        if spherical:
+            labels = assign_to_centroids(sample, centroids)
+        else:
+            dists = (
+                (sample**2).sum(axis=1, keepdims=True)
+                - 2.0 * sample @ centroids.T
+                + (centroids**2).sum(axis=1)
+            )
+            labels = np.argmin(dists, axis=1)
+
+        order = np.argsort(labels, kind="stable")
+        present, starts = np.unique(labels[order], return_index=True)
+        sums = np.zeros_like(centroids)
+        sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+        counts = np.bincount(labels, minlength=n_clusters)
+
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty clusters from random sample points.
+            sums[empty] = sample[rng.choice(sample.shape[0], size=int(empty.sum()))]
+            counts[empty] = 1
+        centroids = sums / counts[:, None].astype(np.float32)
+        if spherical:
+            centroids = normalize_rows(centroids)
+
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """Inverted-file ANN index over unit vectors (inner product == cosine).
+
+    Lists hold row ids only; candidates are scored against a matrix (or codes)
+    the caller keeps, so the vectors are not stored twice. `nprobe` trades
+    recall for latency: more probed lists, more rows scored.
+    """
+
+    def __init__(self, centroids: np.ndarray, nprobe: int = 8) -> None:
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.nprobe = nprobe
+        self.list_ids: list[np.ndarray] = [np.empty(0, dtype=np.int64) for _ in range(self.n_lists)]
+
+    @property
+    def n_lists(self) -> int:
+        return int(self.centroids.shape[0])
+
+    def __len__(self) -> int:
+        return sum(ids.shape[0] for ids in self.list_ids)
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        n_lists: int | None = None,
+        nprobe: int = 8,
+        n_iter: int = 20,
+        seed: int = 0,
+    ) -> IVFIndex:
+        """Train centroids on `vectors` and add them with ids 0..n-1."""
+        if n_lists is None:
+            n_lists = max(1, int(np.sqrt(vectors.shape[0])))
+        index = cls(kmeans(vectors, n_lists, n_iter=n_iter, seed=seed), nprobe=nprobe)
+        index.add(vectors, np.arange(vectors.shape[0], dtype=np.int64))
+        return index
+
+    def add(self, vectors: np.ndarray, ids: Sequence[int] | np.ndarray) -> None:
+        ids = np.asarray(ids, dtype=np.int64)
+        if vectors.shape[0] != ids.shape[0]:
+            raise ValueError("vectors and ids must have the same length")
+
+        labels = assign_to_centroids(vectors, self.centroids)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(self.n_lists + 1))
+        for lst in range(self.n_lists):
+            rows = order[bounds[lst] : bounds[lst + 1]]
+            if rows.size == 0:
+                continue
+            self.list_ids[lst] = np.concatenate([self.list_ids[lst], ids[rows]])
+
+    def candidates(self, query: np.ndarray, nprobe: int | None = None) -> np.ndarray:
+        """Sorted row ids in the `nprobe` lists closest to the unit-length `query`."""
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        probed = top_k_indices(self.centroids @ query, nprobe)
+        return np.sort(np.concatenate([self.list_ids[i] for i in probed]))
+
+    def search(
+        self,
+        query: Sequence[float] | np.ndarray,
+        vectors: np.ndarray,
+        top_k: int = 5,
+        nprobe: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """Exact scores of the probed candidates, read from `vectors` by row id."""
+        q = np.asarray(query, dtype=np.float32)
+        norm = float(np.linalg.norm(q))
+        if norm:
+            q = q / norm
+
+        ids = self.candidates(q, nprobe)
+        if ids.size == 0:
+            return []
+        scores = np.asarray(vectors[ids], dtype=np.float32) @ q
+        return [(int(ids[i]), float(scores[i])) for i in top_k_indices(scores, top_k)]
+
+    def save(self, path: str | Path) -> None:
+        sizes = np.array([ids.shape[0] for ids in self.list_ids], dtype=np.int64)
+        np.savez(
+            path,
+            centroids=self.centroids,
+            nprobe=np.array(self.nprobe),
+            sizes=sizes,
+            ids=np.concatenate(self.list_ids),
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> IVFIndex:
+        # Files written before lists dropped their vectors still load; the
+        # "vectors" array in them is simply not read.
+        with np.load(path) as data:
+            index = cls(data["centroids"], nprobe=int(data["nprobe"]))
+            offsets = np.concatenate([[0], np.cumsum(data["sizes"])])
+            ids = data["ids"]
+            for lst in range(index.n_lists):
+                index.list_ids[lst] = ids[offsets[lst] : offsets[lst + 1]]
+        return index
+
+
+def recall_at_k(
+    exact: Callable[[np.ndarray, int], list[tuple[int, float]]],
+    approx: Callable[[np.ndarray, int], list[tuple[int, float]]],
+    queries: np.ndarray,
+    k: int = 10,
+) -> float:
+    hits = 0
+    for q in queries:
+        truth = {i for i, _ in exact(q, k)}
+        hits += len(truth & {i for i, _ in approx(q, k)})
+    return hits / (len(queries) * k)
+
+
+def benchmark_ivf(
+    vectors: np.ndarray,
+    n_queries: int = 200,
+    k: int = 10,
+    nprobes: Sequence[int] = (1, 2, 4, 8, 16, 32),
+    n_lists: int | None = None,
+    seed: int = 0,
+) -> list[dict[str, float]]:
+    """Recall@k and mean latency of IVF search against exact brute force."""
+    vectors = normalize_rows(vectors)
+    rng = np.random.default_rng(seed)
+    queries = vectors[rng.choice(vectors.shape[0], size=n_queries, replace=False)]
+    queries = normalize_rows(queries + rng.normal(0, 0.05, queries.shape).astype(np.float32))
+
+    def exact(q: np.ndarray, top_k: int) -> list[tuple[int, float]]:
+        scores = vectors @ q
+        return [(int(i), float(scores[i])) for i in top_k_indices(scores, top_k)]
+
+    t0 = perf_counter()
+    index = IVFIndex.train(vectors, n_lists=n_lists, seed=seed)
+    train_s = perf_counter() - t0
+    print(f"[ivf] trained {index.n_lists} lists on {len(index)} vectors in {train_s:.2f} s")
+
+    t0 = perf_counter()
+    for q in queries:
+        exact(q, k)
+    exact_ms = (perf_counter() - t0) * 1000.0 / n_queries
+    print(f"[exact] {exact_ms:.3f} ms/query")
+
+    rows: list[dict[str, float]] = []
+    for nprobe in nprobes:
+        if nprobe > index.n_lists:
+            break
+
+        def approx(q: np.ndarray, top_k: int, nprobe: int = nprobe) -> list[tuple[int, float]]:
+            return index.search(q, vectors, top_k, nprobe=nprobe)
+
+        t0 = perf_counter()
+        for q in queries:
+            approx(q, k)
+        ms = (perf_counter() - t0) * 1000.0 / n_queries
+        recall = recall_at_k(exact, approx, queries, k)
+        print(f"[ivf] nprobe={nprobe:<3} recall@{k}={recall:.3f} {ms:.3f} ms/query")
+        rows.append({"nprobe": nprobe, "recall": recall, "ms_per_query": ms})
+    return rows
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    # Clustered synthetic data at the Gemini embedding dimension.
+    centers = rng.standard_normal((200, 768)).astype(np.float32)
+    data = centers[rng.integers(0, 200, 100_000)] + rng.normal(0, 0.6, (100_000, 768))
+    benchmark_ivf(data.astype(np.float32))
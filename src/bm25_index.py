@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import re
+from array import array
+from collections import Counter
+from collections.abc import Hashable, Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class _Postings:
+    """Doc ids stored as gaps from the previous id, term frequencies alongside."""
+
+    __slots__ = ("gaps", "tfs", "last_doc")
+
+    def __init__(self) -> None:
+        self.gaps = array("I")
+        self.tfs = array("H")
+        self.last_doc = -1
+
+    def append(self, doc: int, tf: int) -> None:
+        self.gaps.append(doc - self.last_doc if self.last_doc >= 0 else doc)
+        self.tfs.append(min(tf, 0xFFFF))
+        self.last_doc = doc
+
+    def decode(self) -> tuple[np.ndarray, np.ndarray]:
+        docs = np.cumsum(np.frombuffer(self.gaps, dtype=np.uint32), dtype=np.int64)
+        return docs, np.frombuffer(self.tfs, dtype=np.uint16).astype(np.float32)
+
+
+class BM25Index:
+    """In-process inverted index with Okapi BM25 scoring.
+
+    Documents are appended with increasing internal ids, so posting lists stay
+    sorted and can be delta-encoded. Re-adding a key tombstones its old version.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, _Postings] = {}
+        self.doc_len = array("I")
+        self.keys: list[Hashable] = []
+        self.payloads: dict[int, dict[str, Any]] = {}
+        self._doc_of: dict[Hashable, int] = {}
+        self._deleted: set[int] = set()
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._doc_of
+
+    def add(self, key: Hashable, text: str, payload: dict[str, Any] | None = None) -> None:
+        if key in self._doc_of:
+            self.remove(key)
+
+        doc = len(self.keys)
+        terms = Counter(tokenize(text))
+        length = sum(terms.values())
+
+        self.keys.append(key)
+        self.doc_len.append(length)
+        self._doc_of[key] = doc
+        self._total_len += length
+        if payload is not None:
+            self.payloads[doc] = payload
+
+        for term, tf in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = _Postings()
+            postings.append(doc, tf)
+
+    def add_many(
+        self,
+        keys: Iterable[Hashable],
+        texts: Iterable[str],
+        payloads: Iterable[dict[str, Any] | None] | None = None,
+    ) -> None:
+        if payloads is None:
+            for key, text in zip(keys, texts, strict=True):
+                self.add(key, text)
+        else:
+            for key, text, payload in zip(keys, texts, payloads, strict=True):
+                self.add(key, text, payload)
+
+    def remove(self, key: Hashable) -> None:
+        doc = self._doc_of.pop(key, None)
+        if doc is None:
+            return
+        self._deleted.add(doc)
+        self._total_len -= self.doc_len[doc]
+        self.payloads.pop(doc, None)
+
+    def payload(self, key: Hashable) -> dict[str, Any] | None:
+        doc = self._doc_of.get(key)
+        return None if doc is None else self.payloads.get(doc)
+
+    def search(self, query: str, top_k: int = 10) -> list[tuple[Hashable, float]]:
+        n_docs = len(self._doc_of)
+        if n_docs == 0:
+            return []
+
+        avgdl = self._total_len / n_docs or 1.0
+        doc_len = np.frombuffer(self.doc_len, dtype=np.uint32).astype(np.float32)
+        norm = self.k1 * (1.0 - self.b + self.b * doc_len / avgdl)
+        scores = np.zeros(len(self.keys), dtype=np.float32)
+        deleted = np.fromiter(self._deleted, dtype=np.int64, count=len(self._deleted))
+
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            docs, tf = postings.decode()
+            df = docs.size - int(np.isin(docs, deleted).sum()) if deleted.size else docs.size
+            if df == 0:
+                continue
+            idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            scores[docs] += idf * tf * (self.k1 + 1.0) / (tf + norm[docs])
+
+        if deleted.size:
+            scores[deleted] = 0.0
+        hits = np.flatnonzero(scores)
+        if hits.size == 0:
+            return []
+        top = hits[np.argsort(-scores[hits], kind="stable")[:top_k]]
+        return [(self.keys[i], float(scores[i])) for i in top]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = 60,
+) -> list[tuple[Hashable, float]]:
+    """Fuse ranked key lists: score(key) = sum over lists of 1 / (k + rank)."""
+    fused: dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
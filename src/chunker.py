@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+_WORD_RE = re.compile(r"\S+")
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+CHUNK_SCHEMA = pa.schema(
+    [
+        ("article_id", pa.string()),
+        ("chunk_index", pa.int64()),
+        ("chunk_text", pa.string()),
+        ("char_start", pa.int64()),
+        ("char_end", pa.int64()),
+    ]
+)
+
+
+@dataclass(frozen=True)
+class Chunk:
+    index: int
+    start: int
+    end: int
+    text: str
+
+
+def _windows(
+    spans: Iterable[tuple[int, int]],
+    chunk_size: int,
+    overlap: int,
+) -> Iterator[list[tuple[int, int]]]:
+    """Overlapping windows of `chunk_size` spans, stepping by `chunk_size - overlap`.
+
+    Matches the slicing of the original word chunker: the last window is only
+    emitted when it contains spans not already covered by the previous one.
+    """
+    step = chunk_size - overlap
+    if step <= 0:
+        raise ValueError("overlap must be smaller than chunk_size")
+
+    window: deque[tuple[int, int]] = deque()
+    unseen = 0
+    for span in spans:
+        window.append(span)
+        unseen += 1
+        if len(window) == chunk_size:
+            yield list(window)
+            unseen = 0
+            for _ in range(step):
+                window.popleft()
+    if window and unseen:
+        yield list(window)
+
+
+def _sentence_spans(text: str) -> Iterator[tuple[int, int]]:
+    pos = 0
+    for m in _SENTENCE_END_RE.finditer(text):
+        if text[pos : m.start()].strip():
+            yield pos, m.start()
+        pos = m.end()
+    if text[pos:].strip():
+        yield pos, len(text.rstrip())
+
+
+def _iter_sentence_chunks(text: str, chunk_size: int, overlap: int) -> Iterator[Chunk]:
+    """Pack whole sentences up to `chunk_size` words; carry trailing sentences
+    totalling at most `overlap` words into the next chunk, as far as they fit
+    next to the sentence that starts it. Sentences longer than `chunk_size`
+    fall back to word windows."""
+    index = 0
+    current: list[tuple[int, int, int]] = []  # (start, end, n_words)
+    words = 0
+    fresh = False
+
+    def _flush() -> Chunk:
+        nonlocal index
+        start, end = current[0][0], current[-1][1]
+        chunk = Chunk(index, start, end, " ".join(text[start:end].split()))
+        index += 1
+        return chunk
+
+    for s_start, s_end in _sentence_spans(text):
+        n = len(_WORD_RE.findall(text, s_start, s_end))
+        if n > chunk_size:
+            if current and fresh:
+                yield _flush()
+            current, words, fresh = [], 0, False
+            word_spans = ((m.start(), m.end()) for m in _WORD_RE.finditer(text, s_start, s_end))
+            for window in _windows(word_spans, chunk_size, overlap):
+                start, end = window[0][0], window[-1][1]
+                yield Chunk(index, start, end, " ".join(text[s:e] for s, e in window))
+                index += 1
+            continue
+
+        if words + n > chunk_size and current:
+            yield _flush()
+            kept: list[tuple[int, int, int]] = []
+            kept_words = 0
+            for sent in reversed(current):
+                if kept_words + sent[2] > overlap:
+                    break
+                kept.insert(0, sent)
+                kept_words += sent[2]
+            # The carried overlap must leave room for the new sentence.
+            while kept and kept_words + n > chunk_size:
+                kept_words -= kept.pop(0)[2]
+            current, words = kept, kept_words
+        current.append((s_start, s_end, n))
+        words += n
+        fresh = True
+
+    if current and fresh:
+        yield _flush()
+
+
+def iter_chunks(
+    text: str,
+    chunk_size: int = 200,
+    overlap: int = 50,
+    strategy: str = "words",
+) -> Iterator[Chunk]:
+    """Yield chunks with [start, end) character offsets into `text`.
+
+    strategy:
+      "words"     -- whitespace words; text is the words joined by single spaces
+                     (identical to the original chunk_text output).
+      "tokens"    -- word/punctuation tokens; text is the original slice.
+      "sentences" -- whole sentences packed up to `chunk_size` words.
+    """
+    if strategy == "sentences":
+        yield from _iter_sentence_chunks(text, chunk_size, overlap)
+        return
+
+    if strategy == "words":
+        spans = ((m.start(), m.end()) for m in _WORD_RE.finditer(text))
+        for i, window in enumerate(_windows(spans, chunk_size, overlap)):
+            start, end = window[0][0], window[-1][1]
+            yield Chunk(i, start, end, " ".join(text[s:e] for s, e in window))
+    elif strategy == "tokens":
+        spans = ((m.start(), m.end()) for m in _TOKEN_RE.finditer(text))
+        for i, window in enumerate(_windows(spans, chunk_size, overlap)):
+            start, end = window[0][0], window[-1][1]
+            yield Chunk(i, start, end, text[start:end])
+    else:
+        raise ValueError(f"Unknown chunking strategy: {strategy!r}")
+
+
+def iter_chunk_batches(
+    articles: Iterable[tuple[str, str]],
+    batch_rows: int = 10_000,
+    chunk_size: int = 200,
+    overlap: int = 50,
+    strategy: str = "words",
+) -> Iterator[pa.RecordBatch]:
+    """Chunk (article_id, text) pairs into record batches of at most `batch_rows`."""
+    columns: dict[str, list] = {name: [] for name in CHUNK_SCHEMA.names}
+
+    def _batch() -> pa.RecordBatch:
+        batch = pa.RecordBatch.from_pydict(columns, schema=CHUNK_SCHEMA)
+        for values in columns.values():
+            values.clear()
+        return batch
+
+    for article_id, text in articles:
+        for chunk in iter_chunks(text, chunk_size, overlap, strategy):
+            columns["article_id"].append(str(article_id))
+            columns["chunk_index"].append(chunk.index)
+            columns["chunk_text"].append(chunk.text)
+            columns["char_start"].append(chunk.start)
+            columns["char_end"].append(chunk.end)
+            if len(columns["chunk_index"]) >= batch_rows:
+                yield _batch()
+
+    if columns["chunk_index"]:
+        yield _batch()
+
+
+def write_chunks_parquet(
+    articles: Iterable[tuple[str, str]],
+    path: str | Path,
+    batch_rows: int = 10_000,
+    chunk_size: int = 200,
+    overlap: int = 50,
+    strategy: str = "words",
+) -> int:
+    """Stream chunks of `articles` into a parquet file; returns the row count."""
+    rows = 0
+    with pq.ParquetWriter(str(path), CHUNK_SCHEMA) as writer:
+        for batch in iter_chunk_batches(articles, batch_rows, chunk_size, overlap, strategy):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+from collections.abc import Callable, Iterable, Iterator
+from functools import cache
+from multiprocessing.pool import Pool
+from pathlib import Path
+
+from src.pdf_extract import pdf_text
+
+DOCUMENT_STORE_DIR = os.getenv("DOCUMENT_STORE_DIR", "data/document_store")
+CONVERT_TIMEOUT = float(os.getenv("DOCUMENT_CONVERT_TIMEOUT", "120"))
+
+
+def pdf_to_text(path: str) -> str:
+    """Plain text, pages joined by newlines, via the per-page cache of pdf_extract."""
+    return pdf_text(path)
+
+
+def pdf_to_markdown(path: str) -> str:
+    import pymupdf4llm
+
+    return pymupdf4llm.to_markdown(path)
+
+
+CONVERTERS: dict[str, tuple[str, Callable[[str], str]]] = {
+    "text": (".txt", pdf_to_text),
+    "markdown": (".md", pdf_to_markdown),
+}
+
+
+def file_digest(path: str | Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _convert(fmt: str, path: str) -> str:
+    return CONVERTERS[fmt][1](path)
+
+
+def _convert_safe(fmt: str, path: str) -> tuple[str | None, str | None]:
+    # Runs in pool workers: an extractor error comes back as a message rather
+    # than an exception, which may not survive pickling to the parent.
+    try:
+        return _convert(fmt, path), None
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+class DocumentStore:
+    """Converted documents keyed by the sha256 of the source file's bytes.
+
+    Every format of one file lives side by side under <root>/<aa>/<digest>.<ext>,
+    so a renamed or re-downloaded copy of the same PDF is never converted again.
+    """
+
+    def __init__(self, root: str | Path = DOCUMENT_STORE_DIR) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._pool: Pool | None = None
+        self._pool_workers = 0
+
+    def _get_pool(self, workers: int) -> Pool:
+        # One pool per store, reused across calls; rebuilt only when the size
+        # changes or a timed-out conversion left a worker stuck.
+        if self._pool is None or self._pool_workers != workers:
+            self.close()
+            self._pool = multiprocessing.Pool(workers)
+            self._pool_workers = workers
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def _entry(self, digest: str, fmt: str) -> Path:
+        if fmt not in CONVERTERS:
+            raise ValueError(f"Unknown document format: {fmt!r}")
+        return self.root / digest[:2] / f"{digest}{CONVERTERS[fmt][0]}"
+
+    def read(self, digest: str, fmt: str) -> str | None:
+        entry = self._entry(digest, fmt)
+        return entry.read_text(encoding="utf-8") if entry.is_file() else None
+
+    def write(self, digest: str, fmt: str, content: str) -> None:
+        entry = self._entry(digest, fmt)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, entry)
+
+    def get(self, path: str | Path, fmt: str) -> str:
+        """Stored conversion of `path`, converting in-process on a miss."""
+        digest = file_digest(path)
+        content = self.read(digest, fmt)
+        if content is None:
+            content = _convert(fmt, str(path))
+            self.write(digest, fmt, content)
+        return content
+
+    def iter_converted(
+        self,
+        paths: Iterable[str | Path],
+        fmt: str,
+        workers: int | None = None,
+        timeout: float = CONVERT_TIMEOUT,
+    ) -> Iterator[tuple[Path, str | None]]:
+        """Yield (path, content) in input order; content is None when conversion
+        failed or took longer than `timeout` seconds.
+
+        Misses are converted on the store's process pool, which is kept for later
+        calls. A conversion that times out keeps its worker busy, so the pool is
+        replaced once this call finishes; the other conversions carry on meanwhile.
+        """
+        items: list[tuple[Path, str | None]] = []
+        for p in paths:
+            try:
+                items.append((Path(p), file_digest(p)))
+            except OSError as exc:
+                print(f"Conversion failed ({fmt}): {p} → {exc}")
+                items.append((Path(p), None))
+
+        found: dict[str | None, str | None] = {None: None}
+        for _, digest in items:
+            if digest is not None and digest not in found:
+                found[digest] = self.read(digest, fmt)
+        missing = [d for d, content in found.items() if d is not None and content is None]
+
+        if not missing:
+            for path, digest in items:
+                yield path, found[digest]
+            return
+
+        source = {digest: str(path) for path, digest in reversed(items) if digest is not None}
+        pool = self._get_pool(workers or os.cpu_count() or 1)
+        pending = {d: pool.apply_async(_convert_safe, (fmt, source[d])) for d in missing}
+        timed_out = False
+        try:
+            for path, digest in items:
+                if digest is not None and digest in pending:
+                    content: str | None = None
+                    try:
+                        content, error = pending.pop(digest).get(timeout=timeout)
+                    except multiprocessing.TimeoutError:
+                        timed_out = True
+                        print(f"Conversion timed out ({fmt}): {path}")
+                    else:
+                        if content is None:
+                            print(f"Conversion failed ({fmt}): {path} → {error}")
+                        else:
+                            self.write(digest, fmt, content)
+                    found[digest] = content
+                yield path, found[digest]
+        finally:
+            if timed_out:
+                self.close()
+
+
+@cache
+def get_document_store() -> DocumentStore:
+    return DocumentStore()
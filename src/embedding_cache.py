@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.sqlite")
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Stay well below SQLite's host-parameter limit when looking up many keys at once.
+_LOOKUP_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Persistent (model, task_type, text hash) -> float32 vector store with LRU eviction."""
+
+    def __init__(
+        self,
+        path: str | Path = EMBEDDING_CACHE_PATH,
+        max_bytes: int = EMBEDDING_CACHE_MAX_BYTES,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                task_type TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (model, task_type, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_embeddings_last_access ON embeddings (last_access)"
+        )
+        self._conn.commit()
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+        self._total_bytes = int(row[0])
+
+    def get_many(
+        self,
+        model: str,
+        task_type: str,
+        texts: Sequence[str],
+    ) -> list[list[float] | None]:
+        hashes = [text_hash(t) for t in texts]
+        found: dict[str, bytes] = {}
+        now = time.time()
+
+        with self._lock:
+            unique = list(dict.fromkeys(hashes))
+            for i in range(0, len(unique), _LOOKUP_CHUNK):
+                part = unique[i : i + _LOOKUP_CHUNK]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND task_type = ? AND text_hash IN ({marks})",
+                    (model, task_type, *part),
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? "
+                    "WHERE model = ? AND task_type = ? AND text_hash = ?",
+                    [(now, model, task_type, h) for h in found],
+                )
+                self._conn.commit()
+
+            results: list[list[float] | None] = []
+            for h in hashes:
+                blob = found.get(h)
+                if blob is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    results.append(np.frombuffer(blob, dtype=np.float32).tolist())
+        return results
+
+    def get(self, model: str, task_type: str, text: str) -> list[float] | None:
+        return self.get_many(model, task_type, [text])[0]
+
+    def put_many(
+        self,
+        model: str,
+        task_type: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+    ) -> None:
+        now = time.time()
+        by_hash = {
+            text_hash(t): np.asarray(e, dtype=np.float32).tobytes()
+            for t, e in zip(texts, embeddings, strict=True)
+        }
+        rows = [(model, task_type, h, blob, now) for h, blob in by_hash.items()]
+        if not rows:
+            return
+
+        with self._lock:
+            for i in range(0, len(rows), _LOOKUP_CHUNK):
+                part = rows[i : i + _LOOKUP_CHUNK]
+                marks = ",".join("?" * len(part))
+                (replaced,) = self._conn.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings "
+                    f"WHERE model = ? AND task_type = ? AND text_hash IN ({marks})",
+                    (model, task_type, *[r[2] for r in part]),
+                ).fetchone()
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings "
+                    "(model, task_type, text_hash, vector, last_access) VALUES (?, ?, ?, ?, ?)",
+                    part,
+                )
+                self._total_bytes += sum(len(r[3]) for r in part) - int(replaced)
+            self._evict()
+            self._conn.commit()
+
+    def put(self, model: str, task_type: str, text: str, embedding: Sequence[float]) -> None:
+        self.put_many(model, task_type, [text], [embedding])
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes:
+            victims = self._conn.execute(
+                "SELECT model, task_type, text_hash, LENGTH(vector) FROM embeddings "
+                "ORDER BY last_access LIMIT 256"
+            ).fetchall()
+            if not victims:
+                self._total_bytes = 0
+                return
+            for model, task_type, h, size in victims:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE model = ? AND task_type = ? AND text_hash = ?",
+                    (model, task_type, h),
+                )
+                self._total_bytes -= int(size)
+                if self._total_bytes <= self.max_bytes:
+                    return
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": int(entries),
+            "bytes": self._total_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> EmbeddingCache:
+    return EmbeddingCache()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol, TypeVar, cast
+
+import google.generativeai as genai
+import numpy as np
+from google.api_core import exceptions as google_exceptions
+
+from src.embedding_cache import EmbeddingCache
+
+EMBEDDING_MODEL = "text-embedding-004"
+EMBEDDING_DIM = 768
+TASK_TYPE = "SEMANTIC_SIMILARITY"
+
+# batchEmbedContents accepts at most 100 contents per request.
+MAX_BATCH_SIZE = 100
+DEFAULT_REQUESTS_PER_MINUTE = 1500.0
+
+T = TypeVar("T")
+
+
+class EmbeddingBackend(Protocol):
+    model: str
+    retryable: tuple[type[BaseException], ...]
+
+    def embed_batch(self, texts: Sequence[str], task_type: str) -> list[list[float]]: ...
+
+
+class GeminiBackend:
+    """Sends one multi-content embed request per batch. genai must be configured."""
+
+    retryable: tuple[type[BaseException], ...] = (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+    )
+
+    def __init__(self, model: str = EMBEDDING_MODEL) -> None:
+        self.model = model
+
+    def embed_batch(self, texts: Sequence[str], task_type: str) -> list[list[float]]:
+        result = genai.embed_content(
+            model=self.model,
+            content=list(texts),
+            task_type=task_type,
+        )
+        # With a list of contents, "embedding" holds one vector per content.
+        embeddings = cast(list[list[float]], result["embedding"])
+        return [[float(x) for x in emb] for emb in embeddings]
+
+
+class StubBackend:
+    """Deterministic, offline backend: the same text always maps to the same unit vector."""
+
+    retryable: tuple[type[BaseException], ...] = ()
+
+    def __init__(self, dim: int = EMBEDDING_DIM, model: str = "stub") -> None:
+        self.dim = dim
+        self.model = model
+        self.calls = 0
+
+    def embed_batch(self, texts: Sequence[str], task_type: str) -> list[list[float]]:
+        self.calls += 1
+        out: list[list[float]] = []
+        for text in texts:
+            digest = hashlib.sha256(f"{task_type}\0{text}".encode()).digest()
+            rng = np.random.default_rng(int.from_bytes(digest[:8], "little"))
+            vec = rng.standard_normal(self.dim).astype(np.float32)
+            vec /= np.linalg.norm(vec)
+            out.append(vec.tolist())
+        return out
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `acquire` blocks until enough tokens are available."""
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, capacity: float = 1.0) -> TokenBucket:
+        return cls(requests_per_minute / 60.0, capacity)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.capacity}")
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._updated
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    retryable: tuple[type[BaseException], ...],
+    max_attempts: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+) -> T:
+    """Call `fn`, retrying `retryable` errors with full-jitter exponential backoff."""
+    for attempt in range(max_attempts):
+        try:
+            return fn()
+        except retryable:
+            if attempt == max_attempts - 1:
+                raise
+            time.sleep(random.uniform(0.0, min(max_delay, base_delay * 2**attempt)))
+    raise RuntimeError("max_attempts must be at least 1")
+
+
+class EmbeddingEngine:
+    """Embeds texts in batches on a bounded thread pool, keeping input order.
+
+    With a cache, only texts missing from it are sent to the backend.
+    """
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        batch_size: int = MAX_BATCH_SIZE,
+        max_workers: int = 4,
+        requests_per_minute: float | None = DEFAULT_REQUESTS_PER_MINUTE,
+        max_attempts: int = 5,
+        task_type: str = TASK_TYPE,
+        cache: EmbeddingCache | None = None,
+    ) -> None:
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.task_type = task_type
+        self.cache = cache
+        self.limiter = TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+
+    def _embed_batch(self, batch: Sequence[str]) -> list[list[float]]:
+        def _call() -> list[list[float]]:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            return self.backend.embed_batch(batch, self.task_type)
+
+        embeddings = call_with_retry(_call, self.backend.retryable, self.max_attempts)
+        if len(embeddings) != len(batch):
+            raise RuntimeError(
+                f"Backend returned {len(embeddings)} embeddings for {len(batch)} texts"
+            )
+        return embeddings
+
+    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        texts = list(texts)
+        if self.cache is None:
+            return self._embed_uncached(texts)
+
+        cached = self.cache.get_many(self.backend.model, self.task_type, texts)
+        missing = list(
+            dict.fromkeys(t for t, emb in zip(texts, cached, strict=True) if emb is None)
+        )
+        fresh: dict[str, list[float]] = {}
+        if missing:
+            fresh = dict(zip(missing, self._embed_uncached(missing), strict=True))
+            self.cache.put_many(self.backend.model, self.task_type, missing, list(fresh.values()))
+        return [emb if emb is not None else fresh[t] for t, emb in zip(texts, cached, strict=True)]
+
+    def _embed_uncached(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        batches = [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1 or self.max_workers <= 1:
+            results = [self._embed_batch(b) for b in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(self._embed_batch, batches))
+
+        return [emb for batch in results for emb in batch]
@@ -1,11 +1,19 @@
 import os
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import cast
 
 import google.generativeai as genai
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from dotenv import load_dotenv
-from pypdf import PdfReader
+
+from src.chunker import iter_chunk_batches, iter_chunks
+from src.document_store import get_document_store
+from src.embedding_cache import get_embedding_cache
+from src.embedding_engine import EmbeddingEngine, GeminiBackend
 
 EMBEDDING_MODEL = "text-embedding-004"
 
@@ -17,47 +25,30 @@ if not api_key:
 genai.configure(api_key=api_key)
 
 
-def load_papers_from_pdf(papers_dir: str = "papers") -> pd.DataFrame:
-    base = Path(papers_dir)
-    rows = []
-
-    for pdf_path in base.glob("*.pdf"):
-        reader = PdfReader(str(pdf_path))
-        texts = []
-        for page in reader.pages:
-            t = page.extract_text() or ""
-            texts.append(t)
-        full_text = "\n".join(texts)
-
-        rows.append(
-            {
-                "article_id": pdf_path.stem,
-                "filename": pdf_path.name,
-                "text": full_text,
-            }
-        )
+def iter_papers_text(
+    papers_dir: str = "papers", workers: int | None = None
+) -> Iterator[tuple[str, str]]:
+    """(article_id, text) per PDF, read from the content-hashed document store.
 
-    return pd.DataFrame(rows)
+    Misses are converted on the store's pool through the per-page cache of
+    pdf_extract; PDFs that fail to convert are skipped.
+    """
+    paths = sorted(Path(papers_dir).glob("*.pdf"))
+    for path, text in get_document_store().iter_converted(paths, "text", workers=workers):
+        if text is not None:
+            yield path.stem, text
 
 
-def chunk_text(text: str, chunk_size: int = 200, overlap: int = 50) -> list[str]:
-    words = text.split()
-    if not words:
-        return []
-
-    step = chunk_size - overlap
-    chunks: list[str] = []
+def load_papers_from_pdf(papers_dir: str = "papers", workers: int | None = None) -> pd.DataFrame:
+    rows = [
+        {"article_id": article_id, "filename": f"{article_id}.pdf", "text": full_text}
+        for article_id, full_text in iter_papers_text(papers_dir, workers=workers)
+    ]
+    return pd.DataFrame(rows)
 
-    for start in range(0, len(words), step):
-        end = start + chunk_size
-        chunk_words = words[start:end]
-        if not chunk_words:
-            break
-        chunks.append(" ".join(chunk_words))
-        if end >= len(words):
-            break
 
-    return chunks
+def chunk_text(text: str, chunk_size: int = 200, overlap: int = 50) -> list[str]:
+    return [chunk.text for chunk in iter_chunks(text, chunk_size, overlap)]
 
 
 def make_chunk_df(
@@ -66,24 +57,25 @@ def make_chunk_df(
     id_col: str = "article_id",
     chunk_size: int = 200,
     overlap: int = 50,
+    strategy: str = "words",
 ) -> pd.DataFrame:
-    rows = []
-    for _, row in df.iterrows():
-        article_id = row[id_col]
-        text = str(row[text_col])
-        chunks = chunk_text(text, chunk_size, overlap)
-        for idx, ch in enumerate(chunks):
-            rows.append(
-                {
-                    "article_id": article_id,
-                    "chunk_index": idx,
-                    "chunk_text": ch,
-                }
-            )
-    return pd.DataFrame(rows)
+    articles = zip(df[id_col].astype(str), df[text_col].astype(str), strict=True)
+    batches = list(
+        iter_chunk_batches(articles, chunk_size=chunk_size, overlap=overlap, strategy=strategy)
+    )
+    if not batches:
+        return pd.DataFrame(
+            columns=["article_id", "chunk_index", "chunk_text", "char_start", "char_end"]
+        )
+    return pa.Table.from_batches(batches).to_pandas()
 
 
 def embed_chunk(text: str) -> list[float]:
+    cache = get_embedding_cache()
+    cached = cache.get(EMBEDDING_MODEL, "SEMANTIC_SIMILARITY", text)
+    if cached is not None:
+        return cached
+
     result = genai.embed_content(
         model=EMBEDDING_MODEL,
         content=text,
@@ -91,29 +83,63 @@ def embed_chunk(text: str) -> list[float]:
     )
 
     embedding = cast(list[float], result["embedding"])
+    cache.put(EMBEDDING_MODEL, "SEMANTIC_SIMILARITY", text, embedding)
     return embedding
 
 
-def embed_chunks_df(df_chunks: pd.DataFrame) -> pd.DataFrame:
-    embeddings = []
-    for t in df_chunks["chunk_text"]:
-        emb = embed_chunk(t)
-        embeddings.append(emb)
+def embed_chunks_df(
+    df_chunks: pd.DataFrame,
+    engine: EmbeddingEngine | None = None,
+) -> pd.DataFrame:
+    if engine is None:
+        engine = EmbeddingEngine(GeminiBackend(EMBEDDING_MODEL), cache=get_embedding_cache())
+
+    embeddings = engine.embed(df_chunks["chunk_text"].astype(str).tolist())
 
     df_chunks = df_chunks.copy()
-    df_chunks["embedding"] = embeddings
+    df_chunks["embedding"] = [np.asarray(e, dtype=np.float32) for e in embeddings]
     return df_chunks
 
 
-if __name__ == "__main__":
-    df_articles = load_papers_from_pdf("papers")
-    print("Loaded articles:", len(df_articles))
-
-    df_chunk = make_chunk_df(df_articles)
-    print("Total chunks:", len(df_chunk))
+def write_chunk_embeddings_parquet(
+    articles: Iterable[tuple[str, str]],
+    output_path: str,
+    engine: EmbeddingEngine | None = None,
+    batch_rows: int = 1_000,
+    chunk_size: int = 200,
+    overlap: int = 50,
+    strategy: str = "words",
+) -> int:
+    """Chunk, embed and write batch by batch, so memory stays bounded by `batch_rows`."""
+    if engine is None:
+        engine = EmbeddingEngine(GeminiBackend(EMBEDDING_MODEL), cache=get_embedding_cache())
+
+    tmp_path = f"{output_path}.tmp"
+    rows = 0
+    writer: pq.ParquetWriter | None = None
+    try:
+        for batch in iter_chunk_batches(articles, batch_rows, chunk_size, overlap, strategy):
+            matrix = np.asarray(engine.embed(batch.column("chunk_text").to_pylist()), np.float32)
+            offsets = np.arange(batch.num_rows + 1, dtype=np.int32) * matrix.shape[1]
+            embedding = pa.ListArray.from_arrays(offsets, pa.array(matrix.ravel()))
+            batch = batch.append_column("embedding", embedding)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        os.replace(tmp_path, output_path)
+    return rows
 
-    df_chunk_emb = embed_chunks_df(df_chunk)
 
+if __name__ == "__main__":
     output_path = "data/article_chunks_with_embeddings.parquet"
-    df_chunk_emb.to_parquet(output_path, index=False)
+    articles = iter_papers_text("papers")
+    n_chunks = write_chunk_embeddings_parquet(articles, output_path)
+    print("Total chunks:", n_chunks)
     print("Saved embeddings to", output_path)
+    print("Embedding cache:", get_embedding_cache().stats())
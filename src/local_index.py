@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from src.ann_index import IVFIndex
+    from src.quantization import QuantizedIndex
+
+DATA_PARQUET = "data/article_chunks_with_embeddings.parquet"
+LOCAL_INDEX_DIR = os.getenv("LOCAL_INDEX_DIR", "data/local_index")
+
+PAYLOAD_COLUMNS = ("article_id", "chunk_index", "chunk_text", "title", "char_start", "char_end")
+
+_VECTORS_FILE = "vectors.npy"
+_PAYLOADS_FILE = "payloads.arrow"
+_META_FILE = "meta.json"
+_ANN_FILE = "ann.npz"
+_CODES_DIR = "quantized"
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the `top_k` highest scores, best first."""
+    top_k = min(top_k, scores.shape[0])
+    if top_k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if top_k < scores.shape[0]:
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _source_signature(parquet_path: str | Path) -> dict[str, Any]:
+    st = os.stat(parquet_path)
+    return {"path": str(parquet_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class LocalVectorIndex:
+    """Cosine search over a contiguous, pre-normalized float32 matrix.
+
+    Exact by default. An attached IVF index narrows the scan to the rows of its
+    probed lists; an attached quantized index scores rows (all, or the IVF
+    candidates) from its codes and reranks the best against the memory-mapped
+    full-precision matrix, which then only has a few rows paged in per query.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        payloads: pa.Table,
+        ann: IVFIndex | None = None,
+        quantized: QuantizedIndex | None = None,
+    ) -> None:
+        if vectors.ndim != 2 or vectors.shape[0] != payloads.num_rows:
+            raise ValueError("vectors must be a 2-D matrix with one row per payload")
+        self.vectors = vectors
+        self.payloads = payloads
+        self.ann = ann
+        self.quantized = quantized
+
+    def __len__(self) -> int:
+        return int(self.vectors.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1])
+
+    @classmethod
+    def from_parquet(cls, parquet_path: str | Path = DATA_PARQUET) -> LocalVectorIndex:
+        """Build from a chunk parquet with an `embedding` column, or from one written
+        by quantization.write_quantized_parquet, whose codes are decoded."""
+        from src.quantization import CODES_COLUMN, read_quantized_parquet
+
+        table = pq.read_table(parquet_path)
+        if "embedding" in table.column_names:
+            embeddings = table.column("embedding").combine_chunks()
+            values = embeddings.flatten().to_numpy(zero_copy_only=False)
+            vectors = normalize_rows(values.reshape(table.num_rows, -1))
+        elif CODES_COLUMN in table.column_names:
+            quantized, table = read_quantized_parquet(parquet_path)
+            vectors = normalize_rows(quantized.codec.decode(quantized.codes))
+        else:
+            raise ValueError(
+                f"{parquet_path} has neither an embedding nor a {CODES_COLUMN} column."
+            )
+
+        columns = [c for c in PAYLOAD_COLUMNS if c in table.column_names]
+        return cls(vectors, table.select(columns))
+
+    def save(self, index_dir: str | Path, source: str | Path | None = None) -> None:
+        out = Path(index_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        np.save(out / _VECTORS_FILE, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        with ipc.new_file(str(out / _PAYLOADS_FILE), self.payloads.schema) as writer:
+            writer.write_table(self.payloads)
+        if self.ann is not None:
+            self.ann.save(out / _ANN_FILE)
+        else:
+            (out / _ANN_FILE).unlink(missing_ok=True)
+        if self.quantized is not None:
+            self.quantized.save(out / _CODES_DIR)
+        else:
+            shutil.rmtree(out / _CODES_DIR, ignore_errors=True)
+        meta: dict[str, Any] = {"rows": len(self), "dim": self.dim}
+        if source is not None:
+            meta["source"] = _source_signature(source)
+        (out / _META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, index_dir: str | Path, mmap: bool = True) -> LocalVectorIndex:
+        base = Path(index_dir)
+        vectors = np.load(base / _VECTORS_FILE, mmap_mode="r" if mmap else None)
+        source = (
+            pa.memory_map(str(base / _PAYLOADS_FILE), "r") if mmap else str(base / _PAYLOADS_FILE)
+        )
+        payloads = ipc.open_file(source).read_all()
+
+        ann = None
+        if (base / _ANN_FILE).exists():
+            from src.ann_index import IVFIndex
+
+            ann = IVFIndex.load(base / _ANN_FILE)
+            if len(ann) != vectors.shape[0]:
+                print(
+                    f"[local] ignoring stale {_ANN_FILE}: "
+                    f"{len(ann)} rows, {vectors.shape[0]} vectors"
+                )
+                ann = None
+
+        quantized = None
+        if (base / _CODES_DIR).exists():
+            from src.quantization import QuantizedIndex
+
+            quantized = QuantizedIndex.load(base / _CODES_DIR)
+            if len(quantized) != vectors.shape[0]:
+                print(
+                    f"[local] ignoring stale {_CODES_DIR}/: "
+                    f"{len(quantized)} codes, {vectors.shape[0]} vectors"
+                )
+                quantized = None
+        return cls(vectors, payloads, ann=ann, quantized=quantized)
+
+    @classmethod
+    def open(
+        cls,
+        parquet_path: str | Path = DATA_PARQUET,
+        index_dir: str | Path = LOCAL_INDEX_DIR,
+        ann_lists: int = 0,
+        codec: str | None = None,
+    ) -> LocalVectorIndex:
+        """Load the persisted index, rebuilding it when the source parquet changed.
+
+        With `ann_lists > 0` an IVF index is trained (or, on rebuild, refilled
+        using the previous centroids) and persisted next to the matrix. With a
+        `codec` ("float16", "int8" or "pq") the quantized codes are persisted too.
+        Persisted IVF lists or codes are not used when `ann_lists` is 0 or no
+        `codec` is given, so search falls back to exact scoring.
+        """
+        base = Path(index_dir)
+        meta_path = base / _META_FILE
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta.get("source") == _source_signature(parquet_path):
+                index = cls.load(index_dir)
+                if not ann_lists:
+                    index.ann = None
+                if not codec:
+                    index.quantized = None
+                if ann_lists and index.ann is None:
+                    index.build_ann(ann_lists).save(base / _ANN_FILE)
+                if codec and (index.quantized is None or index.quantized.codec.name != codec):
+                    index.quantize(codec).save(base / _CODES_DIR)
+                return index
+
+        from src.ann_index import IVFIndex
+
+        previous = None
+        if ann_lists and (base / _ANN_FILE).exists():
+            previous = IVFIndex.load(base / _ANN_FILE)
+        index = cls.from_parquet(parquet_path)
+        if previous is not None:
+            index.ann = IVFIndex(previous.centroids, nprobe=previous.nprobe)
+            index.ann.add(index.vectors, np.arange(len(index)))
+        elif ann_lists:
+            index.build_ann(ann_lists)
+        if codec:
+            index.quantize(codec)
+        index.save(index_dir, source=parquet_path)
+        return cls.load(index_dir)
+
+    def build_ann(self, n_lists: int | None = None, nprobe: int = 8) -> IVFIndex:
+        from src.ann_index import IVFIndex
+
+        if n_lists is not None:
+            # k-means needs at least one vector per list.
+            n_lists = min(n_lists, len(self))
+        self.ann = IVFIndex.train(self.vectors, n_lists=n_lists, nprobe=nprobe)
+        return self.ann
+
+    def quantize(self, codec: str) -> QuantizedIndex:
+        from src.quantization import QuantizedIndex, make_codec
+
+        self.quantized = QuantizedIndex.build(np.asarray(self.vectors), make_codec(codec))
+        return self.quantized
+
+    def add(self, vectors: np.ndarray, payloads: pa.Table) -> None:
+        """Append new chunks; they are also inserted into the IVF index if present."""
+        vectors = normalize_rows(vectors)
+        start = len(self)
+        self.vectors = np.concatenate([self.vectors, vectors])
+        self.payloads = pa.concat_tables(
+            [self.payloads, payloads.select(self.payloads.column_names)]
+        )
+        if self.ann is not None:
+            self.ann.add(vectors, np.arange(start, start + vectors.shape[0]))
+        if self.quantized is not None:
+            self.quantized.codes = np.concatenate(
+                [self.quantized.codes, self.quantized.codec.encode(vectors)]
+            )
+
+    def payload(self, row: int) -> dict[str, Any]:
+        return {
+            name: self.payloads.column(name)[row].as_py() for name in self.payloads.column_names
+        }
+
+    def search(
+        self,
+        query: Sequence[float] | np.ndarray,
+        top_k: int = 5,
+        nprobe: int | None = None,
+    ) -> list[tuple[int, float]]:
+        q = np.asarray(query, dtype=np.float32)
+        norm = float(np.linalg.norm(q))
+        if norm:
+            q = q / norm
+
+        rows = None if self.ann is None else self.ann.candidates(q, nprobe)
+        if self.quantized is not None:
+            return self.quantized.search(q, top_k, rerank_vectors=self.vectors, rows=rows)
+        if self.ann is not None:
+            return self.ann.search(q, self.vectors, top_k, nprobe=nprobe)
+
+        scores = self.vectors @ q
+        return [(int(i), float(scores[i])) for i in top_k_indices(scores, top_k)]
+
+    def search_many(
+        self,
+        queries: Sequence[Sequence[float]] | np.ndarray,
+        top_k: int = 5,
+        nprobe: int | None = None,
+    ) -> list[list[tuple[int, float]]]:
+        """Like `search` for a batch; exact search scores all queries in one matmul."""
+        if self.ann is not None or self.quantized is not None:
+            return [self.search(q, top_k, nprobe=nprobe) for q in queries]
+
+        q = normalize_rows(np.asarray(queries, dtype=np.float32))
+        scores = np.asarray(self.vectors @ q.T)
+        return [
+            [(int(i), float(col[i])) for i in top_k_indices(col, top_k)]
+            for col in np.ascontiguousarray(scores.T)
+        ]
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import cast
+
+from sqlalchemy import Table, inspect, text
+from sqlalchemy.engine import Engine
+
+from .models.sql_models import TOMBSTONE_TRIGGERS, ScientificArticle, ScientificArticleTombstone
+
+# SQLite cannot give an added column a CURRENT_TIMESTAMP default, so raw inserts
+# that leave updated_at out are stamped by a trigger instead.
+_SQLITE_UPDATED_AT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS scientific_articles_updated_at
+    AFTER INSERT ON scientific_articles FOR EACH ROW WHEN NEW.updated_at IS NULL
+    BEGIN
+        UPDATE scientific_articles SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    END
+"""
+
+
+def migrate(engine: Engine) -> None:
+    """Add the incremental-sync schema to an existing database, keeping its rows.
+
+    Adds scientific_articles.updated_at (plus its index), creates the
+    scientific_article_tombstones table and its AFTER DELETE trigger. Safe to
+    run more than once.
+    """
+    table = cast(Table, ScientificArticle.__table__)
+    with engine.begin() as conn:
+        columns = {c["name"] for c in inspect(conn).get_columns(table.name)}
+        if "updated_at" not in columns:
+            print("Adding scientific_articles.updated_at...")
+            if conn.dialect.name in ("mysql", "mariadb"):
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN updated_at TIMESTAMP NOT NULL "
+                        "DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
+                    )
+                )
+            else:
+                # SQLite cannot add a column with a non-constant default.
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN updated_at TIMESTAMP"))
+                conn.execute(text(f"UPDATE {table.name} SET updated_at = CURRENT_TIMESTAMP"))
+                conn.exec_driver_sql(_SQLITE_UPDATED_AT_TRIGGER)
+
+        for index in table.indexes:
+            if "updated_at" in index.columns:
+                index.create(conn, checkfirst=True)
+
+        cast(Table, ScientificArticleTombstone.__table__).create(conn, checkfirst=True)
+        for trigger in TOMBSTONE_TRIGGERS:
+            trigger(table, conn)
+    print("Done.")
+
+
+if __name__ == "__main__":
+    from .database import ENGINE
+
+    migrate(ENGINE)
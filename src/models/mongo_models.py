@@ -9,6 +9,16 @@ from mongoengine import (
     StringField,
 )
 
+# A collection holds at most one text index, so the weighted index is defined
+# once here and shared by the mongoengine meta and mongo_search.
+TEXT_INDEX_NAME = "articles_text"
+TEXT_INDEX_WEIGHTS = {"title": 10, "summary": 5, "text": 1}
+
+
+def normalize_title(title: str | None) -> str:
+    """Lowercased title with collapsed whitespace, stored for prefix lookups."""
+    return " ".join((title or "").split()).lower()
+
 
 class AuthorEmbedded(EmbeddedDocument):
     db_id = IntField(required=True)
@@ -22,12 +32,19 @@ class ScientificArticleDocument(Document):
         "indexes": [
             "db_id",
             "arxiv_id",
-            "$text",
+            "title_lower",
+            {
+                "fields": [f"${field}" for field in TEXT_INDEX_WEIGHTS],
+                "weights": TEXT_INDEX_WEIGHTS,
+                "name": TEXT_INDEX_NAME,
+                "default_language": "english",
+            },
         ],
     }
 
     db_id = IntField(required=True)
     title = StringField()
+    title_lower = StringField()
     summary = StringField()
     file_path = StringField()
     created_at = DateTimeField()
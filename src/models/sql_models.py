@@ -1,9 +1,63 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DDL,
+    TIMESTAMP,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+    insert,
+    text,
+)
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.orm import DeclarativeBase, Mapped, Mapper, mapped_column, relationship
+
+
+def _family(dialect: Dialect) -> str:
+    return "mysql" if dialect.name == "mariadb" else dialect.name
+
+
+def _is_mysql(
+    ddl: object,
+    target: object,
+    bind: Connection | None,
+    tables: object = None,
+    state: object = None,
+    *,
+    dialect: Dialect,
+    **kw: Any,
+) -> bool:
+    return _family(dialect) == "mysql"
+
+
+# MariaDB keeps updated_at current even for raw SQL updates. The clause is
+# MySQL-only DDL, so it is added after CREATE TABLE on that dialect alone; other
+# dialects rely on the ORM-level onupdate.
+UPDATED_AT_ON_UPDATE = DDL(
+    "ALTER TABLE %(table)s MODIFY updated_at TIMESTAMP NOT NULL "
+    "DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
+).execute_if(callable_=_is_mysql)
+
+# Deletes record their tombstone in the database, so raw SQL and Core deletes
+# reach incremental syncs too. MySQL does not fire triggers for foreign-key
+# cascades; deleting an author through the ORM deletes its articles explicitly.
+_TOMBSTONE_INSERT = "INSERT INTO scientific_article_tombstones (arxiv_id) VALUES (OLD.arxiv_id)"
+_TOMBSTONE_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS scientific_articles_tombstone "
+    "AFTER DELETE ON scientific_articles FOR EACH ROW "
+)
+TOMBSTONE_TRIGGERS = (
+    DDL(_TOMBSTONE_TRIGGER + _TOMBSTONE_INSERT).execute_if(callable_=_is_mysql),
+    DDL(f"{_TOMBSTONE_TRIGGER}BEGIN {_TOMBSTONE_INSERT}; END").execute_if(dialect="sqlite"),
+)
+TOMBSTONE_TRIGGER_DIALECTS = ("mysql", "sqlite")
 
 
 class Base(DeclarativeBase):
@@ -36,9 +90,47 @@ class ScientificArticle(Base):
         nullable=False,
     )
     arxiv_id: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP,
+        nullable=False,
+        index=True,
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
     author_id: Mapped[int] = mapped_column(
         ForeignKey("authors.id", ondelete="CASCADE"),
         nullable=False,
     )
     author: Mapped[Author] = relationship(back_populates="articles")
+
+
+class ScientificArticleTombstone(Base):
+    """One row per deleted article, so incremental syncs can propagate deletes."""
+
+    __tablename__ = "scientific_article_tombstones"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    arxiv_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP,
+        nullable=False,
+        index=True,
+        server_default=text("CURRENT_TIMESTAMP"),
+    )
+
+
+event.listen(ScientificArticle.__table__, "after_create", UPDATED_AT_ON_UPDATE)
+
+
+# The trigger needs both tables, which exist only once the whole metadata has.
+for _trigger in TOMBSTONE_TRIGGERS:
+    event.listen(Base.metadata, "after_create", _trigger)
+
+
+@event.listens_for(ScientificArticle, "after_delete")
+def _record_tombstone(mapper: Mapper, connection: Connection, target: ScientificArticle) -> None:
+    # Dialects without the trigger fall back to ORM-level deletes only.
+    if _family(connection.dialect) not in TOMBSTONE_TRIGGER_DIALECTS:
+        connection.execute(insert(ScientificArticleTombstone).values(arxiv_id=target.arxiv_id))
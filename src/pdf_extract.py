@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import itertools
+import os
+import sqlite3
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import NamedTuple
+
+from pypdf import PdfReader
+
+PAGE_CACHE_PATH = os.getenv("PDF_PAGE_CACHE_PATH", "data/pdf_page_cache.sqlite")
+PAGES_PER_TASK = 8
+
+
+class PageRecord(NamedTuple):
+    article_id: str
+    page_no: int
+    text: str
+
+
+class PageTextCache:
+    """Extracted page text keyed by (file path, mtime, page index)."""
+
+    def __init__(self, path: str | Path = PAGE_CACHE_PATH) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                page_no INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (path, mtime_ns, page_no)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                n_pages INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def page_count(self, path: str, mtime_ns: int) -> int | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT n_pages FROM files WHERE path = ? AND mtime_ns = ?", (path, mtime_ns)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def set_page_count(self, path: str, mtime_ns: int, n_pages: int) -> None:
+        with self._lock:
+            # Pages of older versions of the file are dead weight once it has changed.
+            self._conn.execute(
+                "DELETE FROM pages WHERE path = ? AND mtime_ns != ?", (path, mtime_ns)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, n_pages) VALUES (?, ?, ?)",
+                (path, mtime_ns, n_pages),
+            )
+            self._conn.commit()
+
+    def get_pages(self, path: str, mtime_ns: int) -> dict[int, str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page_no, text FROM pages WHERE path = ? AND mtime_ns = ?",
+                (path, mtime_ns),
+            ).fetchall()
+        return dict(rows)
+
+    def put_pages(self, path: str, mtime_ns: int, pages: list[tuple[int, str]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (path, mtime_ns, page_no, text) VALUES (?, ?, ?, ?)",
+                [(path, mtime_ns, page_no, text) for page_no, text in pages],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@cache
+def _page_cache(pid: int) -> PageTextCache:
+    return PageTextCache()
+
+
+def get_page_cache() -> PageTextCache:
+    # SQLite connections must not cross fork(); each process opens its own.
+    return _page_cache(os.getpid())
+
+
+def extract_pages(path: str, page_nos: Iterable[int] | None = None) -> list[tuple[int, str]]:
+    reader = PdfReader(path)
+    if page_nos is None:
+        page_nos = range(len(reader.pages))
+    return [(i, reader.pages[i].extract_text() or "") for i in page_nos]
+
+
+def _page_count(path: str) -> int:
+    return len(PdfReader(path).pages)
+
+
+def pdf_text(path: str | Path, cache: PageTextCache | None = None) -> str:
+    """Full text of one PDF, pages joined by newlines, extracting only uncached pages."""
+    if cache is None:
+        cache = get_page_cache()
+    pdf_path = Path(path)
+    resolved = str(pdf_path.resolve())
+    mtime_ns = pdf_path.stat().st_mtime_ns
+    n_pages = cache.page_count(resolved, mtime_ns)
+    if n_pages is None:
+        n_pages = _page_count(resolved)
+        cache.set_page_count(resolved, mtime_ns, n_pages)
+    pages = cache.get_pages(resolved, mtime_ns)
+    missing = [i for i in range(n_pages) if i not in pages]
+    if missing:
+        fresh = extract_pages(resolved, missing)
+        cache.put_pages(resolved, mtime_ns, fresh)
+        pages.update(fresh)
+    return "\n".join(pages[i] for i in range(n_pages))
+
+
+def iter_pdf_pages(
+    papers_dir: str = "papers",
+    workers: int | None = None,
+    cache: PageTextCache | None = None,
+    pages_per_task: int = PAGES_PER_TASK,
+) -> Iterator[PageRecord]:
+    """Yield page texts of every PDF in `papers_dir`, in (file, page) order.
+
+    Uncached pages are extracted in groups of `pages_per_task` on a process pool
+    (`workers=1` extracts in-process); at most a few groups per worker are in
+    flight, so results stream instead of piling up.
+    """
+    if cache is None:
+        cache = get_page_cache()
+    workers = workers or os.cpu_count() or 1
+
+    # (article_id, path, mtime_ns, page numbers, already extracted pages or None)
+    units: list[tuple[str, str, int, list[int], list[tuple[int, str]] | None]] = []
+    for pdf_path in sorted(Path(papers_dir).glob("*.pdf")):
+        path = str(pdf_path.resolve())
+        mtime_ns = pdf_path.stat().st_mtime_ns
+        n_pages = cache.page_count(path, mtime_ns)
+        if n_pages is None:
+            n_pages = _page_count(path)
+            cache.set_page_count(path, mtime_ns, n_pages)
+        cached = cache.get_pages(path, mtime_ns)
+        missing = [i for i in range(n_pages) if i not in cached]
+        if not missing:
+            units.append((pdf_path.stem, path, mtime_ns, [], sorted(cached.items())))
+            continue
+        if cached:
+            # Interrupted earlier run: keep the finished pages, extract the rest.
+            units.append((pdf_path.stem, path, mtime_ns, [], sorted(cached.items())))
+        for start in range(0, len(missing), pages_per_task):
+            group = missing[start : start + pages_per_task]
+            units.append((pdf_path.stem, path, mtime_ns, group, None))
+
+    if workers <= 1:
+        for article_id, path, mtime_ns, page_nos, done in units:
+            if done is None:
+                done = extract_pages(path, page_nos)
+                cache.put_pages(path, mtime_ns, done)
+            for page_no, text in done:
+                yield PageRecord(article_id, page_no, text)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[tuple[tuple, Future[list[tuple[int, str]]] | None]] = deque()
+        unit_iter = iter(units)
+
+        def _fill() -> None:
+            for unit in itertools.islice(unit_iter, max(workers * 4 - len(pending), 0)):
+                _, path, _, page_nos, done = unit
+                future = pool.submit(extract_pages, path, page_nos) if done is None else None
+                pending.append((unit, future))
+
+        _fill()
+        while pending:
+            (article_id, path, mtime_ns, _, done), future = pending.popleft()
+            if future is not None:
+                done = future.result()
+                cache.put_pages(path, mtime_ns, done)
+            _fill()
+            for page_no, text in done:
+                yield PageRecord(article_id, page_no, text)
+
+
+def iter_pdf_articles(
+    papers_dir: str = "papers",
+    workers: int | None = None,
+    cache: PageTextCache | None = None,
+) -> Iterator[tuple[str, str]]:
+    """(article_id, full text) per PDF, holding only one paper's pages at a time."""
+    records = iter_pdf_pages(papers_dir, workers=workers, cache=cache)
+    for article_id, pages in itertools.groupby(records, key=lambda r: r.article_id):
+        yield article_id, "\n".join(p.text for p in pages)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import pyarrow.parquet as pq
+
+MANIFEST_PATH = "data/qdrant_sync_manifest.json"
+
+
+def row_group_fingerprint(parquet_file: pq.ParquetFile, index: int) -> str:
+    rg = parquet_file.metadata.row_group(index)
+    parts: list[str] = [str(rg.num_rows), str(rg.total_byte_size)]
+    for j in range(rg.num_columns):
+        col = rg.column(j)
+        stats = col.statistics
+        if stats is not None and stats.has_min_max:
+            parts.append(f"{col.path_in_schema}:{stats.min!r}:{stats.max!r}")
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class SyncManifest:
+    """Local record of which parquet row groups are already in Qdrant.
+
+    Only row-group fingerprints are kept. Points from a group that was in flight
+    when a sync stopped are found again by the paged retrieve, so the manifest
+    stays small however many points the collection holds.
+    """
+
+    def __init__(self, collection: str, path: str | Path = MANIFEST_PATH) -> None:
+        self.collection = collection
+        self.path = Path(path)
+        self.row_groups: dict[str, dict[str, str]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if self.path.exists():
+            state: dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+            if state.get("collection") != self.collection:
+                self.reset()
+                return
+            self.row_groups = state.get("row_groups", {})
+
+    def is_empty(self) -> bool:
+        return not self.row_groups
+
+    def reset(self) -> None:
+        self.row_groups = {}
+        self.save()
+
+    def pending_row_groups(self, parquet_path: str) -> list[int]:
+        pf = pq.ParquetFile(parquet_path)
+        done = self.row_groups.get(parquet_path, {})
+        return [
+            i for i in range(pf.num_row_groups) if done.get(str(i)) != row_group_fingerprint(pf, i)
+        ]
+
+    def mark_row_groups(self, parquet_path: str, indices: Iterable[int]) -> None:
+        pf = pq.ParquetFile(parquet_path)
+        done = self.row_groups.setdefault(parquet_path, {})
+        for i in indices:
+            done[str(i)] = row_group_fingerprint(pf, i)
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        state = {"collection": self.collection, "row_groups": self.row_groups}
+        tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+        # Earlier versions also appended every synced point id to a sibling file.
+        self.path.with_suffix(".ids").unlink(missing_ok=True)
@@ -1,14 +1,28 @@
 from __future__ import annotations
 
 import os
+import threading
 import uuid
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from time import perf_counter
 
 import google.generativeai as genai
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+from src.embedding_cache import get_embedding_cache
+from src.embedding_engine import EmbeddingEngine, GeminiBackend, call_with_retry
+from src.local_index import LocalVectorIndex
+from src.qdrant_manifest import SyncManifest
+from src.quantization import CODES_COLUMN
 
 EMBEDDING_MODEL = "text-embedding-004"
 QDRANT_COLLECTION = "article_chunks"
@@ -19,6 +33,20 @@ EMBEDDING_DIM = 768
 
 DATA_PARQUET = "data/article_chunks_with_embeddings.parquet"
 
+# "qdrant" talks to the server above; "local" searches the parquet in-process.
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "qdrant")
+# Number of IVF lists for the local backend; 0 keeps exact brute-force search.
+LOCAL_ANN_LISTS = int(os.getenv("LOCAL_ANN_LISTS", "0"))
+# Optional compressed scan for the local backend: "float16", "int8" or "pq".
+LOCAL_INDEX_CODEC = os.getenv("LOCAL_INDEX_CODEC") or None
+
+RETRIEVE_PAGE_SIZE = 256
+RETRIEVE_WORKERS = 4
+
+UPSERT_BATCH_SIZE = 256
+UPSERT_WORKERS = 4
+UPSERT_MAX_PENDING = 8
+
 
 class ChunkMetadata(BaseModel):
     point_id: str
@@ -26,6 +54,8 @@ class ChunkMetadata(BaseModel):
     chunk_index: int
     chunk_text: str
     title: str | None = None
+    char_start: int | None = None
+    char_end: int | None = None
 
 
 def get_gemini_client() -> None:
@@ -55,13 +85,20 @@ def ensure_collection(client: QdrantClient) -> None:
 
 
 def embed_text(text: str) -> list[float]:
+    cache = get_embedding_cache()
+    cached = cache.get(EMBEDDING_MODEL, "SEMANTIC_SIMILARITY", text)
+    if cached is not None:
+        return cached
+
     result = genai.embed_content(
         model=EMBEDDING_MODEL,
         content=text,
         task_type="SEMANTIC_SIMILARITY",
     )
     embedding = result["embedding"]
-    return list(float(x) for x in embedding)
+    embedding_list = list(float(x) for x in embedding)
+    cache.put(EMBEDDING_MODEL, "SEMANTIC_SIMILARITY", text, embedding_list)
+    return embedding_list
 
 
 def make_point_id(article_id: int | str, chunk_index: int) -> str:
@@ -69,6 +106,36 @@ def make_point_id(article_id: int | str, chunk_index: int) -> str:
     return str(uuid.uuid5(uuid.NAMESPACE_DNS, raw))
 
 
+def make_point_ids(article_ids: Iterable[int | str], chunk_indices: Iterable[int]) -> list[str]:
+    return [make_point_id(a, int(c)) for a, c in zip(article_ids, chunk_indices, strict=True)]
+
+
+def find_existing_ids(
+    client: QdrantClient,
+    ids: list[str],
+    page_size: int = RETRIEVE_PAGE_SIZE,
+    max_workers: int = 1,
+) -> set[str]:
+    pages = [ids[i : i + page_size] for i in range(0, len(ids), page_size)]
+
+    def _retrieve(page: list[str]) -> set[str]:
+        records = client.retrieve(
+            collection_name=QDRANT_COLLECTION,
+            ids=page,
+            with_vectors=False,
+            with_payload=False,
+        )
+        return {str(rec.id) for rec in records}
+
+    if max_workers <= 1 or len(pages) <= 1:
+        found = [_retrieve(p) for p in pages]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            found = list(pool.map(_retrieve, pages))
+
+    return set().union(*found)
+
+
 def chunk_exists(
     client: QdrantClient,
     point_id: str,
@@ -99,7 +166,53 @@ def upsert_chunk(
     )
 
 
-def sync_chunks_to_qdrant() -> None:
+def _batch_to_points(
+    batch: pa.RecordBatch,
+    point_ids: list[str],
+    engine: EmbeddingEngine | None,
+) -> qmodels.Batch:
+    names = batch.schema.names
+    n = batch.num_rows
+    article_ids = batch.column("article_id").to_pylist()
+    chunk_indices = batch.column("chunk_index").to_numpy(zero_copy_only=False).astype(np.int64)
+    texts = [str(t) for t in batch.column("chunk_text").to_pylist()]
+    titles = batch.column("title").to_pylist() if "title" in names else [None] * n
+    starts = batch.column("char_start").to_pylist() if "char_start" in names else [None] * n
+    ends = batch.column("char_end").to_pylist() if "char_end" in names else [None] * n
+
+    vectors: list[list[float]]
+    if "embedding" in names:
+        values = batch.column("embedding").flatten().to_numpy(zero_copy_only=False)
+        vectors = values.astype(np.float32).reshape(n, -1).tolist()
+    else:
+        if engine is None:
+            raise ValueError("Parquet has no embedding column and no embedding engine was given.")
+        vectors = engine.embed(texts)
+
+    payloads = [
+        {
+            "point_id": pid,
+            "article_id": aid,
+            "chunk_index": int(idx),
+            "chunk_text": text,
+            "title": title,
+            "char_start": start,
+            "char_end": end,
+        }
+        for pid, aid, idx, text, title, start, end in zip(
+            point_ids, article_ids, chunk_indices, texts, titles, starts, ends, strict=True
+        )
+    ]
+    return qmodels.Batch(ids=list(point_ids), vectors=vectors, payloads=payloads)
+
+
+def sync_chunks_to_qdrant(
+    manifest: SyncManifest | None = None,
+    retrieve_workers: int = RETRIEVE_WORKERS,
+    batch_size: int = UPSERT_BATCH_SIZE,
+    upsert_workers: int = UPSERT_WORKERS,
+    max_pending: int = UPSERT_MAX_PENDING,
+) -> None:
     get_gemini_client()
     client = get_qdrant_client()
     ensure_collection(client)
@@ -107,89 +220,119 @@ def sync_chunks_to_qdrant() -> None:
     if not os.path.exists(DATA_PARQUET):
         raise FileNotFoundError(f"{DATA_PARQUET} not found. Make parquent first.")
 
-    df = pd.read_parquet(DATA_PARQUET)
-
+    parquet_file = pq.ParquetFile(DATA_PARQUET)
+    columns = set(parquet_file.schema_arrow.names)
     expected_cols = {"article_id", "chunk_index", "chunk_text"}
-    if not expected_cols.issubset(df.columns):
+    if not expected_cols.issubset(columns):
+        raise ValueError(f"Do not exist for Parquet file. Need: {expected_cols}, Now: {columns}")
+    if CODES_COLUMN in columns and "embedding" not in columns:
+        # Without this check every chunk would silently be re-embedded through Gemini.
         raise ValueError(
-            f"Do not exist for Parquet file. Need: {expected_cols}, Now: {set(df.columns)}"
+            f"{DATA_PARQUET} holds quantized {CODES_COLUMN}, not float embeddings; "
+            "sync the parquet it was written from instead."
         )
 
-    df["point_id"] = df.apply(
-        lambda row: make_point_id(row["article_id"], int(row["chunk_index"])),
-        axis=1,
-    )
+    if manifest is None:
+        manifest = SyncManifest(QDRANT_COLLECTION)
+    if not manifest.is_empty() and client.count(QDRANT_COLLECTION, exact=False).count == 0:
+        print("Collection is empty, discarding stale sync manifest.")
+        manifest.reset()
 
-    all_ids = df["point_id"].tolist()
-    existing_records = client.retrieve(
-        collection_name=QDRANT_COLLECTION,
-        ids=all_ids,
-        with_vectors=False,
-        with_payload=False,
-    )
-    existic_ids = {rec.id for rec in existing_records}
+    pending_groups = manifest.pending_row_groups(DATA_PARQUET)
+    if not pending_groups:
+        print("No new chunks to store.")
+        return
 
-    missing_df = df[~df["point_id"].isin(existic_ids)].copy()
-    print(f"Of the Total {len(df)} chunks, {len(missing_df)} chunks need to be newly added")
+    engine = None
+    if "embedding" not in columns:
+        engine = EmbeddingEngine(GeminiBackend(EMBEDDING_MODEL), cache=get_embedding_cache())
+
+    slots = threading.BoundedSemaphore(max_pending)
+    futures: list[Future[None]] = []
+    total = 0
+    queued = 0
+
+    def _upsert(batch_no: int, points: qmodels.Batch) -> None:
+        try:
+            t0 = perf_counter()
+            call_with_retry(
+                lambda: client.upsert(collection_name=QDRANT_COLLECTION, points=points),
+                retryable=(ResponseHandlingException, UnexpectedResponse),
+            )
+            dt = (perf_counter() - t0) * 1000.0
+            print(f"[upsert] batch {batch_no}: {len(points.ids)} points in {dt:.1f} ms")
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=upsert_workers) as pool:
+        batches = parquet_file.iter_batches(batch_size=batch_size, row_groups=pending_groups)
+        for batch in batches:
+            total += batch.num_rows
+            point_ids = make_point_ids(
+                batch.column("article_id").to_pylist(),
+                batch.column("chunk_index").to_pylist(),
+            )
+            existing_ids = find_existing_ids(client, point_ids, max_workers=retrieve_workers)
+            keep = [pid not in existing_ids for pid in point_ids]
+            if not any(keep):
+                continue
 
-    has_embedding_col = "embedding" in missing_df.columns
+            batch = batch.filter(pa.array(keep))
+            point_ids = [pid for pid, k in zip(point_ids, keep, strict=True) if k]
+            points = _batch_to_points(batch, point_ids, engine)
 
-    points: list[qmodels.PointStruct] = []
+            slots.acquire()
+            futures.append(pool.submit(_upsert, len(futures), points))
+            queued += len(point_ids)
 
-    for _, row in missing_df.iterrows():
-        point_id = row["point_id"]
-        chunk_text: str = str(row["chunk_text"])
-        article_id = row["article_id"]
-        chunk_index = int(row["chunk_index"])
-        title = row["title"] if "title" in row and pd.notna(row["title"]) else None
+    failures = [f.exception() for f in futures if f.exception() is not None]
+    print(f"Of the Total {total} chunks, {queued} chunks needed to be newly added")
 
-        metadata = ChunkMetadata(
-            point_id=point_id,
-            article_id=article_id,
-            chunk_index=chunk_index,
-            chunk_text=chunk_text,
-            title=title,
-        )
+    if failures:
+        print(f"{len(failures)} of {len(futures)} upsert batches failed; rerun to resume.")
+        raise RuntimeError(f"Qdrant upsert failed: {failures[0]}") from failures[0]
 
-        if has_embedding_col:
-            emb_list = row["embedding"]
-            embedding = list(float(x) for x in emb_list)
-        else:
-            embedding = embed_text(chunk_text)
+    if queued:
+        print(f"{queued} chunks successfully upserted into Qdrant.")
+    else:
+        print("No new chunks to store.")
 
-        points.append(
-            qmodels.PointStruct(
-                id=metadata.point_id,
-                vector=embedding,
-                payload=metadata.model_dump(),
-            )
-        )
+    manifest.mark_row_groups(DATA_PARQUET, pending_groups)
 
-    if points:
-        client.upsert(
-            collection_name=QDRANT_COLLECTION,
-            points=points,
+
+@lru_cache(maxsize=1)
+def get_local_index() -> LocalVectorIndex:
+    return LocalVectorIndex.open(DATA_PARQUET, ann_lists=LOCAL_ANN_LISTS, codec=LOCAL_INDEX_CODEC)
+
+
+def local_hits_to_points(
+    index: LocalVectorIndex,
+    hits: list[tuple[int, float]],
+) -> list[qmodels.ScoredPoint]:
+    points: list[qmodels.ScoredPoint] = []
+    for row, score in hits:
+        payload = index.payload(row)
+        point_id = make_point_id(payload["article_id"], int(payload["chunk_index"]))
+        metadata = ChunkMetadata(point_id=point_id, **payload)
+        points.append(
+            qmodels.ScoredPoint(id=point_id, version=0, score=score, payload=metadata.model_dump())
         )
-        print(f"{len(points)} chunks successfully upserted into Qdrant.")
-    else:
-        print("No new chunks to store.")
+    return points
 
 
-def search_chunks(query: str, top_k: int = 5) -> list[qmodels.ScoredPoint]:
-    get_gemini_client()
-    client = get_qdrant_client()
+def search_local(query_emb: list[float], top_k: int = 5) -> list[qmodels.ScoredPoint]:
+    index = get_local_index()
+    return local_hits_to_points(index, index.search(query_emb, top_k))
 
-    query_emb = embed_text(query)
 
-    results = client.query_points(
-        collection_name=QDRANT_COLLECTION,
-        query=query_emb,
-        limit=top_k,
-        with_payload=True,
-    )
+def search_chunks(
+    query: str,
+    top_k: int = 5,
+    backend: str | None = None,
+) -> list[qmodels.ScoredPoint]:
+    from src.search_service import get_search_service
 
-    points = results.points or []
-    return list(points)
+    return get_search_service(backend or VECTOR_BACKEND).search(query, top_k)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import base64
+import io
+import json
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, Protocol
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.ann_index import kmeans, recall_at_k
+from src.local_index import normalize_rows, top_k_indices
+
+CODES_COLUMN = "embedding_codes"
+CODEC_METADATA_KEY = b"embedding_codec"
+
+# Rows scored per lookup-table pass, bounding the (rows, m) temporary in PQ scoring.
+_SCORE_CHUNK = 65_536
+
+
+class EmbeddingCodec(Protocol):
+    name: str
+
+    @property
+    def code_size(self) -> int: ...
+
+    def train(self, vectors: np.ndarray) -> None: ...
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray: ...
+
+    def decode(self, codes: np.ndarray) -> np.ndarray: ...
+
+    def scorer(self, query: np.ndarray) -> Callable[[np.ndarray], np.ndarray]: ...
+
+    def state(self) -> dict[str, np.ndarray]: ...
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None: ...
+
+
+class Float16Codec:
+    name = "float16"
+
+    def __init__(self, dim: int = 768) -> None:
+        self.dim = dim
+
+    @property
+    def code_size(self) -> int:
+        return self.dim * 2
+
+    def train(self, vectors: np.ndarray) -> None:
+        self.dim = int(vectors.shape[1])
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.asarray(vectors, dtype=np.float16)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return np.asarray(codes, dtype=np.float32)
+
+    def scorer(self, query: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+        q = np.asarray(query, dtype=np.float32)
+        return lambda codes: codes.astype(np.float32) @ q
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {"dim": np.array(self.dim)}
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        self.dim = int(state["dim"])
+
+
+class ScalarQuantizer:
+    """Per-dimension min/max int8 (uint8 code) quantization."""
+
+    name = "int8"
+
+    def __init__(self) -> None:
+        self.vmin = np.zeros(0, dtype=np.float32)
+        self.scale = np.ones(0, dtype=np.float32)
+
+    @property
+    def code_size(self) -> int:
+        return int(self.vmin.shape[0])
+
+    def train(self, vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.vmin = vectors.min(axis=0)
+        span = vectors.max(axis=0) - self.vmin
+        self.scale = np.where(span > 0, span / 255.0, 1.0).astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        scaled = (np.asarray(vectors, dtype=np.float32) - self.vmin) / self.scale
+        return np.clip(np.rint(scaled), 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return codes.astype(np.float32) * self.scale + self.vmin
+
+    def scorer(self, query: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+        # q . (vmin + scale * c) == q . vmin + (q * scale) . c
+        q = np.asarray(query, dtype=np.float32)
+        weights = q * self.scale
+        offset = float(q @ self.vmin)
+        return lambda codes: codes.astype(np.float32) @ weights + offset
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {"vmin": self.vmin, "scale": self.scale}
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        self.vmin = np.asarray(state["vmin"], dtype=np.float32)
+        self.scale = np.asarray(state["scale"], dtype=np.float32)
+
+
+class ProductQuantizer:
+    """Splits vectors into `m` sub-spaces, each coded by one of up to 256 centroids."""
+
+    name = "pq"
+
+    def __init__(self, m: int = 96, n_iter: int = 15, seed: int = 0) -> None:
+        self.m = m
+        self.n_iter = n_iter
+        self.seed = seed
+        self.codebooks = np.zeros((m, 0, 0), dtype=np.float32)
+
+    @property
+    def code_size(self) -> int:
+        return self.m
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        n, dim = vectors.shape
+        if dim % self.m:
+            raise ValueError(f"dim {dim} is not divisible by m={self.m}")
+        return np.asarray(vectors, dtype=np.float32).reshape(n, self.m, dim // self.m)
+
+    def train(self, vectors: np.ndarray) -> None:
+        sub = self._split(vectors)
+        ks = min(256, sub.shape[0])
+        self.codebooks = np.stack(
+            [
+                kmeans(sub[:, j], ks, n_iter=self.n_iter, seed=self.seed + j, spherical=False)
+                for j in range(self.m)
+            ]
+        )
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        sub = self._split(vectors)
+        codes = np.empty((sub.shape[0], self.m), dtype=np.uint8)
+        for j in range(self.m):
+            cb = self.codebooks[j]
+            dists = -2.0 * sub[:, j] @ cb.T + (cb**2).sum(axis=1)
+            codes[:, j] = np.argmin(dists, axis=1)
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        parts = [self.codebooks[j][codes[:, j]] for j in range(self.m)]
+        return np.concatenate(parts, axis=1)
+
+    def scorer(self, query: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+        q = self._split(np.asarray(query, dtype=np.float32)[None, :])[0]
+        lut = np.einsum("mkd,md->mk", self.codebooks, q)
+        cols = np.arange(self.m)[None, :]
+
+        def _score(codes: np.ndarray) -> np.ndarray:
+            out = np.empty(codes.shape[0], dtype=np.float32)
+            for start in range(0, codes.shape[0], _SCORE_CHUNK):
+                part = codes[start : start + _SCORE_CHUNK]
+                out[start : start + part.shape[0]] = lut[cols, part].sum(axis=1)
+            return out
+
+        return _score
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {"m": np.array(self.m), "codebooks": self.codebooks}
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        self.m = int(state["m"])
+        self.codebooks = np.asarray(state["codebooks"], dtype=np.float32)
+
+
+CODECS: dict[str, Callable[[], EmbeddingCodec]] = {
+    "float16": Float16Codec,
+    "int8": ScalarQuantizer,
+    "pq": ProductQuantizer,
+}
+
+
+def make_codec(name: str) -> EmbeddingCodec:
+    if name not in CODECS:
+        raise ValueError(f"Unknown embedding codec {name!r}; choose from {sorted(CODECS)}")
+    return CODECS[name]()
+
+
+def codec_to_bytes(codec: EmbeddingCodec) -> bytes:
+    buf = io.BytesIO()
+    # Typed Any: numpy's stub would match a dict of arrays against allow_pickle.
+    arrays: dict[str, Any] = {"__name__": np.array(codec.name), **codec.state()}
+    np.savez(buf, **arrays)
+    return buf.getvalue()
+
+
+def codec_from_bytes(raw: bytes) -> EmbeddingCodec:
+    with np.load(io.BytesIO(raw)) as data:
+        state = {k: data[k] for k in data.files}
+    codec = make_codec(str(state.pop("__name__")))
+    codec.load_state(state)
+    return codec
+
+
+class QuantizedIndex:
+    """Top-k over encoded vectors with asymmetric (float query vs. codes) scoring.
+
+    Passing full-precision `rerank_vectors` re-scores `rerank_factor * top_k`
+    candidates exactly before returning.
+    """
+
+    def __init__(self, codec: EmbeddingCodec, codes: np.ndarray) -> None:
+        self.codec = codec
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return int(self.codes.shape[0])
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, codec: EmbeddingCodec) -> QuantizedIndex:
+        vectors = normalize_rows(vectors)
+        codec.train(vectors)
+        return cls(codec, codec.encode(vectors))
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes)
+
+    def search(
+        self,
+        query: Sequence[float] | np.ndarray,
+        top_k: int = 5,
+        rerank_vectors: np.ndarray | None = None,
+        rerank_factor: int = 4,
+        rows: np.ndarray | None = None,
+    ) -> list[tuple[int, float]]:
+        """Top-k row ids; `rows` limits scoring to those candidates (e.g. from IVF)."""
+        q = np.asarray(query, dtype=np.float32)
+        norm = float(np.linalg.norm(q))
+        if norm:
+            q = q / norm
+
+        ids = np.arange(len(self)) if rows is None else np.asarray(rows, dtype=np.int64)
+        if ids.size == 0:
+            return []
+        codes = self.codes if rows is None else self.codes[ids]
+        scores = self.codec.scorer(q)(codes)
+        if rerank_vectors is None:
+            return [(int(ids[i]), float(scores[i])) for i in top_k_indices(scores, top_k)]
+
+        rows = ids[np.sort(top_k_indices(scores, top_k * rerank_factor))]
+        exact = np.asarray(rerank_vectors[rows], dtype=np.float32) @ q
+        return [(int(rows[i]), float(exact[i])) for i in top_k_indices(exact, top_k)]
+
+    def save(self, index_dir: str | Path) -> None:
+        base = Path(index_dir)
+        base.mkdir(parents=True, exist_ok=True)
+        np.save(base / "codes.npy", self.codes)
+        (base / "codec.npz").write_bytes(codec_to_bytes(self.codec))
+
+    @classmethod
+    def load(cls, index_dir: str | Path, mmap: bool = True) -> QuantizedIndex:
+        base = Path(index_dir)
+        codec = codec_from_bytes((base / "codec.npz").read_bytes())
+        return cls(codec, np.load(base / "codes.npy", mmap_mode="r" if mmap else None))
+
+
+def write_quantized_parquet(
+    src_path: str | Path,
+    dst_path: str | Path,
+    codec_name: str = "pq",
+) -> QuantizedIndex:
+    """Rewrite a chunk parquet with the embedding column replaced by codec codes.
+
+    The trained codec is stored in the parquet schema metadata.
+    """
+    table = pq.read_table(src_path)
+    values = table.column("embedding").combine_chunks().flatten().to_numpy(zero_copy_only=False)
+    index = QuantizedIndex.build(values.reshape(table.num_rows, -1), make_codec(codec_name))
+
+    codes = np.ascontiguousarray(index.codes)
+    code_array = pa.FixedSizeBinaryArray.from_buffers(
+        pa.binary(index.codec.code_size), len(codes), [None, pa.py_buffer(codes.tobytes())]
+    )
+    out = table.drop_columns(["embedding"]).append_column(CODES_COLUMN, code_array)
+    metadata = dict(out.schema.metadata or {})
+    metadata[CODEC_METADATA_KEY] = base64.b64encode(codec_to_bytes(index.codec))
+    pq.write_table(out.replace_schema_metadata(metadata), dst_path)
+    return index
+
+
+def read_quantized_parquet(path: str | Path) -> tuple[QuantizedIndex, pa.Table]:
+    table = pq.read_table(path)
+    metadata = table.schema.metadata or {}
+    if CODEC_METADATA_KEY not in metadata:
+        raise ValueError(f"{path} carries no {CODEC_METADATA_KEY.decode()} metadata.")
+    codec = codec_from_bytes(base64.b64decode(metadata[CODEC_METADATA_KEY]))
+
+    column = table.column(CODES_COLUMN).combine_chunks()
+    raw = np.frombuffer(column.buffers()[1], dtype=np.uint8)
+    raw = raw[column.offset * column.type.byte_width :][: len(column) * column.type.byte_width]
+    dtype = np.float16 if codec.name == "float16" else np.uint8
+    codes = raw.view(dtype).reshape(len(column), -1)
+    return QuantizedIndex(codec, codes), table.drop_columns([CODES_COLUMN])
+
+
+def benchmark_codecs(
+    vectors: np.ndarray,
+    codec_names: Sequence[str] = ("float16", "int8", "pq"),
+    n_queries: int = 100,
+    k: int = 10,
+    seed: int = 0,
+) -> list[dict[str, float | str]]:
+    """Compression ratio (vs float32) and recall@k, with and without exact rerank."""
+    vectors = normalize_rows(vectors)
+    rng = np.random.default_rng(seed)
+    n_queries = min(n_queries, vectors.shape[0])
+    queries = vectors[rng.choice(vectors.shape[0], size=n_queries, replace=False)]
+    queries = normalize_rows(queries + rng.normal(0, 0.05, queries.shape).astype(np.float32))
+
+    def exact(q: np.ndarray, top_k: int) -> list[tuple[int, float]]:
+        scores = vectors @ q
+        return [(int(i), float(scores[i])) for i in top_k_indices(scores, top_k)]
+
+    rows: list[dict[str, float | str]] = []
+    for name in codec_names:
+        index = QuantizedIndex.build(vectors, make_codec(name))
+        ratio = vectors.nbytes / index.nbytes
+        recall = recall_at_k(exact, index.search, queries, k)
+
+        def reranked_search(
+            q: np.ndarray, top_k: int, ix: QuantizedIndex = index
+        ) -> list[tuple[int, float]]:
+            return ix.search(q, top_k, rerank_vectors=vectors)
+
+        reranked = recall_at_k(exact, reranked_search, queries, k)
+        print(
+            f"[{name:<7}] {index.nbytes / len(index):7.0f} B/vec  {ratio:5.1f}x smaller  "
+            f"recall@{k}={recall:.3f}  reranked={reranked:.3f}"
+        )
+        rows.append({"codec": name, "ratio": ratio, "recall": recall, "recall_rerank": reranked})
+    return rows
+
+
+if __name__ == "__main__":
+    import sys
+
+    src = sys.argv[1] if len(sys.argv) > 1 else "data/article_chunks_with_embeddings.parquet"
+    tbl = pq.read_table(src, columns=["embedding"])
+    flat = tbl.column("embedding").combine_chunks().flatten().to_numpy(zero_copy_only=False)
+    print(json.dumps({"source": src, "rows": tbl.num_rows}))
+    benchmark_codecs(flat.reshape(tbl.num_rows, -1))
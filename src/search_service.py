@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import cache
+
+import pyarrow.parquet as pq
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+
+from src.bm25_index import BM25Index, reciprocal_rank_fusion
+from src.embedding_cache import get_embedding_cache
+from src.embedding_engine import EmbeddingEngine, GeminiBackend
+from src.local_index import PAYLOAD_COLUMNS
+from src.qdrant_pipeline import (
+    DATA_PARQUET,
+    EMBEDDING_MODEL,
+    QDRANT_COLLECTION,
+    VECTOR_BACKEND,
+    ChunkMetadata,
+    get_gemini_client,
+    get_local_index,
+    get_qdrant_client,
+    local_hits_to_points,
+    make_point_ids,
+)
+
+QUERY_CACHE_SIZE = 4096
+RRF_K = 60
+
+
+class SearchService:
+    """Long-lived search entry point: one vector-store client, one embedding
+    engine and an in-memory LRU of query embeddings shared across calls."""
+
+    def __init__(
+        self,
+        backend: str = "qdrant",
+        engine: EmbeddingEngine | None = None,
+        client: QdrantClient | None = None,
+        cache_size: int = QUERY_CACHE_SIZE,
+    ) -> None:
+        if backend not in ("qdrant", "local"):
+            raise ValueError(f"Unknown vector backend: {backend!r}")
+
+        if engine is None:
+            get_gemini_client()
+            engine = EmbeddingEngine(GeminiBackend(EMBEDDING_MODEL), cache=get_embedding_cache())
+
+        self.backend = backend
+        self.engine = engine
+        self.cache_size = cache_size
+        self._client = client
+        self._query_cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> QdrantClient:
+        with self._lock:
+            if self._client is None:
+                self._client = get_qdrant_client()
+            return self._client
+
+    def embed_queries(self, queries: Sequence[str]) -> list[list[float]]:
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            for q in queries:
+                emb = self._query_cache.get(q)
+                if emb is not None:
+                    self._query_cache.move_to_end(q)
+                    found[q] = emb
+
+        missing = [q for q in dict.fromkeys(queries) if q not in found]
+        if missing:
+            fresh = self.engine.embed(missing)
+            with self._lock:
+                for q, emb in zip(missing, fresh, strict=True):
+                    found[q] = emb
+                    self._query_cache[q] = emb
+                while len(self._query_cache) > self.cache_size:
+                    self._query_cache.popitem(last=False)
+
+        return [found[q] for q in queries]
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        top_k: int = 5,
+    ) -> list[list[qmodels.ScoredPoint]]:
+        if not queries:
+            return []
+        vectors = self.embed_queries(queries)
+
+        if self.backend == "local":
+            index = get_local_index()
+            return [local_hits_to_points(index, hits) for hits in index.search_many(vectors, top_k)]
+
+        responses = self.client.query_batch_points(
+            collection_name=QDRANT_COLLECTION,
+            requests=[
+                qmodels.QueryRequest(query=vec, limit=top_k, with_payload=True) for vec in vectors
+            ],
+        )
+        return [list(resp.points or []) for resp in responses]
+
+    def search(self, query: str, top_k: int = 5) -> list[qmodels.ScoredPoint]:
+        return self.search_many([query], top_k)[0]
+
+
+@cache
+def get_search_service(backend: str = "qdrant") -> SearchService:
+    return SearchService(backend=backend)
+
+
+@cache
+def get_bm25_index(parquet_path: str = DATA_PARQUET) -> BM25Index:
+    """BM25 over the chunk_text column, keyed by Qdrant point id."""
+    available = set(pq.read_schema(parquet_path).names)
+    columns = [c for c in PAYLOAD_COLUMNS if c in available]
+    parquet_file = pq.ParquetFile(parquet_path)
+
+    index = BM25Index()
+    for batch in parquet_file.iter_batches(columns=columns):
+        rows = batch.to_pylist()
+        ids = make_point_ids([r["article_id"] for r in rows], [r["chunk_index"] for r in rows])
+        payloads = [
+            ChunkMetadata(point_id=pid, **r).model_dump() for pid, r in zip(ids, rows, strict=True)
+        ]
+        index.add_many(ids, [r["chunk_text"] for r in rows], payloads)
+    return index
+
+
+def hybrid_search(
+    query: str,
+    top_k: int = 5,
+    candidates: int = 50,
+    service: SearchService | None = None,
+    lexical: BM25Index | None = None,
+) -> list[qmodels.ScoredPoint]:
+    """Fuse vector and BM25 rankings with reciprocal rank fusion.
+
+    Returned points carry the fused RRF score and the chunk payload.
+    """
+    service = service or get_search_service(VECTOR_BACKEND)
+    # BM25Index defines __len__, so an empty index passed in on purpose is falsy.
+    if lexical is None:
+        lexical = get_bm25_index()
+
+    vector_hits = service.search(query, candidates)
+    lexical_hits = lexical.search(query, candidates)
+
+    fused = reciprocal_rank_fusion(
+        [[str(p.id) for p in vector_hits], [str(key) for key, _ in lexical_hits]],
+        k=RRF_K,
+    )[:top_k]
+
+    payloads = {str(p.id): p.payload for p in vector_hits}
+    return [
+        qmodels.ScoredPoint(
+            id=str(key),
+            version=0,
+            score=score,
+            payload=payloads.get(str(key)) or lexical.payload(key),
+        )
+        for key, score in fused
+    ]
@@ -1,11 +1,28 @@
 from __future__ import annotations
 
 import os
+import threading
 from typing import Any
 
+import mongoengine
+from mongoengine import connection as mongoengine_connection
 from pymongo import MongoClient
 from pymongo.collection import Collection
 from pymongo.database import Database
+from pymongo.monitoring import (
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutStartedEvent,
+    ConnectionClosedEvent,
+    ConnectionCreatedEvent,
+    ConnectionPoolListener,
+    ConnectionReadyEvent,
+    PoolClearedEvent,
+    PoolClosedEvent,
+    PoolCreatedEvent,
+    PoolReadyEvent,
+)
 
 MONGO_HOST = os.getenv("MONGO_HOST", "localhost")
 MONGO_PORT = int(os.getenv("MONGO_PORT", "27017"))
@@ -13,11 +30,174 @@ MONGO_USER = os.getenv("MONGO_INITDB_ROOT_USERNAME", "admin")
 MONGO_PASSWORD = os.getenv("MONGO_INITDB_ROOT_PASSWORD", "adminpassword")
 MONGO_DB = os.getenv("MONGO_DB", "dataeng")
 MONGO_COLLECTION = os.getenv("MONGO_COLLECTION", "articles")
+MONGO_URI = os.getenv(
+    "MONGO_URI", f"mongodb://{MONGO_USER}:{MONGO_PASSWORD}@{MONGO_HOST}:{MONGO_PORT}/"
+)
+
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0")) or None
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0")) or None
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+
+
+class PoolMetrics(ConnectionPoolListener):
+    """Connection pool counters across every client in the registry."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts: dict[str, int] = dict.fromkeys(
+                (
+                    "created",
+                    "closed",
+                    "checked_out",
+                    "checked_in",
+                    "checkout_failed",
+                    "pool_cleared",
+                    "in_use",
+                    "peak_in_use",
+                ),
+                0,
+            )
+
+    def _add(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self.counts[key] += delta
+            if key == "in_use":
+                self.counts["peak_in_use"] = max(self.counts["peak_in_use"], self.counts["in_use"])
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def pool_created(self, event: PoolCreatedEvent) -> None:
+        pass
+
+    def pool_ready(self, event: PoolReadyEvent) -> None:
+        pass
+
+    def pool_cleared(self, event: PoolClearedEvent) -> None:
+        self._add("pool_cleared")
+
+    def pool_closed(self, event: PoolClosedEvent) -> None:
+        pass
+
+    def connection_created(self, event: ConnectionCreatedEvent) -> None:
+        self._add("created")
+
+    def connection_ready(self, event: ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: ConnectionClosedEvent) -> None:
+        self._add("closed")
+
+    def connection_check_out_started(self, event: ConnectionCheckOutStartedEvent) -> None:
+        pass
+
+    def connection_check_out_failed(self, event: ConnectionCheckOutFailedEvent) -> None:
+        self._add("checkout_failed")
+
+    def connection_checked_out(self, event: ConnectionCheckedOutEvent) -> None:
+        self._add("checked_out")
+        self._add("in_use")
+
+    def connection_checked_in(self, event: ConnectionCheckedInEvent) -> None:
+        self._add("checked_in")
+        self._add("in_use", -1)
+
+
+pool_metrics = PoolMetrics()
+
+_clients: dict[str, MongoClient] = {}
+_clients_lock = threading.Lock()
+_mongoengine_aliases: set[str] = set()
+
+
+def get_client(uri: str | None = None) -> MongoClient:
+    """The process-wide MongoClient for `uri`, created on first use.
+
+    MongoClient is thread-safe and pools connections itself, so one client per
+    URI is shared by every caller in the process, PyMongo and MongoEngine alike.
+    """
+    uri = uri or MONGO_URI
+    client = _clients.get(uri)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(uri)
+        if client is None:
+            client = _clients[uri] = MongoClient(
+                uri,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                readPreference=MONGO_READ_PREFERENCE,
+                event_listeners=[pool_metrics],
+            )
+    return client
+
+
+def pool_stats() -> dict[str, int]:
+    """Pool counters plus the configured ceiling, e.g. to compare peak_in_use against."""
+    return {**pool_metrics.snapshot(), "max_pool_size": MONGO_MAX_POOL_SIZE}
+
+
+def connect_mongoengine(
+    alias: str = mongoengine.DEFAULT_CONNECTION_NAME,
+    db: str = MONGO_DB,
+    uri: str | None = None,
+) -> None:
+    """Register a MongoEngine alias backed by the shared client instead of its own."""
+    with _clients_lock:
+        if alias in _mongoengine_aliases:
+            return
+        _mongoengine_aliases.add(alias)
+    mongoengine.connect(db=db, alias=alias, mongo_client_class=lambda **_: get_client(uri))
+
+
+def close_clients() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+def _reset_after_fork() -> None:
+    # MongoClient is not fork-safe: a child must not reuse the parent's sockets
+    # or monitor threads. Forget the inherited clients (without closing them,
+    # which would touch the parent's connections) and let the child build its own.
+    global _clients_lock
+    _clients_lock = threading.Lock()
+    _clients.clear()
+    pool_metrics._lock = threading.Lock()
+    pool_metrics.reset()
+    for alias in _mongoengine_aliases:
+        # MongoEngine caches the client per alias; dropping the cache makes it
+        # call our client factory again, which now builds a fresh client.
+        mongoengine_connection._connections.pop(alias, None)
+        mongoengine_connection._dbs.pop(alias, None)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_database(db: str = MONGO_DB) -> Database:
+    return get_client()[db]
 
 
 def init_mongo() -> Collection[Any]:
-    uri = f"mongodb://{MONGO_USER}:{MONGO_PASSWORD}@{MONGO_HOST}:{MONGO_PORT}/"
-    client: MongoClient = MongoClient(uri)
-    db: Database = client[MONGO_DB]
-    collection: Collection[Any] = db[MONGO_COLLECTION]
+    connect_mongoengine()
+    collection: Collection[Any] = get_database()[MONGO_COLLECTION]
     return collection
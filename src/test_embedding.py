@@ -4,6 +4,8 @@ import google.generativeai as genai
 import numpy as np
 from dotenv import load_dotenv
 
+from src.embedding_cache import get_embedding_cache
+
 load_dotenv()
 api_key = os.getenv("GOOGLE_API_KEY")
 
@@ -22,14 +24,19 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
 if __name__ == "__main__":
     phrases = ["My cat is sleeping on the sofa.", "I want to do nothing at home.", "I miss you."]
 
+    cache = get_embedding_cache()
     embeddings = []
     for text in phrases:
-        result = genai.embed_content(
-            model=EMBEDDING_MODEL,
-            content=text,
-            task_type="SEMANTIC_SIMILARITY",
-        )
-        emb = np.array(result["embedding"], dtype=np.float32)
+        cached = cache.get(EMBEDDING_MODEL, "SEMANTIC_SIMILARITY", text)
+        if cached is None:
+            result = genai.embed_content(
+                model=EMBEDDING_MODEL,
+                content=text,
+                task_type="SEMANTIC_SIMILARITY",
+            )
+            cached = list(result["embedding"])
+            cache.put(EMBEDDING_MODEL, "SEMANTIC_SIMILARITY", text, cached)
+        emb = np.array(cached, dtype=np.float32)
         embeddings.append(emb)
 
     base = embeddings[0]
@@ -40,4 +47,5 @@ if __name__ == "__main__":
         sim = cosine_similarity(base, embeddings[i])
         print(f"Similarity('{phrases[0]}', '{phrases[i]}) = {sim:.4f}")
 
+    print("Embedding cache:", cache.stats())
     print("\n Embedding test finished successfully")
@@ -1,64 +1,200 @@
 from __future__ import annotations
 
+import json
+import os
+import time
 import xml.etree.ElementTree as ET
-from typing import Any
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any
 
 import pandas as pd
 import requests
 
 ARXIV_API_URL = "http://export.arxiv.org/api/query"
 
+# arXiv asks API clients for no more than one request every three seconds.
+ARXIV_REQUEST_DELAY = float(os.getenv("ARXIV_REQUEST_DELAY", "3.0"))
+HARVEST_PAGE_SIZE = 100
+HARVEST_CURSOR_PATH = os.getenv("ARXIV_HARVEST_CURSOR", "data/arxiv_harvest_cursor.json")
 
-def fetch_arxiv_to_dataframe(query: str, max_results: int = 10) -> pd.DataFrame:
-    params: dict[str, str] = {
-        "search_query": query,
-        "start": "0",
-        "max_results": str(max_results),
-    }
-    resp = requests.get(ARXIV_API_URL, params=params, timeout=10)
-    resp.raise_for_status()
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+
+def _entry_to_row(entry: ET.Element) -> dict[str, Any]:
+    arxiv_id = entry.findtext(f"{_ATOM}id", default="") or ""
+    if "/" in arxiv_id:
+        arxiv_id = arxiv_id.rsplit("/", maxsplit=1)[-1]
+
+    title = entry.findtext(f"{_ATOM}title", default="") or ""
+    summary = entry.findtext(f"{_ATOM}summary", default="") or ""
+
+    authors = [
+        a.findtext(f"{_ATOM}name", default="") or "" for a in entry.findall(f"{_ATOM}author")
+    ]
+    author_full_name = authors[0] if authors else ""
 
-    root = ET.fromstring(resp.content)
+    author_title = "Researcher"
 
-    ns = {
-        "atom": "http://www.w3.org/2005/Atom",
-        "arxiv": "http://arxiv.org/schemas/atom",
+    file_path = f"papers/{arxiv_id}.pdf"
+
+    return {
+        "title": title.strip(),
+        "summary": summary.strip(),
+        "file_path": file_path,
+        "arxiv_id": arxiv_id,
+        "author_full_name": author_full_name,
+        "author_title": author_title,
     }
 
-    rows: list[dict[str, Any]] = []
 
-    for entry in root.findall("atom:entry", ns):
-        arxiv_id = entry.findtext("atom:id", default="", namespaces=ns) or ""
-        if "/" in arxiv_id:
-            arxiv_id = arxiv_id.rsplit("/", maxsplit=1)[-1]
+def parse_feed(source: IO[bytes]) -> tuple[list[dict[str, Any]], int | None]:
+    """Rows of an Atom feed plus opensearch:totalResults, parsed incrementally.
 
-        title = entry.findtext("atom:title", default="", namespaces=ns) or ""
-        summary = entry.findtext("atom:summary", default="", namespaces=ns) or ""
+    Each <entry> is converted and cleared as soon as it ends, so the feed never
+    sits in memory as a full tree.
+    """
+    rows: list[dict[str, Any]] = []
+    total: int | None = None
+    root: ET.Element | None = None
 
-        authors = [
-            a.findtext("atom:name", default="", namespaces=ns) or ""
-            for a in entry.findall("atom:author", ns)
-        ]
-        author_full_name = authors[0] if authors else ""
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        if elem.tag == f"{_ATOM}entry":
+            rows.append(_entry_to_row(elem))
+            elem.clear()
+            if root is not None:
+                root.remove(elem)
+        elif elem.tag == f"{_OPENSEARCH}totalResults" and elem.text:
+            total = int(elem.text)
 
-        author_title = "Researcher"
+    return rows, total
 
-        file_path = f"papers/{arxiv_id}.pdf"
 
-        rows.append(
-            {
-                "title": title.strip(),
-                "summary": summary.strip(),
-                "file_path": file_path,
-                "arxiv_id": arxiv_id,
-                "author_full_name": author_full_name,
-                "author_title": author_title,
-            },
-        )
+def _rows_to_dataframe(rows: list[dict[str, Any]]) -> pd.DataFrame:
+    columns = ["title", "summary", "file_path", "arxiv_id", "author_full_name", "author_title"]
+    return pd.DataFrame(rows, columns=columns).astype("string")
 
-    df = pd.DataFrame(rows, dtype="string")
 
-    for col in df.columns:
-        df[col] = df[col].astype("string")
+def _get_feed(
+    session: requests.Session, query: str, start: int, max_results: int
+) -> requests.Response:
+    params: dict[str, str] = {
+        "search_query": query,
+        "start": str(start),
+        "max_results": str(max_results),
+    }
+    resp = session.get(ARXIV_API_URL, params=params, timeout=30, stream=True)
+    resp.raise_for_status()
+    resp.raw.decode_content = True
+    return resp
+
 
-    return df
+def fetch_arxiv_to_dataframe(query: str, max_results: int = 10) -> pd.DataFrame:
+    with requests.Session() as session, _get_feed(session, query, 0, max_results) as resp:
+        rows, _ = parse_feed(resp.raw)
+    return _rows_to_dataframe(rows)
+
+
+class HarvestCursor:
+    """Next `start` offset per query, persisted after every consumed page."""
+
+    def __init__(self, path: str | Path = HARVEST_CURSOR_PATH) -> None:
+        self.path = Path(path)
+        self.state: dict[str, dict[str, Any]] = {}
+        if self.path.is_file():
+            self.state = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def get(self, query: str) -> dict[str, Any]:
+        return self.state.get(query, {"start": 0, "total": None, "done": False})
+
+    def update(self, query: str, **fields: Any) -> None:
+        self.state[query] = {**self.get(query), **fields}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def reset(self, query: str) -> None:
+        self.update(query, start=0, total=None, done=False)
+
+
+def harvest_arxiv(
+    query: str,
+    page_size: int = HARVEST_PAGE_SIZE,
+    max_results: int | None = None,
+    delay: float = ARXIV_REQUEST_DELAY,
+    cursor: HarvestCursor | None = None,
+    empty_page_retries: int = 3,
+) -> Iterator[pd.DataFrame]:
+    """Yield DataFrame pages of `query`, walking `start` offsets until exhausted.
+
+    Requests are spaced at least `delay` seconds apart. The next page is fetched
+    in the background while the caller processes the current one, and the
+    cursor only advances once the caller asks for the next page, so an
+    interrupted harvest resumes at the first page it had not finished.
+    """
+    cursor = cursor or HarvestCursor()
+    state = cursor.get(query)
+    if state["done"]:
+        print(f"Harvest of {query!r} already complete; reset the cursor to run it again.")
+        return
+
+    session = requests.Session()
+    last_request = 0.0
+
+    def _fetch(start: int) -> tuple[list[dict[str, Any]], int | None]:
+        nonlocal last_request
+        rows: list[dict[str, Any]] = []
+        total: int | None = None
+        for _ in range(empty_page_retries + 1):
+            wait = last_request + delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            last_request = time.monotonic()
+            with _get_feed(session, query, start, page_size) as resp:
+                rows, total = parse_feed(resp.raw)
+            # arXiv occasionally returns an empty page mid-harvest; ask again.
+            if rows or total is None or start >= total:
+                break
+        return rows, total
+
+    start: int = state["start"]
+    harvested = 0
+    with session, ThreadPoolExecutor(max_workers=1) as prefetch:
+        pending: Future[tuple[list[dict[str, Any]], int | None]] = prefetch.submit(_fetch, start)
+        while True:
+            rows, total = pending.result()
+            if max_results is not None:
+                rows = rows[: max_results - harvested]
+            if not rows:
+                # Only totalResults says the harvest is over; an empty page before
+                # that (even after retries) leaves the cursor here to resume from.
+                done = total is not None and start >= total
+                cursor.update(query, start=start, total=total, done=done)
+                if not done:
+                    print(f"[arxiv] {query!r}: empty page at {start} of {total}; stopping early")
+                return
+
+            next_start = start + len(rows)
+            harvested += len(rows)
+            more = (total is None or next_start < total) and (
+                max_results is None or harvested < max_results
+            )
+            if more:
+                pending = prefetch.submit(_fetch, next_start)
+
+            print(f"[arxiv] {query!r}: rows {start}-{next_start - 1} of {total}")
+            yield _rows_to_dataframe(rows)
+
+            start = next_start
+            cursor.update(
+                query, start=start, total=total, done=total is not None and start >= total
+            )
+            if not more:
+                return
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import Insert, func, select
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm import Session
+
+from ..models.sql_models import Author, ScientificArticle
+
+AuthorKey = tuple[str, str | None]
+
+# Keep IN (...) lists and multi-row VALUES well under server packet limits.
+BULK_CHUNK_SIZE = 1000
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def insert_ignoring_duplicates(session: Session) -> Insert:
+    """INSERT into scientific_articles that leaves existing arxiv_ids untouched.
+
+    MariaDB gets `ON DUPLICATE KEY UPDATE arxiv_id = arxiv_id`; SQLite (used for
+    local runs) gets the equivalent `ON CONFLICT DO NOTHING`. Execute it with a
+    list of row dicts so SQLAlchemy batches it into multi-row statements.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(ScientificArticle)
+        return stmt.on_duplicate_key_update(arxiv_id=stmt.inserted.arxiv_id)
+    if dialect == "sqlite":
+        return sqlite.insert(ScientificArticle).on_conflict_do_nothing()
+    raise ValueError(f"Bulk insert not supported for dialect {dialect!r}")
+
+
+def resolve_author_ids(
+    session: Session,
+    keys: Iterable[AuthorKey],
+    known: dict[AuthorKey, int] | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> dict[AuthorKey, int]:
+    """Map (full_name, title) to an author id, inserting authors that do not exist.
+
+    `authors` has no unique key, so existing rows are found with a SELECT per
+    chunk and only the missing ones are inserted. Where earlier loaders left
+    several rows with the same name and title, the lowest id is reused. Names are
+    compared byte for byte, whatever the column collation. `known` is updated
+    in place and can be carried across calls as an identity map.
+    """
+    known = {} if known is None else known
+    missing = [k for k in dict.fromkeys(keys) if k not in known]
+
+    for chunk in _chunks(missing, chunk_size):
+        names = {name for name, _ in chunk}
+        _lookup_authors(session, names, known)
+        new = [k for k in chunk if k not in known]
+        if new:
+            session.execute(
+                Author.__table__.insert(),
+                [{"full_name": name, "title": title} for name, title in new],
+            )
+            _lookup_authors(session, {name for name, _ in new}, known)
+    return known
+
+
+def binary_collation(dialect: Dialect) -> str:
+    # The Python identity map compares exactly. The server collation may not:
+    # MariaDB's default uca1400_ai_ci folds case and accents, and *_bin still
+    # pads trailing spaces, so "de Sitter"/"De Sitter" would share one row.
+    if dialect.name == "sqlite":
+        return "BINARY"
+    return "utf8mb4_nopad_bin" if getattr(dialect, "is_mariadb", False) else "utf8mb4_0900_bin"
+
+
+def _lookup_authors(session: Session, names: set[str], known: dict[AuthorKey, int]) -> None:
+    # One row per (full_name, title), however many duplicates the table holds.
+    collation = binary_collation(session.get_bind().dialect)
+    full_name = Author.full_name.collate(collation)
+    title = Author.title.collate(collation)
+    rows = session.execute(
+        select(func.min(Author.id), full_name, title)
+        .where(full_name.in_(names))
+        .group_by(full_name, title)
+    )
+    for author_id, name, author_title in rows:
+        known.setdefault((name, author_title), author_id)
+
+
+def fetch_article_ids(
+    session: Session,
+    arxiv_ids: Sequence[str],
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> dict[str, tuple[int, int]]:
+    """arxiv_id -> (article id, author id), one SELECT ... IN per chunk."""
+    found: dict[str, tuple[int, int]] = {}
+    for chunk in _chunks(arxiv_ids, chunk_size):
+        rows = session.execute(
+            select(
+                ScientificArticle.arxiv_id,
+                ScientificArticle.id,
+                ScientificArticle.author_id,
+            ).where(ScientificArticle.arxiv_id.in_(chunk))
+        )
+        for arxiv_id, article_id, author_id in rows:
+            found[arxiv_id] = (article_id, author_id)
+    return found
+
+
+def _insert_counted(session: Session, rows: list[dict[str, Any]], chunk_size: int) -> int:
+    # Still guarded: another writer may have inserted the same arxiv_ids meanwhile.
+    # Such rows keep their stored author, so they are not counted; neither
+    # ON DUPLICATE KEY nor ON CONFLICT gives a usable per-row rowcount for this.
+    session.execute(insert_ignoring_duplicates(session), rows)
+    stored = fetch_article_ids(session, [r["arxiv_id"] for r in rows], chunk_size)
+    return sum(1 for r in rows if stored.get(r["arxiv_id"], (None, None))[1] == r["author_id"])
+
+
+def insert_articles(
+    session: Session,
+    rows: Sequence[Mapping[str, Any]],
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """Insert article rows (with author_id set), keeping the first row per arxiv_id
+    and skipping arxiv_ids already in the table. Returns how many rows were new."""
+    inserted = 0
+    for chunk in _chunks(rows, chunk_size):
+        existing = fetch_article_ids(session, [r["arxiv_id"] for r in chunk], chunk_size)
+        new: dict[str, dict[str, Any]] = {}
+        for row in chunk:
+            if row["arxiv_id"] not in existing:
+                new.setdefault(row["arxiv_id"], dict(row))
+        if new:
+            inserted += _insert_counted(session, list(new.values()), chunk_size)
+    return inserted
+
+
+def author_key(row: Mapping[str, Any]) -> AuthorKey:
+    title = row["author_title"]
+    return str(row["author_full_name"]), None if title is None else str(title)
+
+
+def insert_new_articles(
+    session: Session,
+    rows: Sequence[Mapping[str, Any]],
+    known: dict[AuthorKey, int] | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """Like insert_articles, for rows carrying author_full_name/author_title
+    instead of author_id.
+
+    Authors are resolved only for the rows that will actually be inserted (the
+    first per arxiv_id, not already stored), so duplicates never create authors.
+    """
+    known = {} if known is None else known
+    inserted = 0
+    for chunk in _chunks(rows, chunk_size):
+        first: dict[str, Mapping[str, Any]] = {}
+        for row in chunk:
+            first.setdefault(str(row["arxiv_id"]), row)
+        existing = fetch_article_ids(session, list(first), chunk_size)
+        new = {arxiv_id: row for arxiv_id, row in first.items() if arxiv_id not in existing}
+        if not new:
+            continue
+
+        authors = resolve_author_ids(session, map(author_key, new.values()), known, chunk_size)
+        values = [
+            {
+                "title": str(row["title"]),
+                "summary": str(row["summary"]),
+                "file_path": str(row["file_path"]),
+                "arxiv_id": arxiv_id,
+                "author_id": authors[author_key(row)],
+            }
+            for arxiv_id, row in new.items()
+        ]
+        inserted += _insert_counted(session, values, chunk_size)
+    return inserted
@@ -1,51 +1,43 @@
 from __future__ import annotations
 
-from typing import cast
-
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-
 
-def add_html_content(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+from .html_extract import extract_texts
+from .http_fetcher import AsyncFetcher, HttpCache
 
-    def _download(row: pd.Series) -> str:
-        arxiv_id = row.get("arxiv_id", "")
-        if not arxiv_id:
-            return ""
-        url = f"https://arxiv.org/abs/{arxiv_id}"
-        try:
-            resp = requests.get(url, timeout=10)
-            resp.raise_for_status()
-            html_text: str = resp.text
-            return html_text
-        except requests.RequestException:
-            return ""
-
-    df["html_content"] = df.apply(_download, axis=1)
-    df["html_content"] = df["html_content"].astype("string")
-    return df
+ARXIV_ABS_URL = "https://arxiv.org/abs/{arxiv_id}"
 
 
-def add_text_from_html(df: pd.DataFrame) -> pd.DataFrame:
+def add_html_content(df: pd.DataFrame, fetcher: AsyncFetcher | None = None) -> pd.DataFrame:
+    """Download the arXiv abstract page of every row concurrently ("" on failure)."""
     df = df.copy()
 
-    def _extract(row: pd.Series) -> str:
-        html = row.get("html_content", "")
-        if not html:
-            return ""
+    arxiv_ids = [str(a) if pd.notna(a) else "" for a in df.get("arxiv_id", [""] * len(df))]
+    urls = [ARXIV_ABS_URL.format(arxiv_id=a) for a in arxiv_ids if a]
 
-        soup = BeautifulSoup(str(html), "html.parser")
+    if fetcher is None:
+        with AsyncFetcher(cache=HttpCache()) as own_fetcher:
+            bodies = own_fetcher.fetch_many(urls)
+    else:
+        bodies = fetcher.fetch_many(urls)
 
-        for tag_name in ("script", "style", "nav", "header", "footer"):
-            for tag in soup.find_all(tag_name):
-                tag.decompose()
+    fetched = iter(bodies)
+    df["html_content"] = [next(fetched) if a else "" for a in arxiv_ids]
+    df["html_content"] = df["html_content"].astype("string")
+    return df
 
-        raw_text = soup.get_text(separator=" ", strip=True)
-        text_str: str = cast(str, raw_text)
-        return text_str
 
-    df["text_content"] = df.apply(_extract, axis=1)
+def add_text_from_html(
+    df: pd.DataFrame,
+    backend: str | None = None,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """Visible page text per row; see html_extract for the available backends."""
+    df = df.copy()
+
+    htmls = [
+        str(h) if pd.notna(h) and h else None for h in df.get("html_content", [None] * len(df))
+    ]
+    df["text_content"] = extract_texts(htmls, backend=backend, workers=workers)
     df["text_content"] = df["text_content"].astype("string")
     return df
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import cast
+
+HTML_EXTRACTOR = os.getenv("HTML_EXTRACTOR")
+EXTRACT_CHUNK_SIZE = 256
+STRIP_TAGS = ("script", "style", "nav", "header", "footer")
+
+# Fastest first; the first importable one is the default.
+_PREFERENCE = ("selectolax", "lxml", "bs4")
+
+
+def _extract_selectolax(html: str) -> str:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(list(STRIP_TAGS))
+    root = tree.root
+    if root is None:
+        return ""
+    texts = (node.text_content for node in root.traverse(include_text=True) if node.tag == "-text")
+    return " ".join(s for s in (t.strip() for t in texts if t) if s)
+
+
+def _extract_lxml(html: str) -> str:
+    import lxml.html
+    from lxml import etree
+
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    try:
+        root = lxml.html.document_fromstring(html.encode("utf-8"), parser=parser)
+    except etree.ParserError:
+        return ""
+    etree.strip_elements(root, etree.Comment, *STRIP_TAGS, with_tail=False)
+    return " ".join(s for s in (t.strip() for t in root.itertext()) if s)
+
+
+def _extract_bs4(html: str) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag_name in STRIP_TAGS:
+        for tag in soup.find_all(tag_name):
+            tag.decompose()
+    return cast(str, soup.get_text(separator=" ", strip=True))
+
+
+EXTRACTORS: dict[str, Callable[[str], str]] = {
+    "selectolax": _extract_selectolax,
+    "lxml": _extract_lxml,
+    "bs4": _extract_bs4,
+}
+
+
+def available_backends() -> list[str]:
+    return [name for name in _PREFERENCE if importlib.util.find_spec(name) is not None]
+
+
+def resolve_backend(name: str | None = None) -> str:
+    name = name or HTML_EXTRACTOR
+    if name is None:
+        return available_backends()[0]
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown HTML extractor: {name!r}")
+    return name
+
+
+def _extract_chunk(backend: str, htmls: Sequence[str | None]) -> list[str]:
+    extract = EXTRACTORS[backend]
+    return [extract(h) if h else "" for h in htmls]
+
+
+def extract_texts(
+    htmls: Sequence[str | None],
+    backend: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = EXTRACT_CHUNK_SIZE,
+) -> list[str]:
+    """Visible text of each page, in input order ("" for empty input).
+
+    Chunks of `chunk_size` pages are spread over a process pool; `workers=1`
+    or a single chunk runs in-process.
+    """
+    backend = resolve_backend(backend)
+    chunks = [htmls[i : i + chunk_size] for i in range(0, len(htmls), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        return [text for chunk in chunks for text in _extract_chunk(backend, chunk)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(partial(_extract_chunk, backend), chunks)
+        return [text for chunk in results for text in chunk]
+
+
+def load_saved_pages(pages_dir: str | Path) -> list[str]:
+    """Saved pages: *.html files, or the *.body files of an HttpCache directory."""
+    root = Path(pages_dir)
+    paths = sorted(root.glob("*.html")) + sorted(root.glob("*/*.body"))
+    return [p.read_text(encoding="utf-8", errors="replace") for p in paths]
+
+
+def benchmark_extractors(
+    pages: Sequence[str],
+    backends: Sequence[str] | None = None,
+    repeat: int = 3,
+) -> dict[str, float]:
+    """Best-of-`repeat` input chars/sec per backend, single process."""
+    total_chars = sum(len(p) for p in pages)
+    results: dict[str, float] = {}
+    for backend in backends or available_backends():
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = perf_counter()
+            _extract_chunk(backend, pages)
+            best = min(best, perf_counter() - t0)
+        results[backend] = total_chars / best if best > 0 else float("inf")
+        print(
+            f"[{backend}] {len(pages)} pages, {total_chars / 1e6:.2f} MB: "
+            f"{results[backend] / 1e6:.2f} M chars/s"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    pages_dir = sys.argv[1] if len(sys.argv) > 1 else "data/http_cache"
+    saved = load_saved_pages(pages_dir)
+    if not saved:
+        raise SystemExit(f"No saved pages found in {pages_dir}")
+    benchmark_extractors(saved)
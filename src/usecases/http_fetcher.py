@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "data/http_cache")
+MAX_CONNECTIONS = 32
+PER_HOST_LIMIT = 4
+# Politeness comes from PER_HOST_LIMIT requests in flight per host. A minimum
+# gap between request starts on a host is opt-in: it serialises every request
+# to that host, so 3.0 (arxiv_client's API delay) turns 10k pages into hours.
+POLITENESS_DELAY = float(os.getenv("HTTP_POLITENESS_DELAY", "0.0"))
+REQUEST_TIMEOUT = 10.0
+MAX_ATTEMPTS = 4
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class CachedResponse:
+    body: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class HttpCache:
+    """On-disk cache of response bodies plus the validators needed to revalidate them."""
+
+    def __init__(self, root: str | Path = HTTP_CACHE_DIR) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = self.root / key[:2] / key
+        return base.with_suffix(".json"), base.with_suffix(".body")
+
+    def get(self, url: str) -> CachedResponse | None:
+        meta_path, body_path = self._paths(url)
+        if not meta_path.is_file() or not body_path.is_file():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return CachedResponse(
+            body=body_path.read_text(encoding="utf-8"),
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def put(self, url: str, entry: CachedResponse) -> None:
+        meta_path, body_path = self._paths(url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"url": url, "etag": entry.etag, "last_modified": entry.last_modified}
+        # Body first: a reader only trusts the entry once its metadata exists.
+        for path, content in ((body_path, entry.body), (meta_path, json.dumps(meta))):
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(content, encoding="utf-8")
+            os.replace(tmp, path)
+
+
+class _RetryableResponse(Exception):
+    def __init__(self, status: int, retry_after: float | None) -> None:
+        super().__init__(f"HTTP {status}")
+        self.retry_after = retry_after
+
+
+class AsyncFetcher:
+    """Concurrent GETs over one pooled requests.Session.
+
+    Blocking requests run on a thread pool sized to the connection pool; asyncio
+    only schedules them. Each host gets at most `per_host` requests in flight
+    and, if `delay` is set, at least that many seconds between uncached request
+    starts. Responses with an ETag
+    or Last-Modified header are cached and revalidated with conditional requests.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = MAX_CONNECTIONS,
+        per_host: int = PER_HOST_LIMIT,
+        delay: float = POLITENESS_DELAY,
+        timeout: float = REQUEST_TIMEOUT,
+        max_attempts: int = MAX_ATTEMPTS,
+        cache: HttpCache | None = None,
+    ) -> None:
+        self.per_host = per_host
+        self.delay = delay
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.cache = cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._host_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._next_start: dict[str, float] = defaultdict(float)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def __enter__(self) -> AsyncFetcher:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    async def _wait_turn(self, host: str) -> None:
+        if self.delay <= 0:
+            return
+        async with self._host_locks[host]:
+            wait = self._next_start[host] - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_start[host] = time.monotonic() + self.delay
+
+    def _get(self, url: str, cached: CachedResponse | None) -> str:
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        resp = self.session.get(url, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304 and cached is not None:
+            return cached.body
+        if resp.status_code in RETRYABLE_STATUS:
+            retry_after = resp.headers.get("Retry-After")
+            raise _RetryableResponse(
+                resp.status_code,
+                float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        resp.raise_for_status()
+
+        body = resp.text
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if self.cache is not None and (etag or last_modified):
+            self.cache.put(url, CachedResponse(body, etag, last_modified))
+        return body
+
+    async def fetch(self, url: str) -> str:
+        """Body of `url`, or "" when it cannot be fetched."""
+        host = urlsplit(url).netloc
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(self.per_host)
+
+        loop = asyncio.get_running_loop()
+        cached = self.cache.get(url) if self.cache is not None else None
+
+        for attempt in range(self.max_attempts):
+            backoff = random.uniform(0.0, min(30.0, 0.5 * 2**attempt))
+            try:
+                async with slots:
+                    # Revalidating a cached page is a cheap conditional GET; no gap needed.
+                    if cached is None:
+                        await self._wait_turn(host)
+                    return await loop.run_in_executor(self._executor, self._get, url, cached)
+            except _RetryableResponse as exc:
+                backoff = max(backoff, exc.retry_after or 0.0)
+            except (requests.ConnectionError, requests.Timeout):
+                pass
+            except requests.RequestException:
+                return ""
+            if attempt < self.max_attempts - 1:
+                await asyncio.sleep(backoff)
+        return ""
+
+    async def fetch_all(self, urls: Sequence[str]) -> list[str]:
+        return list(await asyncio.gather(*(self.fetch(url) for url in urls)))
+
+    def fetch_many(self, urls: Sequence[str]) -> list[str]:
+        """Blocking wrapper around fetch_all for synchronous callers.
+
+        Raises RuntimeError inside a running event loop; await fetch_all there.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "fetch_many() cannot run inside an event loop; use `await fetch_all(urls)`"
+            )
+        unique = list(dict.fromkeys(urls))
+        # asyncio primitives bind to the loop they are first used on; asyncio.run makes a new one.
+        self._host_slots = {}
+        self._host_locks = defaultdict(asyncio.Lock)
+        bodies = dict(zip(unique, asyncio.run(self.fetch_all(unique)), strict=True))
+        return [bodies[url] for url in urls]
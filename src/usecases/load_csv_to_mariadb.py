@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import csv
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
 
 from sqlalchemy.exc import IntegrityError
 
 from ..models.sql_models import Author, ScientificArticle
 from ..storage.mariadb import get_session, init_db
+from .bulk_mariadb import AuthorKey, insert_new_articles
+
+CSV_CHUNK_SIZE = 10_000
 
 
 def save_article(line: dict[str, str]) -> ScientificArticle | None:
@@ -48,3 +53,49 @@ def load_data_from_csv(path: Path) -> list[ScientificArticle]:
 
     print(f"Imported {len(articles)} articles from {path}")
     return articles
+
+
+@dataclass
+class ImportStats:
+    rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    authors: int = 0
+    chunks: int = 0
+
+
+def import_csv(path: Path, chunk_size: int = CSV_CHUNK_SIZE) -> ImportStats:
+    """Stream the CSV in chunks, one transaction per chunk.
+
+    Authors are reused through an in-memory (full_name, title) -> id map and
+    only resolved for rows that get inserted. Rows whose arxiv_id repeats or
+    already exists are counted as duplicates instead of raising.
+    """
+    init_db()
+
+    stats = ImportStats()
+    authors: dict[AuthorKey, int] = {}
+
+    with path.open("r", encoding="utf-8") as file, get_session() as session:
+        reader = csv.DictReader(file)
+        while chunk := list(islice(reader, chunk_size)):
+            try:
+                inserted = insert_new_articles(session, chunk, known=authors)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+            duplicates = len(chunk) - inserted
+            stats.chunks += 1
+            stats.rows += len(chunk)
+            stats.inserted += inserted
+            stats.duplicates += duplicates
+            print(f"[csv] chunk {stats.chunks}: {inserted} inserted, {duplicates} duplicates")
+
+    stats.authors = len(authors)
+    print(
+        f"Imported {stats.inserted} of {stats.rows} articles from {path} "
+        f"({stats.duplicates} duplicates, {stats.authors} authors)"
+    )
+    return stats
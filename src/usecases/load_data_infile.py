@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import csv
+import os
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ..storage.mariadb import get_bulk_session, init_db
+from .bulk_mariadb import binary_collation, fetch_article_ids
+from .load_csv_to_mariadb import ImportStats
+
+STAGE_COLUMNS = ("title", "summary", "file_path", "arxiv_id", "author_full_name", "author_title")
+StageRow = tuple[str, str, str, str, str, str | None]
+
+_STAGE_DDL = {
+    "mysql": """
+        CREATE TEMPORARY TABLE stage_articles (
+            row_no BIGINT AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(200),
+            summary TEXT,
+            file_path VARCHAR(200),
+            arxiv_id VARCHAR(50),
+            author_full_name VARCHAR(100),
+            author_title VARCHAR(100),
+            KEY ix_stage_arxiv_id (arxiv_id)
+        ) CHARACTER SET utf8mb4
+    """,
+    "sqlite": """
+        CREATE TEMP TABLE stage_articles (
+            row_no INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            summary TEXT,
+            file_path TEXT,
+            arxiv_id TEXT,
+            author_full_name TEXT,
+            author_title TEXT
+        )
+    """,
+}
+
+# First row per arxiv_id, kept in its own table: MariaDB cannot reference one
+# temporary table twice in a query.
+_FIRST_ROWS = {
+    "mysql": """
+        CREATE TEMPORARY TABLE stage_first (PRIMARY KEY (row_no))
+        SELECT arxiv_id, MIN(row_no) AS row_no FROM stage_articles GROUP BY arxiv_id
+    """,
+    "sqlite": """
+        CREATE TEMP TABLE stage_first AS
+        SELECT arxiv_id, MIN(row_no) AS row_no FROM stage_articles GROUP BY arxiv_id
+    """,
+}
+
+_COUNT_EXISTING = """
+    SELECT COUNT(*) FROM stage_first f JOIN scientific_articles a ON a.arxiv_id = f.arxiv_id
+"""
+
+# {eq} is the null-safe equality operator, {now} the current UTC time and {bin}
+# the binary collation bulk_mariadb matches author names with.
+_MERGE_AUTHORS = """
+    INSERT INTO authors (full_name, title)
+    SELECT DISTINCT s.author_full_name, s.author_title
+    FROM stage_articles s
+    JOIN stage_first f ON f.row_no = s.row_no
+    LEFT JOIN scientific_articles a ON a.arxiv_id = s.arxiv_id
+    WHERE a.id IS NULL
+      AND NOT EXISTS (
+        SELECT 1 FROM authors au
+        WHERE au.full_name = s.author_full_name COLLATE {bin}
+          AND au.title {eq} s.author_title COLLATE {bin}
+      )
+"""
+
+_MERGE_ARTICLES = """
+    {insert} INTO scientific_articles
+        (title, summary, file_path, arxiv_id, author_id, created_at, updated_at)
+    SELECT s.title, s.summary, s.file_path, s.arxiv_id,
+           (SELECT MIN(au.id) FROM authors au
+            WHERE au.full_name = s.author_full_name COLLATE {bin}
+              AND au.title {eq} s.author_title COLLATE {bin}),
+           {now}, CURRENT_TIMESTAMP
+    FROM stage_articles s
+    JOIN stage_first f ON f.row_no = s.row_no
+    ORDER BY s.row_no
+    {on_duplicate}
+"""
+
+_DIALECT_SQL = {
+    "mysql": dict(
+        eq="<=>",
+        now="UTC_TIMESTAMP()",
+        insert="INSERT",
+        on_duplicate="ON DUPLICATE KEY UPDATE arxiv_id = scientific_articles.arxiv_id",
+    ),
+    "sqlite": dict(eq="IS", now="CURRENT_TIMESTAMP", insert="INSERT OR IGNORE", on_duplicate=""),
+}
+
+
+def _dialect(conn: Connection) -> str:
+    name = conn.dialect.name
+    name = "mysql" if name == "mariadb" else name
+    if name not in _STAGE_DDL:
+        raise ValueError(f"LOAD DATA ingestion not supported for dialect {name!r}")
+    return name
+
+
+def _quote(value: str | None) -> str:
+    if value is None:
+        return "NULL"
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _spool(rows: Iterable[StageRow]) -> Path:
+    """Write rows as a LOAD DATA-compatible file: quoted fields, bare NULL for None."""
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".csv", delete=False, encoding="utf-8", newline=""
+    ) as f:
+        for row in rows:
+            f.write(",".join(_quote(v) for v in row))
+            f.write("\n")
+    return Path(f.name)
+
+
+def _stage(conn: Connection, dialect: str, rows: Iterable[StageRow]) -> None:
+    _drop_stage(conn, dialect)
+    conn.execute(text(_STAGE_DDL[dialect]))
+    insert_stage = text(
+        f"INSERT INTO stage_articles ({', '.join(STAGE_COLUMNS)}) "
+        f"VALUES ({', '.join(':' + c for c in STAGE_COLUMNS)})"
+    )
+
+    if dialect != "mysql":
+        # SQLite has no bulk loader; executemany into the stage emulates it.
+        conn.execute(insert_stage, [dict(zip(STAGE_COLUMNS, r, strict=True)) for r in rows])
+        return
+
+    spool = _spool(rows)
+    try:
+        path = str(spool).replace("\\", "\\\\").replace("'", "\\'")
+        conn.execute(
+            text(
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE stage_articles "
+                "CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+                f"LINES TERMINATED BY '\\n' ({', '.join(STAGE_COLUMNS)})"
+            )
+        )
+    finally:
+        spool.unlink(missing_ok=True)
+
+
+def _merge(conn: Connection, dialect: str, stats: ImportStats) -> None:
+    sql = {**_DIALECT_SQL[dialect], "bin": binary_collation(conn.dialect)}
+    conn.execute(text(_FIRST_ROWS[dialect]))
+
+    stats.rows = conn.execute(text("SELECT COUNT(*) FROM stage_articles")).scalar_one()
+    existing = conn.execute(text(_COUNT_EXISTING)).scalar_one()
+
+    conn.execute(text(_MERGE_AUTHORS.format(**sql)))
+    conn.execute(text(_MERGE_ARTICLES.format(**sql)))
+
+    # Counted from the table rather than as distinct - existing, so arxiv_ids
+    # another writer stored between the two statements are not reported as ours.
+    stored = conn.execute(text(_COUNT_EXISTING)).scalar_one()
+    stats.inserted = stored - existing
+    stats.duplicates = stats.rows - stats.inserted
+    stats.chunks = 1
+
+
+def _drop_stage(conn: Connection, dialect: str) -> None:
+    # Temporary tables live as long as the pooled connection, not the session,
+    # and MariaDB does not roll back their creation.
+    temporary = "TEMPORARY " if dialect == "mysql" else ""
+    conn.execute(text(f"DROP {temporary}TABLE IF EXISTS stage_first"))
+    conn.execute(text(f"DROP {temporary}TABLE IF EXISTS stage_articles"))
+
+
+def load_rows_infile(session: Session, rows: Iterable[StageRow]) -> ImportStats:
+    """Stage rows in a temporary table, then merge them with set-based SQL.
+
+    Same duplicate semantics as the row-by-row loaders: the first row per
+    arxiv_id wins and arxiv_ids already in scientific_articles are left untouched.
+    On MariaDB the stage is filled with LOAD DATA LOCAL INFILE, which needs
+    `local_infile` on the client connection: use a session from
+    storage.mariadb.get_bulk_session / BulkSessionLocal. The server allows it by
+    default (MariaDB's local_infile variable is ON unless turned off).
+    """
+    stats = ImportStats()
+    conn = session.connection()
+    dialect = _dialect(conn)
+    try:
+        _stage(conn, dialect, rows)
+        _merge(conn, dialect, stats)
+        _drop_stage(conn, dialect)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return stats
+
+
+def load_csv_infile(path: Path) -> ImportStats:
+    init_db()
+
+    with path.open("r", encoding="utf-8", newline="") as file, get_bulk_session() as session:
+        rows: Iterator[StageRow] = (
+            (
+                line["title"],
+                line["summary"],
+                line["file_path"],
+                line["arxiv_id"],
+                line["author_full_name"],
+                line["author_title"],
+            )
+            for line in csv.DictReader(file)
+        )
+        stats = load_rows_infile(session, rows)
+
+    print(
+        f"Imported {stats.inserted} of {stats.rows} articles from {path} "
+        f"({stats.duplicates} duplicates)"
+    )
+    return stats
+
+
+def load_dataframe_infile(
+    df: pd.DataFrame,
+    session_factory: Callable[[], Session],
+) -> pd.DataFrame:
+    """LOAD DATA variant of load_dataframe_into_mariadb with the same result columns.
+
+    `session_factory` must hand out local_infile connections, e.g. BulkSessionLocal.
+    """
+    df = df.drop_duplicates(subset="arxiv_id").reset_index(drop=True)
+    rows: list[StageRow] = [
+        (
+            str(row.title),
+            str(row.summary),
+            str(row.file_path),
+            str(row.arxiv_id),
+            str(row.author_full_name),
+            None if row.author_title is None else str(row.author_title),
+        )
+        for row in df.itertuples(index=False)
+    ]
+
+    session = session_factory()
+    try:
+        load_rows_infile(session, rows)
+        ids = fetch_article_ids(session, [r[3] for r in rows])
+    finally:
+        session.close()
+
+    ids_df = pd.DataFrame(
+        [ids[r[3]] for r in rows],
+        columns=["article_id", "author_id"],
+        index=df.index,
+    ).astype("string")
+    df["article_id"] = ids_df["article_id"]
+    df["author_id"] = ids_df["author_id"]
+    return df
+
+
+if __name__ == "__main__":
+    load_csv_infile(Path(os.getenv("ARTICLES_CSV", "data/articles.csv")))
@@ -7,6 +7,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..models.sql_models import Author, ScientificArticle
+from .bulk_mariadb import BULK_CHUNK_SIZE, fetch_article_ids, insert_new_articles
 
 
 def _insert_row_into_mariadb(row: pd.Series, session: Session) -> tuple[int, int]:
@@ -63,3 +64,38 @@ def load_dataframe_into_mariadb(
         session.close()
 
     return df
+
+
+def load_dataframe_into_mariadb_bulk(
+    df: pd.DataFrame,
+    session_factory: Callable[[], Session],
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """Set-based variant of load_dataframe_into_mariadb with the same result columns.
+
+    Unlike the row-by-row loader, which creates one author per article, authors
+    are deduplicated on (full_name, title) and reused across rows. Articles whose
+    arxiv_id already exists keep their stored row and author.
+    """
+    df = df.drop_duplicates(subset="arxiv_id").reset_index(drop=True)
+    arxiv_ids = df["arxiv_id"].astype(str).tolist()
+
+    session = session_factory()
+    try:
+        insert_new_articles(session, df.to_dict("records"), chunk_size=chunk_size)
+        session.commit()
+        ids = fetch_article_ids(session, arxiv_ids, chunk_size)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    ids_df = pd.DataFrame(
+        [ids[arxiv_id] for arxiv_id in arxiv_ids],
+        columns=["article_id", "author_id"],
+        index=df.index,
+    ).astype("string")
+    df["article_id"] = ids_df["article_id"]
+    df["author_id"] = ids_df["author_id"]
+    return df
@@ -5,12 +5,15 @@ from typing import Any
 import pandas as pd
 from pymongo.collection import Collection
 
+from ..models.mongo_models import normalize_title
+
 
 def _row_to_document(row: pd.Series) -> dict[str, Any]:
     return {
         "article_id": str(row.get("article_id", "")),
         "author_id": str(row.get("author_id", "")),
         "title": str(row.get("title", "")),
+        "title_lower": normalize_title(str(row.get("title", ""))),
         "summary": str(row.get("summary", "")),
         "arxiv_id": str(row.get("arxiv_id", "")),
         "author_full_name": str(row.get("author_full_name", "")),
@@ -21,6 +24,7 @@ def _row_to_document(row: pd.Series) -> dict[str, Any]:
 
 
 def load_dataframe_into_mongodb(df: pd.DataFrame, collection: Collection) -> None:
+    """Insert one document per row; call mongo_search.ensure_search_indexes once at setup."""
     documents = df.apply(_row_to_document, axis=1).to_list()
     if not documents:
         return
@@ -1,10 +1,199 @@
 from __future__ import annotations
 
-from typing import Any
+import re
+from collections.abc import Mapping
+from typing import Any, Literal, NamedTuple
 
+from pymongo import ASCENDING, TEXT, UpdateOne
 from pymongo.collection import Collection
 
+from ..models.mongo_models import TEXT_INDEX_NAME, TEXT_INDEX_WEIGHTS, normalize_title
 
-def search_by_text(collection: Collection, keyword: str) -> list[dict[str, Any]]:
-    cursor = collection.find({"title": {"$regex": keyword, "$options": "i"}}).limit(10)
-    return list(cursor)
+Strategy = Literal["prefix", "text", "regex"]
+
+SEARCH_LIMIT = 10
+SEARCH_FIELDS = ("arxiv_id", "title", "author_full_name", "author.full_name")
+TITLE_LOWER_INDEX = "title_lower_1"
+BACKFILL_BATCH_SIZE = 1000
+# Text indexes earlier versions of this project created ("$text" in the mongoengine meta).
+_OWN_TEXT_INDEXES = {"text_text"}
+
+_REGEX_CHARS = re.compile(r"[\\^$.|?*+()\[\]{}]")
+
+
+class SearchQuery(NamedTuple):
+    strategy: Strategy
+    filter: dict[str, Any]
+    projection: dict[str, Any]
+    sort: list[tuple[str, Any]]
+
+
+def ensure_search_indexes(collection: Collection, backfill: bool = True) -> None:
+    """Create the weighted text index and the title_lower index if missing.
+
+    A setup step, not a per-write one: the export paths and 08_pipeline call it
+    before writing, which also replaces an old index before MongoEngine tries
+    to create the one its meta now declares. A collection can only hold one text
+    index, so the single-field one mongoengine used to create for this project
+    is replaced. A text index this module did not create is left alone and the
+    weighted one is skipped. With `backfill`, documents written before
+    title_lower existed get it filled in.
+    """
+    create_text = True
+    for name, info in collection.index_information().items():
+        # The server reports text keys as ("_fts", "text"), whatever the fields.
+        if all(kind != TEXT for _, kind in info["key"]) or name == TEXT_INDEX_NAME:
+            continue
+        if name in _OWN_TEXT_INDEXES:
+            print(f"[search] dropping text index {name!r}")
+            collection.drop_index(name)
+        else:
+            print(f"[search] keeping foreign text index {name!r}; not creating {TEXT_INDEX_NAME!r}")
+            create_text = False
+
+    if create_text:
+        collection.create_index(
+            [(field, TEXT) for field in TEXT_INDEX_WEIGHTS],
+            name=TEXT_INDEX_NAME,
+            weights=TEXT_INDEX_WEIGHTS,
+            default_language="english",
+        )
+    collection.create_index([("title_lower", ASCENDING)], name=TITLE_LOWER_INDEX)
+
+    if backfill:
+        _backfill_title_lower(collection)
+
+
+def _backfill_title_lower(collection: Collection) -> int:
+    ops: list[UpdateOne] = []
+    updated = 0
+    missing = collection.find({"title_lower": {"$exists": False}}, {"title": 1})
+    for doc in missing:
+        ops.append(
+            UpdateOne(
+                {"_id": doc["_id"]}, {"$set": {"title_lower": normalize_title(doc.get("title"))}}
+            )
+        )
+        if len(ops) >= BACKFILL_BATCH_SIZE:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += collection.bulk_write(ops, ordered=False).modified_count
+    if updated:
+        print(f"[search] backfilled title_lower on {updated} documents")
+    return updated
+
+
+def choose_strategy(keyword: str) -> Strategy:
+    """Pick a strategy from the query shape.
+
+    "quantum*" is a title prefix lookup, anything with other regex syntax is a
+    regex scan, and plain words or "quoted phrases" go to the text index.
+
+    Unlike the old title regex, $text matches stemmed whole words across title,
+    summary and text ("inflat" no longer finds "inflation"), and any regex
+    metacharacter, including "." or "+", sends the query down the regex scan.
+    """
+    if keyword.endswith("*") and not _REGEX_CHARS.search(keyword[:-1]):
+        return "prefix"
+    if _REGEX_CHARS.search(keyword):
+        return "regex"
+    return "text"
+
+
+def _prefix_range(prefix: str) -> dict[str, str]:
+    # Every string starting with `prefix` sorts in [prefix, prefix with its last
+    # character bumped), which gives the index exact bounds.
+    if not prefix:
+        return {"$gte": ""}
+    return {"$gte": prefix, "$lt": prefix[:-1] + chr(ord(prefix[-1]) + 1)}
+
+
+def build_query(
+    keyword: str,
+    strategy: Strategy | None = None,
+    fields: tuple[str, ...] = SEARCH_FIELDS,
+) -> SearchQuery:
+    strategy = strategy or choose_strategy(keyword)
+    projection: dict[str, Any] = {field: 1 for field in fields}
+
+    if strategy == "prefix":
+        prefix = normalize_title(keyword.removesuffix("*"))
+        return SearchQuery(
+            strategy, {"title_lower": _prefix_range(prefix)}, projection, [("title_lower", 1)]
+        )
+    if strategy == "text":
+        score = {"$meta": "textScore"}
+        return SearchQuery(
+            strategy,
+            {"$text": {"$search": keyword}},
+            {**projection, "score": score},
+            [("score", score)],
+        )
+    if strategy == "regex":
+        # Unanchored and case-insensitive: always a full scan, kept for patterns
+        # the indexes cannot answer.
+        return SearchQuery(
+            strategy, {"title": {"$regex": keyword, "$options": "i"}}, projection, []
+        )
+    raise ValueError(f"Unknown search strategy: {strategy!r}")
+
+
+def _find(collection: Collection, query: SearchQuery, limit: int) -> Any:
+    cursor = collection.find(query.filter, query.projection)
+    if query.sort:
+        cursor = cursor.sort(query.sort)
+    return cursor.limit(limit)
+
+
+def search_by_text(
+    collection: Collection,
+    keyword: str,
+    limit: int = SEARCH_LIMIT,
+    strategy: Strategy | None = None,
+) -> list[dict[str, Any]]:
+    """Matching documents. The strategy follows the query shape only; pass
+    strategy="regex" for substring matches the text index cannot give."""
+    query = build_query(keyword, strategy)
+    return list(_find(collection, query, limit))
+
+
+def explain_search(
+    collection: Collection,
+    keyword: str,
+    limit: int = SEARCH_LIMIT,
+    strategy: Strategy | None = None,
+) -> dict[str, Any]:
+    query = build_query(keyword, strategy)
+    explain: dict[str, Any] = _find(collection, query, limit).explain()
+    return explain
+
+
+def plan_stages(explain: Mapping[str, Any]) -> list[str]:
+    """Stage names of the winning plan, outermost first."""
+    plan = explain["queryPlanner"]["winningPlan"]
+    # Servers using the slot-based engine nest the classic plan under queryPlan.
+    plan = plan.get("queryPlan", plan)
+
+    stages: list[str] = []
+    pending = [plan]
+    while pending:
+        node = pending.pop(0)
+        stages.append(node["stage"])
+        if "inputStage" in node:
+            pending.append(node["inputStage"])
+        pending.extend(node.get("inputStages", []))
+    return stages
+
+
+def check_search_plan(
+    collection: Collection,
+    keyword: str,
+    strategy: Strategy | None = None,
+) -> bool:
+    """True when the query is answered from an index rather than a collection scan."""
+    strategy = strategy or choose_strategy(keyword)
+    stages = plan_stages(explain_search(collection, keyword, strategy=strategy))
+    indexed = "COLLSCAN" not in stages
+    print(f"[explain] {strategy} {keyword!r}: {' -> '.join(stages)}")
+    return indexed
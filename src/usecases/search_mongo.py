@@ -1,20 +1,120 @@
 from __future__ import annotations
 
+import warnings
+from collections.abc import Iterator, Mapping
+from typing import Any, NamedTuple
+
+from bson import ObjectId
+from pymongo.collection import Collection
+
 from src.models.mongo_models import ScientificArticleDocument
 from src.storage.mongodb import init_mongo
 
+SEARCH_BATCH_SIZE = 100
+SEARCH_PAGE_SIZE = 20
+
+# (score, _id) of the last hit on a page; the next page starts strictly after it.
+SearchKey = tuple[float, ObjectId]
+
+
+class SearchHit(NamedTuple):
+    id: ObjectId
+    arxiv_id: str | None
+    title: str | None
+    score: float
+
+
+def _text_pipeline(
+    keyword: str,
+    scope: Mapping[str, Any] | None,
+    after: SearchKey | None,
+    limit: int | None,
+) -> list[dict[str, Any]]:
+    # $text has to be in the first $match; scope is evaluated in the same stage.
+    pipeline: list[dict[str, Any]] = [
+        {"$match": {"$text": {"$search": keyword}, **(scope or {})}},
+        {"$project": {"arxiv_id": 1, "title": 1, "score": {"$meta": "textScore"}}},
+    ]
+    if after is not None:
+        score, last_id = after
+        pipeline.append(
+            {
+                "$match": {
+                    "$or": [{"score": {"$lt": score}}, {"score": score, "_id": {"$gt": last_id}}]
+                }
+            }
+        )
+    pipeline.append({"$sort": {"score": -1, "_id": 1}})
+    if limit is not None:
+        pipeline.append({"$limit": limit})
+    return pipeline
+
+
+def iter_search_text(
+    keyword: str,
+    scope: Mapping[str, Any] | None = None,
+    after: SearchKey | None = None,
+    limit: int | None = None,
+    batch_size: int = SEARCH_BATCH_SIZE,
+    collection: Collection | None = None,
+) -> Iterator[SearchHit]:
+    """Stream text-index hits for `keyword`, best score first.
+
+    Only _id, arxiv_id, title and the text score leave the server, fetched
+    `batch_size` documents per round trip. `scope` is an extra filter applied
+    server-side (e.g. {"author.db_id": 3}); `after` resumes after a SearchKey.
+    """
+    collection = collection if collection is not None else init_mongo()
+    cursor = collection.aggregate(
+        _text_pipeline(keyword, scope, after, limit), batchSize=batch_size
+    )
+    with cursor:
+        for doc in cursor:
+            yield SearchHit(doc["_id"], doc.get("arxiv_id"), doc.get("title"), doc["score"])
+
+
+def search_text_page(
+    keyword: str,
+    page_size: int = SEARCH_PAGE_SIZE,
+    scope: Mapping[str, Any] | None = None,
+    after: SearchKey | None = None,
+    collection: Collection | None = None,
+) -> tuple[list[SearchHit], SearchKey | None]:
+    """One page of hits plus the key to pass as `after` for the next (None at the end)."""
+    hits = list(
+        iter_search_text(
+            keyword, scope, after, limit=page_size, batch_size=page_size, collection=collection
+        )
+    )
+    if len(hits) < page_size:
+        return hits, None
+    return hits, (hits[-1].score, hits[-1].id)
+
+
+def search_text(
+    keyword: str,
+    limit: int | None = None,
+    scope: Mapping[str, Any] | None = None,
+) -> list[SearchHit]:
+    """Text-index hits for `keyword`, best first.
 
-def search_text(keyword: str) -> list[ScientificArticleDocument]:
-    init_mongo()
-    query = ScientificArticleDocument.objects(text__icontains=keyword)
-    return list(query)
+    Returns SearchHit tuples ranked by $text, where it used to return whole
+    documents whose text contained `keyword` as a substring.
+    """
+    return list(iter_search_text(keyword, scope, limit=limit))
 
 
 def search_text_index(
     articles: list[ScientificArticleDocument],
     keyword: str,
 ) -> list[ScientificArticleDocument]:
-    init_mongo()
-    all_ids = [a.id for a in articles]
-    query = ScientificArticleDocument.objects(id__in=all_ids).search_text(keyword)
-    return list(query)
+    """Deprecated: use search_text(keyword, scope={"_id": {"$in": ids}})."""
+    warnings.warn(
+        "search_text_index is deprecated; use search_text(keyword, scope=...)",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    ids = [a.id for a in articles]
+    hits = search_text(keyword, scope={"_id": {"$in": ids}})
+    docs = ScientificArticleDocument.objects.in_bulk([hit.id for hit in hits])
+    return [docs[hit.id] for hit in hits if hit.id in docs]
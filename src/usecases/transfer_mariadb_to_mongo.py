@@ -1,36 +1,71 @@
 from __future__ import annotations
 
-import pymupdf4llm
+import os
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import islice
+from time import perf_counter
+from typing import Any
+
 from mongoengine import DoesNotExist
-from sqlalchemy import select
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session, selectinload
 
-from ..models.mongo_models import AuthorEmbedded, ScientificArticleDocument
-from ..models.sql_models import ScientificArticle
+from ..document_store import get_document_store
+from ..models.mongo_models import (
+    AuthorEmbedded,
+    ScientificArticleDocument,
+    normalize_title,
+)
+from ..models.sql_models import ScientificArticle, ScientificArticleTombstone
 from ..storage.mariadb import get_session
 from ..storage.mongodb import init_mongo
+from .mongo_search import ensure_search_indexes
+
+BULK_BATCH_SIZE = 1000
+BULK_WORKERS = 4
+SYNC_CHECKPOINT_COLLECTION = "sync_checkpoints"
+SYNC_CHECKPOINT_ID = "scientific_articles"
+# updated_at is stamped when a row is written, not when its transaction commits.
+# A transaction that commits more than this long after writing is missed by the
+# next run; raise it for workloads with long-running write transactions.
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "2.0"))
+
 
+def article_kwargs(article: ScientificArticle, md_text: str) -> dict[str, Any]:
+    m_author = AuthorEmbedded(
+        db_id=article.author.id,
+        full_name=article.author.full_name,
+        title=article.author.title,
+    )
+    return dict(
+        db_id=article.id,
+        title=article.title,
+        title_lower=normalize_title(article.title),
+        summary=article.summary,
+        file_path=article.file_path,
+        created_at=article.created_at,
+        arxiv_id=article.arxiv_id,
+        author=m_author,
+        text=md_text,
+    )
 
-def save_article(article: ScientificArticle) -> ScientificArticleDocument | None:
+
+def save_article(
+    article: ScientificArticle,
+    md_text: str | None = None,
+) -> ScientificArticleDocument | None:
     try:
-        m_author = AuthorEmbedded(
-            db_id=article.author.id,
-            full_name=article.author.full_name,
-            title=article.author.title,
-        )
+        if md_text is None:
+            md_text = get_document_store().get(article.file_path, "markdown")
 
-        md_text = pymupdf4llm.to_markdown(article.file_path)
-
-        kwargs = dict(
-            db_id=article.id,
-            title=article.title,
-            summary=article.summary,
-            file_path=article.file_path,
-            created_at=article.created_at,
-            arxiv_id=article.arxiv_id,
-            author=m_author,
-            text=md_text,
-        )
+        kwargs = article_kwargs(article, md_text)
 
         m_article: ScientificArticleDocument
 
@@ -53,7 +88,9 @@ def save_article(article: ScientificArticle) -> ScientificArticleDocument | None
 
 
 def export_from_db() -> list[ScientificArticleDocument]:
-    init_mongo()
+    # Before the first save, so MongoEngine's own index creation finds
+    # articles_text in place rather than the old text index.
+    ensure_search_indexes(init_mongo())
 
     new_articles: list[ScientificArticleDocument] = []
 
@@ -61,10 +98,196 @@ def export_from_db() -> list[ScientificArticleDocument]:
         assert isinstance(session, Session)
 
         stmt = select(ScientificArticle).options(selectinload(ScientificArticle.author))
-        for article in session.scalars(stmt):
-            m_article = save_article(article)
+        articles = session.scalars(stmt).all()
+
+        # Render markdown missing from the document store in parallel, once per PDF.
+        converted = get_document_store().iter_converted([a.file_path for a in articles], "markdown")
+        for article, (_, md_text) in zip(articles, converted, strict=True):
+            if md_text is None:
+                print(f"Failure (Mongo): {article.arxiv_id} → markdown conversion failed")
+                continue
+            m_article = save_article(article, md_text)
             if m_article is not None:
                 new_articles.append(m_article)
 
     print(f"Exported {len(new_articles)} articles to MongoDB")
     return new_articles
+
+
+@dataclass
+class BulkExportStats:
+    batches: int = 0
+    upserted: int = 0
+    modified: int = 0
+    deleted: int = 0
+    failed: list[str] = field(default_factory=list)
+
+
+def _iter_pages(stmt: Any, session: Session, page_size: int) -> Iterator[Sequence[Any]]:
+    rows = session.scalars(stmt.execution_options(yield_per=page_size))
+    while page := list(islice(rows, page_size)):
+        yield page
+
+
+def _write_batch(
+    collection: Collection[Any],
+    batch_no: int,
+    ops: list[UpdateOne],
+    keys: list[str],
+    stats: BulkExportStats,
+    lock: threading.Lock,
+) -> None:
+    t0 = perf_counter()
+    failed: list[str] = []
+    try:
+        result = collection.bulk_write(ops, ordered=False).bulk_api_result
+    except BulkWriteError as exc:
+        # Unordered: every op without a write error was still applied.
+        result = exc.details
+        failed = [keys[err["index"]] for err in result.get("writeErrors", [])]
+    except Exception as exc:
+        print(f"[bulk] batch {batch_no}: failed entirely → {exc}")
+        with lock:
+            stats.failed.extend(keys)
+        return
+
+    dt = (perf_counter() - t0) * 1000.0
+    upserted = result.get("nUpserted", 0)
+    modified = result.get("nModified", 0)
+    print(
+        f"[bulk] batch {batch_no}: {upserted} upserted, {modified} modified, "
+        f"{len(failed)} failed in {dt:.1f} ms"
+    )
+    for err in result.get("writeErrors", [])[:3]:
+        print(f"  {keys[err['index']]}: {err.get('errmsg')}")
+    with lock:
+        stats.upserted += upserted
+        stats.modified += modified
+        stats.failed.extend(failed)
+
+
+def _bulk_upsert(
+    collection: Collection[Any],
+    session: Session,
+    stmt: Select[Any],
+    batch_size: int,
+    max_workers: int,
+) -> BulkExportStats:
+    store = get_document_store()
+    stats = BulkExportStats()
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(max_workers * 2)
+
+    def _submit(batch_no: int, ops: list[UpdateOne], keys: list[str]) -> None:
+        try:
+            _write_batch(collection, batch_no, ops, keys, stats, lock)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for page in _iter_pages(stmt, session, batch_size):
+            converted = store.iter_converted([a.file_path for a in page], "markdown")
+            ops: list[UpdateOne] = []
+            keys: list[str] = []
+            for article, (_, md_text) in zip(page, converted, strict=True):
+                try:
+                    if md_text is None:
+                        raise ValueError("markdown conversion failed")
+                    doc = ScientificArticleDocument(**article_kwargs(article, md_text))
+                    doc.validate()
+                except Exception as exc:
+                    print(f"Failure (Mongo): {article.arxiv_id} → {exc}")
+                    with lock:
+                        stats.failed.append(article.arxiv_id)
+                    continue
+                fields = doc.to_mongo().to_dict()
+                fields.pop("_id", None)
+                ops.append(UpdateOne({"arxiv_id": article.arxiv_id}, {"$set": fields}, upsert=True))
+                keys.append(article.arxiv_id)
+
+            if ops:
+                slots.acquire()
+                stats.batches += 1
+                pool.submit(_submit, stats.batches, ops, keys)
+
+    return stats
+
+
+def export_from_db_bulk(
+    batch_size: int = BULK_BATCH_SIZE,
+    max_workers: int = BULK_WORKERS,
+) -> BulkExportStats:
+    """Stream articles in pages of `batch_size` and upsert them by arxiv_id with
+    unordered bulk writes, `max_workers` batches in flight."""
+    collection = init_mongo()
+    ensure_search_indexes(collection)
+
+    with get_session() as session:
+        stmt = select(ScientificArticle).options(selectinload(ScientificArticle.author))
+        stats = _bulk_upsert(collection, session, stmt, batch_size, max_workers)
+
+    print(
+        f"Bulk export: {stats.upserted} upserted, {stats.modified} modified, "
+        f"{len(stats.failed)} failed in {stats.batches} batches"
+    )
+    return stats
+
+
+def sync_incremental(
+    batch_size: int = BULK_BATCH_SIZE,
+    max_workers: int = BULK_WORKERS,
+    overlap_seconds: float = SYNC_OVERLAP_SECONDS,
+) -> BulkExportStats:
+    """Move only articles changed or deleted since the last successful run.
+
+    The checkpoint stores the database time at the start of that run. Rows are
+    re-read from `overlap_seconds` before it, so changes committed late within
+    the same second are not lost; re-sending them is an idempotent upsert.
+    The watermark is time-based, not commit-ordered: a row whose transaction
+    commits more than `overlap_seconds` after its updated_at was stamped can
+    fall behind a checkpoint and is only picked up by its next change or a full
+    export_from_db_bulk. The first run (no checkpoint) exports everything.
+    """
+    collection = init_mongo()
+    ensure_search_indexes(collection)
+    checkpoints = collection.database[SYNC_CHECKPOINT_COLLECTION]
+    checkpoint = checkpoints.find_one({"_id": SYNC_CHECKPOINT_ID}) or {}
+    mark: datetime | None = checkpoint.get("updated_at")
+
+    with get_session() as session:
+        run_started = session.scalar(select(func.current_timestamp()))
+
+        stmt = (
+            select(ScientificArticle)
+            .options(selectinload(ScientificArticle.author))
+            .order_by(ScientificArticle.updated_at, ScientificArticle.id)
+        )
+        tombstones = select(ScientificArticleTombstone.arxiv_id).distinct()
+        if mark is not None:
+            since = mark - timedelta(seconds=overlap_seconds)
+            stmt = stmt.where(ScientificArticle.updated_at >= since)
+            tombstones = tombstones.where(ScientificArticleTombstone.deleted_at >= since)
+
+        # Deletes first: an article deleted and re-created since the mark is
+        # upserted again below.
+        deleted = 0
+        for page in _iter_pages(tombstones, session, batch_size):
+            deleted += collection.delete_many({"arxiv_id": {"$in": list(page)}}).deleted_count
+
+        stats = _bulk_upsert(collection, session, stmt, batch_size, max_workers)
+        stats.deleted = deleted
+
+    print(
+        f"Incremental sync since {mark}: {stats.upserted} upserted, "
+        f"{stats.modified} modified, {stats.deleted} deleted, {len(stats.failed)} failed"
+    )
+    if stats.failed:
+        print("Checkpoint not advanced; rerun to retry the failed articles.")
+        return stats
+
+    checkpoints.update_one(
+        {"_id": SYNC_CHECKPOINT_ID},
+        {"$set": {"updated_at": run_started, "synced_at": datetime.utcnow()}},
+        upsert=True,
+    )
+    return stats
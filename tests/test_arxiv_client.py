@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import io
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.usecases import arxiv_client
+from src.usecases.arxiv_client import HarvestCursor, harvest_arxiv
+
+ENTRY = "<entry><id>http://arxiv.org/abs/{0}</id><title>T{0}</title></entry>"
+
+
+def _feed(ids: range, total: int | None) -> bytes:
+    total_xml = (
+        "" if total is None else f"<opensearch:totalResults>{total}</opensearch:totalResults>"
+    )
+    return (
+        '<feed xmlns="http://www.w3.org/2005/Atom" '
+        'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+        f"{total_xml}{''.join(ENTRY.format(i) for i in ids)}</feed>"
+    ).encode()
+
+
+def _serve(monkeypatch: pytest.MonkeyPatch, total: int | None, empty_from: int) -> list[int]:
+    """Fake arXiv with `total` results that returns empty pages from `empty_from` on."""
+    starts: list[int] = []
+
+    @contextmanager
+    def get_feed(session: Any, query: str, start: int, max_results: int) -> Any:
+        starts.append(start)
+        end = min(start + max_results, empty_from)
+        yield type("Resp", (), {"raw": io.BytesIO(_feed(range(start, end), total))})
+
+    monkeypatch.setattr(arxiv_client, "_get_feed", get_feed)
+    return starts
+
+
+def _harvest(tmp_path: Path, **kwargs: Any) -> tuple[int, dict[str, Any]]:
+    cursor = HarvestCursor(tmp_path / "cursor.json")
+    pages = list(harvest_arxiv("q", page_size=2, delay=0.0, cursor=cursor, **kwargs))
+    return sum(len(p) for p in pages), HarvestCursor(tmp_path / "cursor.json").get("q")
+
+
+def test_harvest_marks_done_when_total_reached(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _serve(monkeypatch, total=5, empty_from=5)
+    rows, state = _harvest(tmp_path)
+    assert rows == 5
+    assert state == {"start": 5, "total": 5, "done": True}
+
+
+def test_empty_page_before_total_leaves_cursor_resumable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    starts = _serve(monkeypatch, total=6, empty_from=2)
+    rows, state = _harvest(tmp_path, empty_page_retries=1)
+    assert rows == 2
+    assert starts == [0, 2, 2]
+    assert state == {"start": 2, "total": 6, "done": False}
+
+    _serve(monkeypatch, total=6, empty_from=6)
+    rows, state = _harvest(tmp_path)
+    assert rows == 4
+    assert state["done"]
+
+
+def test_empty_page_without_total_is_not_done(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _serve(monkeypatch, total=None, empty_from=3)
+    rows, state = _harvest(tmp_path)
+    assert rows == 3
+    assert state == {"start": 3, "total": None, "done": False}
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+from qdrant_client.http import models as qmodels
+
+from src.bm25_index import BM25Index, reciprocal_rank_fusion
+from src.search_service import SearchService, hybrid_search
+
+
+def test_readding_a_key_tombstones_its_old_text() -> None:
+    index = BM25Index()
+    index.add("a", "quantum entanglement", {"v": 1})
+    index.add("b", "classical mechanics")
+    index.add("a", "graph neural networks", {"v": 2})
+
+    assert len(index) == 2
+    assert index.search("quantum") == []
+    assert [k for k, _ in index.search("neural")] == ["a"]
+    assert index.payload("a") == {"v": 2}
+
+    index.remove("a")
+    assert "a" not in index and index.search("neural") == []
+    assert index._total_len == 2
+
+
+def test_tombstoned_documents_do_not_count_towards_idf() -> None:
+    fresh = BM25Index()
+    fresh.add_many(["x", "y"], ["rare term", "common words"])
+
+    index = BM25Index()
+    index.add_many(["x", "y", "z"], ["rare term", "common words", "rare again"])
+    index.add("z", "other words")
+    index.remove("z")
+
+    assert index.search("rare") == pytest.approx(fresh.search("rare"))
+
+
+def test_reciprocal_rank_fusion_sums_reciprocal_ranks() -> None:
+    fused = dict(reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=10))
+
+    assert fused == pytest.approx({"a": 1 / 11 + 1 / 12, "b": 1 / 12, "c": 1 / 13 + 1 / 11})
+    assert [k for k, _ in reciprocal_rank_fusion([["a", "b"], ["b"]], k=60)] == ["b", "a"]
+
+
+class _VectorSearch(SearchService):
+    def __init__(self, hits: list[str]) -> None:
+        self.hits = hits
+
+    def search(self, query: str, top_k: int = 5) -> list[qmodels.ScoredPoint]:
+        return [
+            qmodels.ScoredPoint(id=key, version=0, score=1.0, payload={"from": "vector"})
+            for key in self.hits[:top_k]
+        ]
+
+
+def test_hybrid_search_fuses_rankings_and_fills_payloads_from_bm25() -> None:
+    lexical = BM25Index()
+    lexical.add("p2", "sparse retrieval", {"from": "bm25"})
+    lexical.add("p3", "sparse sparse retrieval", {"from": "bm25"})
+
+    points = hybrid_search("sparse", top_k=3, service=_VectorSearch(["p1", "p2"]), lexical=lexical)
+
+    # p1 and p3 tie at 1/61; ties keep the vector ranking first.
+    assert [p.id for p in points] == ["p2", "p1", "p3"]
+    assert [p.payload for p in points] == [{"from": "vector"}, {"from": "vector"}, {"from": "bm25"}]
+    assert points[0].score == pytest.approx(1 / 62 + 1 / 62)
+
+
+def test_hybrid_search_keeps_an_empty_lexical_index() -> None:
+    points = hybrid_search("x", service=_VectorSearch(["p1"]), lexical=BM25Index())
+
+    assert [p.id for p in points] == ["p1"]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.models.sql_models import Author, Base, ScientificArticle
+from src.usecases.bulk_mariadb import insert_articles, insert_new_articles, resolve_author_ids
+from src.usecases.load_dataframe_mariadb import load_dataframe_into_mariadb_bulk
+
+
+@pytest.fixture
+def session_factory() -> Iterator[sessionmaker[Session]]:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(engine)
+    engine.dispose()
+
+
+def _row(arxiv_id: str, author: str = "Ada", title: str | None = "Dr") -> dict[str, Any]:
+    return {
+        "title": f"Paper {arxiv_id}",
+        "summary": "s",
+        "file_path": f"{arxiv_id}.pdf",
+        "arxiv_id": arxiv_id,
+        "author_full_name": author,
+        "author_title": title,
+    }
+
+
+def _count(session: Session, model: type[Base]) -> int:
+    return session.scalar(select(func.count()).select_from(model)) or 0
+
+
+def test_resolve_author_ids_reuses_lowest_legacy_duplicate(session_factory: sessionmaker) -> None:
+    with session_factory() as session:
+        session.add_all([Author(full_name="Ada", title="Dr") for _ in range(3)])
+        session.flush()
+        lowest = session.scalar(select(func.min(Author.id)))
+
+        ids = resolve_author_ids(session, [("Ada", "Dr"), ("Bob", None), ("Bob", None)])
+
+        assert ids[("Ada", "Dr")] == lowest
+        assert _count(session, Author) == 4
+
+
+def test_insert_new_articles_skips_duplicates_without_orphan_authors(
+    session_factory: sessionmaker,
+) -> None:
+    with session_factory() as session:
+        assert insert_new_articles(session, [_row("1"), _row("2", author="Bob")]) == 2
+        session.commit()
+
+        rows = [_row("2", author="Carol"), _row("3", author="Dan"), _row("3", author="Eve")]
+        assert insert_new_articles(session, rows, chunk_size=2) == 1
+        session.commit()
+
+        names = set(session.scalars(select(Author.full_name)))
+        assert names == {"Ada", "Bob", "Dan"}
+        assert _count(session, ScientificArticle) == 3
+
+
+def test_insert_articles_counts_only_stored_rows(session_factory: sessionmaker) -> None:
+    with session_factory() as session:
+        author_id = resolve_author_ids(session, [("Ada", "Dr")])[("Ada", "Dr")]
+        rows = [
+            {"title": "t", "summary": "s", "file_path": "f", "arxiv_id": a, "author_id": author_id}
+            for a in ("1", "1", "2")
+        ]
+        assert insert_articles(session, rows) == 2
+        assert insert_articles(session, rows) == 0
+
+
+def test_load_dataframe_bulk_returns_ids_for_new_and_existing(
+    session_factory: sessionmaker,
+) -> None:
+    load_dataframe_into_mariadb_bulk(pd.DataFrame([_row("1")]), session_factory)
+    df = pd.DataFrame([_row("1", author="Bob"), _row("2"), _row("2", author="Eve")])
+
+    result = load_dataframe_into_mariadb_bulk(df, session_factory)
+
+    assert list(result["arxiv_id"]) == ["1", "2"]
+    assert result["article_id"].notna().all()
+    assert result["author_id"].nunique() == 1
+    with session_factory() as session:
+        assert set(session.scalars(select(Author.full_name))) == {"Ada"}
+
+
+def test_authors_differing_in_case_or_accents_stay_apart() -> None:
+    # Stand-in for a case-insensitive server collation such as MariaDB's uca1400_ai_ci.
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE authors (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "full_name VARCHAR(100) NOT NULL COLLATE NOCASE, title VARCHAR(100) COLLATE NOCASE)"
+        )
+    Base.metadata.create_all(engine)
+    keys = [("de Sitter", "Dr"), ("De Sitter", "Dr"), ("De Sitter", "dr"), ("Müller", None)]
+    rows = [_row(str(i), name, title) for i, (name, title) in enumerate(keys)]
+    rows.append(_row("9", "Muller", None))
+
+    with sessionmaker(engine)() as session:
+        assert insert_new_articles(session, rows) == 5
+        ids = resolve_author_ids(session, keys)
+
+        assert len(set(ids.values())) == 4
+        assert _count(session, Author) == 5
+    engine.dispose()
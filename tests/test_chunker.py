@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from src.chunker import iter_chunks
+
+WORDS = ["alpha", "beta,", "gamma", "delta;", "eps", "zeta", "eta", "theta"]
+
+
+def _old_chunk_text(text: str, chunk_size: int, overlap: int) -> list[str]:
+    # The word chunker gemini_embeddings.chunk_text used before iter_chunks.
+    words = text.split()
+    step = chunk_size - overlap
+    chunks: list[str] = []
+    for start in range(0, len(words), step):
+        end = start + chunk_size
+        chunks.append(" ".join(words[start:end]))
+        if end >= len(words):
+            break
+    return chunks
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)) + rng.choice([".", "!", "?"])
+
+
+def _text(seed: int, lengths: list[int] | None = None) -> str:
+    rng = random.Random(seed)
+    lengths = lengths or [rng.randint(1, 40) for _ in range(rng.randint(0, 30))]
+    return (" " * rng.randint(1, 3)).join(_sentence(rng, n) for n in lengths)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize(("size", "overlap"), [(200, 50), (5, 2), (7, 0), (3, 2)])
+def test_words_strategy_matches_old_chunk_text(seed: int, size: int, overlap: int) -> None:
+    text = _text(seed)
+    chunks = list(iter_chunks(text, size, overlap, "words"))
+    assert [c.text for c in chunks] == _old_chunk_text(text, size, overlap)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("strategy", ["words", "tokens", "sentences"])
+def test_offsets_cover_chunk_text(seed: int, strategy: str) -> None:
+    text = _text(seed)
+    for i, chunk in enumerate(iter_chunks(text, 12, 4, strategy)):
+        assert chunk.index == i
+        span = text[chunk.start : chunk.end]
+        if strategy == "tokens":
+            assert span == chunk.text
+        else:
+            assert " ".join(span.split()) == chunk.text
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize(("size", "overlap"), [(200, 50), (5, 2), (12, 6)])
+def test_sentence_chunks_respect_chunk_size(seed: int, size: int, overlap: int) -> None:
+    text = _text(seed)
+    chunks = list(iter_chunks(text, size, overlap, "sentences"))
+    for prev, chunk in zip(chunks, chunks[1:], strict=False):
+        assert not (chunk.start <= prev.start and prev.end <= chunk.end)
+    assert all(len(c.text.split()) <= size for c in chunks)
+
+
+def test_overlap_is_dropped_when_next_sentence_needs_the_room() -> None:
+    text = _text(0, [150, 40, 190])
+    chunks = list(iter_chunks(text, 200, 50, "sentences"))
+    assert [len(c.text.split()) for c in chunks] == [190, 190]
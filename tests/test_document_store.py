@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from pypdf import PdfWriter
+
+from src import document_store, pdf_extract
+from src.document_store import DocumentStore, file_digest
+
+
+def _pdf(path: Path, pages: int) -> Path:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    with path.open("wb") as f:
+        writer.write(f)
+    return path
+
+
+@pytest.fixture
+def store(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[DocumentStore]:
+    # Pool workers are forked after this, so they see the patched cache too.
+    pages = tmp_path / "pages.sqlite"
+    monkeypatch.setattr(pdf_extract, "get_page_cache", lambda: pdf_extract.PageTextCache(pages))
+    store = DocumentStore(tmp_path / "store")
+    yield store
+    store.close()
+
+
+def test_text_conversions_are_stored_and_reused(tmp_path: Path, store: DocumentStore) -> None:
+    good = _pdf(tmp_path / "a.pdf", 2)
+    copy = tmp_path / "b.pdf"
+    copy.write_bytes(good.read_bytes())
+    bad = tmp_path / "c.pdf"
+    bad.write_bytes(b"not a pdf")
+
+    first = list(store.iter_converted([good, copy, bad], "text", workers=2))
+
+    assert first == [(good, "\n"), (copy, "\n"), (bad, None)]
+    assert store.read(file_digest(good), "text") == "\n"
+
+    def fail(path: str) -> str:
+        raise AssertionError("stored text should not be converted again")
+
+    document_store.CONVERTERS["text"] = (".txt", fail)
+    try:
+        assert list(store.iter_converted([copy], "text")) == [(copy, "\n")]
+    finally:
+        document_store.CONVERTERS["text"] = (".txt", document_store.pdf_to_text)
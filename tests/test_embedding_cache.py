@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.embedding_cache import EmbeddingCache
+
+DIM = 4
+VECTOR_BYTES = DIM * 4
+
+
+def _vec(seed: float) -> list[float]:
+    return [seed] * DIM
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    # Distinct last_access stamps, so LRU order does not depend on timer resolution.
+    now = [1000.0]
+
+    def tick() -> float:
+        now[0] += 1.0
+        return now[0]
+
+    monkeypatch.setattr("src.embedding_cache.time.time", tick)
+    return now
+
+
+def test_lru_eviction_keeps_recently_read_entries(clock: list[float]) -> None:
+    cache = EmbeddingCache(":memory:", max_bytes=3 * VECTOR_BYTES)
+    for i, text in enumerate("abc"):
+        cache.put("m", "t", text, _vec(i))
+
+    assert cache.get("m", "t", "a") == _vec(0)
+    cache.put("m", "t", "d", _vec(3))
+
+    assert cache.get("m", "t", "b") is None
+    assert [cache.get("m", "t", t) for t in "acd"] == [_vec(0), _vec(2), _vec(3)]
+    assert cache.stats()["entries"] == 3
+    assert cache.stats()["bytes"] == 3 * VECTOR_BYTES
+
+
+def test_byte_accounting_counts_replacements_once(tmp_path: Path, clock: list[float]) -> None:
+    path = tmp_path / "cache.sqlite"
+    cache = EmbeddingCache(path)
+    cache.put_many("m", "t", ["a", "b", "a"], [_vec(0), _vec(1), _vec(2)])
+    cache.put("m", "t", "b", _vec(5))
+    cache.put("other", "t", "b", _vec(5))
+
+    assert cache.stats()["bytes"] == 3 * VECTOR_BYTES
+    assert cache.get("m", "t", "a") == _vec(2)
+    cache.close()
+
+    reopened = EmbeddingCache(path)
+    assert reopened.stats()["bytes"] == 3 * VECTOR_BYTES
+    assert reopened.stats()["entries"] == 3
+
+
+def test_hits_and_misses_count_lookups_and_normalize_whitespace(clock: list[float]) -> None:
+    cache = EmbeddingCache(":memory:")
+    cache.put("m", "t", "hello  world", _vec(1))
+
+    assert cache.get_many("m", "t", ["hello world", " hello\nworld ", "other"]) == [
+        _vec(1),
+        _vec(1),
+        None,
+    ]
+    assert (cache.hits, cache.misses) == (2, 1)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any
+
+import pytest
+
+from src.embedding_cache import EmbeddingCache
+from src.embedding_engine import EmbeddingEngine, StubBackend, call_with_retry
+
+
+class _Transient(Exception):
+    pass
+
+
+class _SlowFirstBackend(StubBackend):
+    """Earlier batches finish last, so results arrive out of order."""
+
+    def __init__(self, dim: int = 8) -> None:
+        super().__init__(dim=dim)
+        self.batches: list[list[str]] = []
+        self.threads: set[int] = set()
+        self._lock = threading.Lock()
+
+    def embed_batch(self, texts: Sequence[str], task_type: str) -> list[list[float]]:
+        with self._lock:
+            order = len(self.batches)
+            self.batches.append(list(texts))
+            self.threads.add(threading.get_ident())
+        time.sleep(0.02 * max(0, 4 - order))
+        return super().embed_batch(texts, task_type)
+
+
+class _FlakyBackend(StubBackend):
+    retryable = (_Transient,)
+
+    def __init__(self, failures: int) -> None:
+        super().__init__(dim=8)
+        self.failures = failures
+
+    def embed_batch(self, texts: Sequence[str], task_type: str) -> list[list[float]]:
+        if self.failures:
+            self.failures -= 1
+            raise _Transient("try again")
+        return super().embed_batch(texts, task_type)
+
+
+def _engine(backend: StubBackend, **kwargs: Any) -> EmbeddingEngine:
+    return EmbeddingEngine(backend, requests_per_minute=None, **kwargs)
+
+
+def test_embed_keeps_input_order_across_batches_and_threads() -> None:
+    texts = [f"text {i}" for i in range(23)]
+    expected = StubBackend(dim=8).embed_batch(texts, "SEMANTIC_SIMILARITY")
+    backend = _SlowFirstBackend()
+
+    result = _engine(backend, batch_size=5, max_workers=4).embed(texts)
+
+    assert result == expected
+    assert sorted(len(b) for b in backend.batches) == [3, 5, 5, 5, 5]
+    assert len(backend.threads) > 1
+
+
+def test_embed_sends_only_cache_misses_once_each() -> None:
+    cache = EmbeddingCache(":memory:")
+    backend = _SlowFirstBackend()
+    engine = _engine(backend, batch_size=2, max_workers=1, cache=cache)
+    first = engine.embed(["a", "b"])
+
+    backend.batches.clear()
+    result = engine.embed(["c", "a", "c", "d", "b"])
+
+    assert backend.batches == [["c", "d"]]
+    assert result[1] == first[0] and result[4] == first[1]
+    assert result[0] == result[2]
+    assert result == StubBackend(dim=8).embed_batch(
+        ["c", "a", "c", "d", "b"], "SEMANTIC_SIMILARITY"
+    )
+    assert cache.stats()["entries"] == 4
+
+
+def test_call_with_retry_retries_only_retryable_errors() -> None:
+    calls: list[int] = []
+
+    def flaky() -> str:
+        calls.append(1)
+        if len(calls) < 3:
+            raise _Transient
+        return "ok"
+
+    assert call_with_retry(flaky, (_Transient,), max_attempts=3, base_delay=0.0) == "ok"
+    assert len(calls) == 3
+
+    calls.clear()
+    with pytest.raises(_Transient):
+        call_with_retry(flaky, (_Transient,), max_attempts=2, base_delay=0.0)
+    assert len(calls) == 2
+
+    def broken() -> None:
+        calls.append(1)
+        raise ValueError
+
+    calls.clear()
+    with pytest.raises(ValueError):
+        call_with_retry(broken, (_Transient,), max_attempts=5, base_delay=0.0)
+    assert len(calls) == 1
+
+
+def test_engine_retries_transient_backend_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("src.embedding_engine.time.sleep", lambda _: None)
+    backend = _FlakyBackend(failures=2)
+
+    assert len(_engine(backend, max_attempts=3).embed(["x", "y"])) == 2
+    with pytest.raises(_Transient):
+        _engine(_FlakyBackend(failures=3), max_attempts=3).embed(["x"])
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from src.usecases.http_fetcher import AsyncFetcher, HttpCache
+
+LATENCY = 0.2
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """/slow/<n> sleeps, /etag serves an ETag and 304s, /flaky 503s twice first."""
+
+    hits: Counter[str] = Counter()
+    lock = threading.Lock()
+
+    def do_GET(self) -> None:
+        with self.lock:
+            self.hits[self.path] += 1
+            count = self.hits[self.path]
+
+        if self.path.startswith("/slow/"):
+            time.sleep(LATENCY)
+            self._send(200, self.path)
+        elif self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, "")
+            else:
+                self._send(200, "cached body", {"ETag": '"v1"'})
+        elif self.path == "/flaky":
+            if count <= 2:
+                self._send(503, "busy", {"Retry-After": "0"})
+            else:
+                self._send(200, "recovered")
+        else:
+            self._send(404, "missing")
+
+    def _send(self, status: int, body: str, headers: dict[str, str] | None = None) -> None:
+        data = body.encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(data)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[str]:
+    _Handler.hits = Counter()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_many_overlaps_requests(server: str) -> None:
+    urls = [f"{server}/slow/{i}" for i in range(8)]
+    with AsyncFetcher(per_host=8) as fetcher:
+        t0 = time.perf_counter()
+        bodies = fetcher.fetch_many(urls + urls[:2])
+        elapsed = time.perf_counter() - t0
+
+    assert bodies == [f"/slow/{i}" for i in range(8)] + ["/slow/0", "/slow/1"]
+    assert elapsed < 4 * LATENCY
+    assert all(_Handler.hits[f"/slow/{i}"] == 1 for i in range(8))
+
+
+def test_cached_page_is_revalidated_with_etag(server: str, tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path)
+    with AsyncFetcher(cache=cache) as fetcher:
+        assert fetcher.fetch_many([f"{server}/etag"]) == ["cached body"]
+    with AsyncFetcher(cache=cache) as fetcher:
+        assert fetcher.fetch_many([f"{server}/etag"]) == ["cached body"]
+
+    assert _Handler.hits["/etag"] == 2
+    entry = cache.get(f"{server}/etag")
+    assert entry is not None and entry.etag == '"v1"'
+
+
+def test_retries_503_honouring_retry_after(server: str) -> None:
+    with AsyncFetcher(max_attempts=4) as fetcher:
+        assert fetcher.fetch_many([f"{server}/flaky"]) == ["recovered"]
+    assert _Handler.hits["/flaky"] == 3
+
+    _Handler.hits["/flaky"] = 0
+    with AsyncFetcher(max_attempts=2) as fetcher:
+        assert fetcher.fetch_many([f"{server}/flaky"]) == [""]
+
+
+def test_fetch_many_refuses_to_run_inside_an_event_loop() -> None:
+    async def call() -> None:
+        with AsyncFetcher(delay=0.0) as fetcher:
+            fetcher.fetch_many(["http://127.0.0.1:9/"])
+
+    with pytest.raises(RuntimeError, match="fetch_all"):
+        asyncio.run(call())
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.local_index import LocalVectorIndex
+
+
+def _write_parquet(path: Path, n_rows: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n_rows, dim)).astype(np.float32)
+    table = pa.table(
+        {
+            "article_id": [f"a{i}" for i in range(n_rows)],
+            "chunk_index": list(range(n_rows)),
+            "chunk_text": [f"chunk {i}" for i in range(n_rows)],
+            "embedding": [list(map(float, v)) for v in vectors],
+        }
+    )
+    pq.write_table(table, path)
+    return vectors
+
+
+def _exact_top(vectors: np.ndarray, query: np.ndarray, top_k: int) -> list[int]:
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return list(np.argsort(-(normed @ (query / np.linalg.norm(query))))[:top_k])
+
+
+def test_ann_lists_larger_than_rows_is_clamped(tmp_path: Path) -> None:
+    parquet = tmp_path / "chunks.parquet"
+    _write_parquet(parquet, n_rows=5)
+
+    index = LocalVectorIndex.open(parquet, tmp_path / "index", ann_lists=64)
+
+    assert index.ann is not None
+    assert index.ann.n_lists == 5
+
+
+def test_ann_lists_zero_restores_exact_search(tmp_path: Path) -> None:
+    parquet = tmp_path / "chunks.parquet"
+    vectors = _write_parquet(parquet, n_rows=40)
+    LocalVectorIndex.open(parquet, tmp_path / "index", ann_lists=4)
+
+    index = LocalVectorIndex.open(parquet, tmp_path / "index", ann_lists=0)
+    assert index.ann is None
+
+    _write_parquet(parquet, n_rows=30, seed=1)
+    rebuilt = LocalVectorIndex.open(parquet, tmp_path / "index", ann_lists=0)
+    assert rebuilt.ann is None
+    assert not (tmp_path / "index" / "ann.npz").exists()
+    query = vectors[0]
+    assert [row for row, _ in rebuilt.search(query, 3)] == _exact_top(
+        np.asarray(rebuilt.vectors), query, 3
+    )
+
+
+def test_rebuild_without_codec_drops_stale_quantized_codes(tmp_path: Path) -> None:
+    parquet = tmp_path / "chunks.parquet"
+    _write_parquet(parquet, n_rows=50)
+    quantized = LocalVectorIndex.open(parquet, tmp_path / "index", codec="int8")
+    assert quantized.quantized is not None
+
+    vectors = _write_parquet(parquet, n_rows=20, seed=1)
+    rebuilt = LocalVectorIndex.open(parquet, tmp_path / "index")
+
+    assert rebuilt.quantized is None
+    assert not (tmp_path / "index" / "quantized").exists()
+    query = vectors[3]
+    assert [row for row, _ in rebuilt.search(query, 5)] == _exact_top(vectors, query, 5)
+
+
+def test_load_ignores_codes_with_wrong_row_count(tmp_path: Path) -> None:
+    parquet = tmp_path / "chunks.parquet"
+    _write_parquet(parquet, n_rows=30)
+    index = LocalVectorIndex.from_parquet(parquet)
+    index.quantize("int8")
+    index.save(tmp_path / "index")
+
+    other = LocalVectorIndex.from_parquet(parquet)
+    other.quantize("int8")
+    other.quantized.codes = other.quantized.codes[:10]  # type: ignore[union-attr]
+    other.quantized.save(tmp_path / "index" / "quantized")  # type: ignore[union-attr]
+
+    assert LocalVectorIndex.load(tmp_path / "index").quantized is None
+
+
+def test_ann_with_codec_scores_candidates_from_codes(tmp_path: Path) -> None:
+    parquet = tmp_path / "chunks.parquet"
+    vectors = _write_parquet(parquet, n_rows=400, dim=16)
+    index = LocalVectorIndex.open(parquet, tmp_path / "index", ann_lists=8, codec="int8")
+    assert index.ann is not None and index.quantized is not None
+
+    with np.load(tmp_path / "index" / "ann.npz") as data:
+        assert "vectors" not in data.files
+    assert not hasattr(index.ann, "list_vectors")
+
+    calls: list[int] = []
+    scorer = index.quantized.codec.scorer
+
+    def counting_scorer(query: np.ndarray):  # type: ignore[no-untyped-def]
+        score = scorer(query)
+        return lambda codes: (calls.append(len(codes)), score(codes))[1]
+
+    index.quantized.codec.scorer = counting_scorer  # type: ignore[method-assign]
+    query = vectors[17]
+    hits = index.search(query, top_k=3, nprobe=8)
+
+    assert hits[0][0] == _exact_top(vectors, query, 1)[0]
+    assert calls == [len(index.ann.candidates(query / np.linalg.norm(query), 8))]
+    assert [i for i, _ in hits] == _exact_top(vectors, query, 3)
+
+
+def test_from_parquet_reads_quantized_parquet(tmp_path: Path) -> None:
+    from src.quantization import write_quantized_parquet
+
+    parquet = tmp_path / "chunks.parquet"
+    vectors = _write_parquet(parquet, n_rows=50, dim=16)
+    write_quantized_parquet(parquet, tmp_path / "codes.parquet", codec_name="float16")
+
+    index = LocalVectorIndex.from_parquet(tmp_path / "codes.parquet")
+
+    assert len(index) == 50
+    assert index.payloads.column_names == ["article_id", "chunk_index", "chunk_text"]
+    assert [i for i, _ in index.search(vectors[3], top_k=1)] == [3]
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.models.sql_models import Author, Base, ScientificArticle
+
+# The loaders import the MariaDB engine module, which needs the driver installed.
+pytest.importorskip("mariadb")
+
+from src.usecases import load_csv_to_mariadb, load_data_infile  # noqa: E402
+
+ROWS = [
+    ("1", "Ada"),
+    ("2", "Bob"),
+    ("1", "Carol"),
+    ("3", "Ada"),
+]
+
+
+def _patch_loaders(monkeypatch: pytest.MonkeyPatch, factory: sessionmaker[Session]) -> None:
+    @contextmanager
+    def get_session() -> Iterator[Session]:
+        with factory() as session:
+            yield session
+
+    for module in (load_csv_to_mariadb, load_data_infile):
+        monkeypatch.setattr(module, "init_db", lambda: None)
+        monkeypatch.setattr(module, "get_session", get_session, raising=False)
+        monkeypatch.setattr(module, "get_bulk_session", get_session, raising=False)
+
+
+@pytest.fixture
+def session_factory(monkeypatch: pytest.MonkeyPatch) -> Iterator[sessionmaker[Session]]:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(engine)
+    _patch_loaders(monkeypatch, factory)
+    yield factory
+    engine.dispose()
+
+
+def _write_csv(path: Path, rows: list[tuple[str, str]]) -> Path:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(
+            f, ["title", "summary", "file_path", "arxiv_id", "author_full_name", "author_title"]
+        )
+        writer.writeheader()
+        for arxiv_id, author in rows:
+            writer.writerow(
+                {
+                    "title": f"Paper {arxiv_id}",
+                    "summary": "s",
+                    "file_path": f"{arxiv_id}.pdf",
+                    "arxiv_id": arxiv_id,
+                    "author_full_name": author,
+                    "author_title": "Dr",
+                }
+            )
+    return path
+
+
+def _authors(factory: sessionmaker[Session]) -> list[str]:
+    with factory() as session:
+        return sorted(session.scalars(select(Author.full_name)))
+
+
+def _articles(factory: sessionmaker[Session]) -> int:
+    with factory() as session:
+        return session.scalar(select(func.count()).select_from(ScientificArticle)) or 0
+
+
+@pytest.mark.parametrize("loader", ["import_csv", "load_csv_infile"])
+def test_csv_loaders_skip_duplicates_without_orphan_authors(
+    tmp_path: Path, session_factory: sessionmaker[Session], loader: str
+) -> None:
+    load = (
+        load_csv_to_mariadb.import_csv
+        if loader == "import_csv"
+        else load_data_infile.load_csv_infile
+    )
+
+    stats = load(_write_csv(tmp_path / "a.csv", ROWS))
+    assert (stats.rows, stats.inserted, stats.duplicates) == (4, 3, 1)
+
+    stats = load(_write_csv(tmp_path / "b.csv", [("3", "Dan"), ("4", "Bob")]))
+    assert (stats.inserted, stats.duplicates) == (1, 1)
+
+    assert _authors(session_factory) == ["Ada", "Bob"]
+    assert _articles(session_factory) == 4
+
+
+@pytest.mark.parametrize("loader", ["import_csv", "load_csv_infile"])
+def test_csv_loaders_keep_authors_differing_in_case(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, loader: str
+) -> None:
+    # NOCASE columns stand in for a case-insensitive server collation.
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE authors (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "full_name VARCHAR(100) NOT NULL COLLATE NOCASE, title VARCHAR(100) COLLATE NOCASE)"
+        )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(engine)
+    _patch_loaders(monkeypatch, factory)
+    load = (
+        load_csv_to_mariadb.import_csv
+        if loader == "import_csv"
+        else load_data_infile.load_csv_infile
+    )
+
+    stats = load(_write_csv(tmp_path / "a.csv", [("1", "de Sitter"), ("2", "De Sitter")]))
+
+    assert stats.inserted == 2
+    assert _authors(factory) == ["De Sitter", "de Sitter"]
+    with factory() as session:
+        pairs = session.execute(select(ScientificArticle.arxiv_id, Author.full_name).join(Author))
+        assert sorted(pairs) == [("1", "de Sitter"), ("2", "De Sitter")]
+    engine.dispose()
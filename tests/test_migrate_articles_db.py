@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import create_engine, delete, insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.migrate_articles_db import migrate
+from src.models.sql_models import (
+    Author,
+    Base,
+    ScientificArticle,
+    ScientificArticleTombstone,
+)
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def _article(arxiv_id: str, author_id: int) -> dict[str, object]:
+    return {
+        "title": "t",
+        "summary": "s",
+        "file_path": f"{arxiv_id}.pdf",
+        "arxiv_id": arxiv_id,
+        "author_id": author_id,
+    }
+
+
+def _tombstones(engine: Engine) -> list[str]:
+    with engine.connect() as conn:
+        return list(conn.scalars(select(ScientificArticleTombstone.arxiv_id)))
+
+
+def test_migrated_sqlite_table_stamps_updated_at(engine: Engine) -> None:
+    # The pre-sync schema: scientific_articles without updated_at.
+    Author.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE scientific_articles (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "title VARCHAR(200) NOT NULL, summary TEXT NOT NULL, "
+            "file_path VARCHAR(200) NOT NULL, created_at DATETIME NOT NULL, "
+            "arxiv_id VARCHAR(50) NOT NULL UNIQUE, author_id INTEGER NOT NULL)"
+        )
+        conn.execute(insert(Author).values(id=1, full_name="Ada"))
+        conn.exec_driver_sql(
+            "INSERT INTO scientific_articles (title, summary, file_path, created_at, "
+            "arxiv_id, author_id) VALUES ('t', 's', 'f', CURRENT_TIMESTAMP, 'old', 1)"
+        )
+
+    migrate(engine)
+    migrate(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(ScientificArticle).values(_article("core", 1)))
+        conn.exec_driver_sql(
+            "INSERT INTO scientific_articles (title, summary, file_path, created_at, "
+            "arxiv_id, author_id) VALUES ('t', 's', 'f', CURRENT_TIMESTAMP, 'raw', 1)"
+        )
+        stmt = select(ScientificArticle.arxiv_id, ScientificArticle.updated_at)
+        rows = {arxiv_id: stamp for arxiv_id, stamp in conn.execute(stmt)}
+
+    assert set(rows) == {"old", "core", "raw"}
+    assert all(value is not None for value in rows.values())
+
+    with engine.begin() as conn:
+        conn.execute(delete(ScientificArticle).where(ScientificArticle.arxiv_id == "old"))
+    assert _tombstones(engine) == ["old"]
+
+
+def test_core_and_orm_deletes_leave_one_tombstone_each(engine: Engine) -> None:
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        author = Author(full_name="Ada")
+        session.add(author)
+        session.flush()
+        session.execute(insert(ScientificArticle), [_article(a, author.id) for a in "abc"])
+        session.commit()
+
+        session.delete(session.scalars(select(ScientificArticle).filter_by(arxiv_id="a")).one())
+        session.commit()
+        session.execute(text("DELETE FROM scientific_articles WHERE arxiv_id = 'b'"))
+        session.commit()
+
+    assert sorted(_tombstones(engine)) == ["a", "b"]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Any
+
+import mongomock
+import pandas as pd
+from pymongo import TEXT
+
+from src.models.mongo_models import TEXT_INDEX_NAME
+from src.usecases.load_dataframe_mongodb import load_dataframe_into_mongodb
+from src.usecases.mongo_search import ensure_search_indexes, search_by_text
+
+
+def _collection() -> Any:
+    return mongomock.MongoClient().db.articles
+
+
+def test_replaces_legacy_text_index() -> None:
+    collection = _collection()
+    collection.create_index([("text", TEXT)])
+
+    ensure_search_indexes(collection, backfill=False)
+
+    indexes = collection.index_information()
+    assert "text_text" not in indexes
+    assert TEXT_INDEX_NAME in indexes
+
+
+def test_keeps_foreign_text_index() -> None:
+    collection = _collection()
+    collection.create_index([("abstract", TEXT)], name="abstract_search")
+
+    ensure_search_indexes(collection, backfill=False)
+
+    indexes = collection.index_information()
+    assert "abstract_search" in indexes
+    assert TEXT_INDEX_NAME not in indexes
+
+
+def test_loading_does_not_touch_indexes() -> None:
+    collection = _collection()
+    load_dataframe_into_mongodb(pd.DataFrame([{"title": "A", "arxiv_id": "1"}]), collection)
+    assert list(collection.index_information()) == ["_id_"]
+
+
+class _Cursor(list):
+    def sort(self, *_: Any) -> _Cursor:
+        return self
+
+    def limit(self, _: int) -> _Cursor:
+        return self
+
+
+class _FakeCollection:
+    """Answers $text with nothing and records the filters it was asked for."""
+
+    def __init__(self) -> None:
+        self.filters: list[dict[str, Any]] = []
+
+    def find(self, filter: dict[str, Any], projection: dict[str, Any]) -> _Cursor:
+        self.filters.append(filter)
+        return _Cursor([] if "$text" in filter else [{"title": "Inflation"}])
+
+
+def test_empty_text_search_does_not_fall_back_to_a_scan() -> None:
+    collection = _FakeCollection()
+    assert search_by_text(collection, "inflat") == []  # type: ignore[arg-type]
+    assert [next(iter(f)) for f in collection.filters] == ["$text"]
+
+    collection = _FakeCollection()
+    assert search_by_text(collection, "inflat", strategy="regex") == [{"title": "Inflation"}]  # type: ignore[arg-type]
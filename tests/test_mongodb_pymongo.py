@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any
+
+import mongomock
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from pymongo.results import BulkWriteResult
+
+from mongoDB import mongodb_pymongo
+from mongoDB.mongodb_pymongo import bulk_update, create_users, increment_age_op
+
+
+@pytest.fixture
+def users(monkeypatch: pytest.MonkeyPatch) -> Any:
+    collection = mongomock.MongoClient().db.users
+    monkeypatch.setattr(mongodb_pymongo, "users", collection)
+    return collection
+
+
+def test_create_users_reports_duplicates_across_batches(users: Any) -> None:
+    users.insert_one({"username": "u0", "email": "old@example.com"})
+    new = [{"username": f"u{i % 4}", "email": f"{i}@example.com"} for i in range(6)]
+
+    result = create_users(new, batch_size=4)
+
+    assert result.inserted == 3
+    assert result.duplicates == ["u0", "u0", "u1"]
+    assert result.failed == []
+    assert users.count_documents({}) == 4
+
+
+class _BulkCollection:
+    """bulk_write double: every op on `missing` ids fails, the rest match and modify."""
+
+    def __init__(self, missing: set[ObjectId]) -> None:
+        self.missing = missing
+        self.batches: list[int] = []
+
+    def bulk_write(self, ops: list[Any], ordered: bool) -> BulkWriteResult:
+        self.batches.append(len(ops))
+        errors = [
+            {"index": i, "code": 2, "errmsg": "bad"}
+            for i, op in enumerate(ops)
+            if op._filter["_id"] in self.missing
+        ]
+        ok = len(ops) - len(errors)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nMatched": ok, "nModified": ok})
+        return BulkWriteResult({"nMatched": ok, "nModified": ok}, acknowledged=True)
+
+
+def test_bulk_update_sums_counts_and_reports_failed_positions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    ids = [ObjectId() for _ in range(5)]
+    collection = _BulkCollection({ids[1], ids[4]})
+    monkeypatch.setattr(mongodb_pymongo, "users", collection)
+
+    result = bulk_update((increment_age_op(str(i)) for i in ids), batch_size=2)
+
+    assert collection.batches == [2, 2, 1]
+    assert (result.matched, result.modified) == (3, 3)
+    assert [pos for pos, _ in result.failed] == [1, 4]
+
+
+def test_bulk_update_on_mongomock(users: Any) -> None:
+    if not mongodb_pymongo._bulk_write_supported():
+        pytest.skip("this mongomock cannot run PyMongo's UpdateOne")
+    create_users({"username": f"u{i}", "email": "e@example.com", "age": 1} for i in range(3))
+    ids = [str(doc["_id"]) for doc in users.find()]
+
+    result = bulk_update([increment_age_op(i) for i in ids] + [increment_age_op(str(ObjectId()))])
+
+    assert (result.matched, result.modified) == (3, 3)
+    assert sorted(doc["profile"]["age"] for doc in users.find()) == [2, 2, 2]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from qdrant_client import QdrantClient
+
+from src import qdrant_pipeline
+from src.qdrant_manifest import SyncManifest
+
+DIM = 4
+
+
+def _write_parquet(path: Path, n_rows: int, row_group_size: int = 4) -> Path:
+    rng = np.random.default_rng(0)
+    table = pa.table(
+        {
+            "article_id": np.arange(n_rows) // 2,
+            "chunk_index": np.arange(n_rows) % 2,
+            "chunk_text": [f"chunk {i}" for i in range(n_rows)],
+            "embedding": list(rng.standard_normal((n_rows, DIM)).astype(np.float32)),
+        }
+    )
+    pq.write_table(table, path, row_group_size=row_group_size)
+    return path
+
+
+def test_pending_row_groups_follow_fingerprints(tmp_path: Path) -> None:
+    parquet = str(_write_parquet(tmp_path / "chunks.parquet", 10))
+    manifest = SyncManifest("chunks", tmp_path / "manifest.json")
+    assert manifest.pending_row_groups(parquet) == [0, 1, 2]
+
+    manifest.mark_row_groups(parquet, [0, 1])
+    reopened = SyncManifest("chunks", tmp_path / "manifest.json")
+    assert reopened.pending_row_groups(parquet) == [2]
+
+    # Appended rows change only the last group's fingerprint.
+    _write_parquet(tmp_path / "chunks.parquet", 12)
+    assert reopened.pending_row_groups(parquet) == [2]
+    assert SyncManifest("other", tmp_path / "manifest.json").is_empty()
+
+
+def test_saving_drops_the_legacy_point_id_file(tmp_path: Path) -> None:
+    legacy = tmp_path / "manifest.ids"
+    legacy.write_text("a\nb\n", encoding="utf-8")
+
+    SyncManifest("chunks", tmp_path / "manifest.json").save()
+
+    assert not legacy.exists()
+
+
+@pytest.fixture
+def qdrant(monkeypatch: pytest.MonkeyPatch) -> QdrantClient:
+    client = QdrantClient(":memory:")
+    monkeypatch.setattr(qdrant_pipeline, "EMBEDDING_DIM", DIM)
+    monkeypatch.setattr(qdrant_pipeline, "get_gemini_client", lambda: None)
+    monkeypatch.setattr(qdrant_pipeline, "get_qdrant_client", lambda: client)
+    return client
+
+
+def test_sync_resumes_a_partly_upserted_row_group(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, qdrant: QdrantClient
+) -> None:
+    parquet = str(_write_parquet(tmp_path / "chunks.parquet", 10))
+    monkeypatch.setattr(qdrant_pipeline, "DATA_PARQUET", parquet)
+    manifest = SyncManifest(qdrant_pipeline.QDRANT_COLLECTION, tmp_path / "manifest.json")
+    upserts: list[int] = []
+    upsert = qdrant.upsert
+
+    def counting_upsert(collection_name: str, points: object) -> object:
+        upserts.append(len(points.ids))  # type: ignore[attr-defined]
+        return upsert(collection_name=collection_name, points=points)
+
+    monkeypatch.setattr(qdrant, "upsert", counting_upsert)
+
+    # A run that stopped after the first upsert batch and recorded no row group.
+    qdrant_pipeline.ensure_collection(qdrant)
+    first = pq.ParquetFile(parquet).read_row_group(0).to_batches()[0].slice(0, 3)
+    ids = qdrant_pipeline.make_point_ids(
+        first.column("article_id").to_pylist(), first.column("chunk_index").to_pylist()
+    )
+    upsert(
+        collection_name=qdrant_pipeline.QDRANT_COLLECTION,
+        points=qdrant_pipeline._batch_to_points(first, ids, None),
+    )
+
+    qdrant_pipeline.sync_chunks_to_qdrant(manifest=manifest, batch_size=4)
+
+    assert sum(upserts) == 7
+    assert qdrant.count(qdrant_pipeline.QDRANT_COLLECTION).count == 10
+    assert manifest.pending_row_groups(parquet) == []
+
+    upserts.clear()
+    qdrant_pipeline.sync_chunks_to_qdrant(manifest=manifest, batch_size=4)
+    assert upserts == []
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+import mongomock
+import pytest
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+from pymongo.results import BulkWriteResult
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, selectinload
+
+from src.models.sql_models import Author, Base, ScientificArticle
+
+# The module imports the MariaDB engine module, which needs the driver installed.
+pytest.importorskip("mariadb")
+
+from src.usecases import transfer_mariadb_to_mongo  # noqa: E402
+from src.usecases.transfer_mariadb_to_mongo import _bulk_upsert  # noqa: E402
+
+
+class _MongomockBulk:
+    """Runs unordered UpdateOne batches one op at a time against mongomock.
+
+    mongomock 4.3 cannot take PyMongo's UpdateOne, so this adapter replays each
+    op with update_one and reports results the way PyMongo does.
+    """
+
+    def __init__(self, collection: Any, fail_batches: bool = False) -> None:
+        self.collection = collection
+        self.fail_batches = fail_batches
+        self.batches: list[int] = []
+
+    def bulk_write(self, ops: list[UpdateOne], ordered: bool) -> BulkWriteResult:
+        assert not ordered
+        self.batches.append(len(ops))
+        if self.fail_batches:
+            raise PyMongoError("connection reset")
+        details: dict[str, Any] = {"nUpserted": 0, "nModified": 0, "writeErrors": []}
+        for i, op in enumerate(ops):
+            try:
+                result = self.collection.update_one(op._filter, op._doc, upsert=True)
+            except DuplicateKeyError as exc:
+                details["writeErrors"].append({"index": i, "code": 11000, "errmsg": str(exc)})
+                continue
+            details["nUpserted"] += result.upserted_id is not None
+            details["nModified"] += result.modified_count
+        if details["writeErrors"]:
+            raise BulkWriteError(details)
+        return BulkWriteResult(details, acknowledged=True)
+
+
+class _Store:
+    def iter_converted(self, paths: Sequence[str], fmt: str) -> Iterator[tuple[str, str | None]]:
+        for path in paths:
+            yield path, None if path.startswith("broken") else f"# {path}"
+
+
+@pytest.fixture
+def session(monkeypatch: pytest.MonkeyPatch) -> Iterator[Session]:
+    monkeypatch.setattr(transfer_mariadb_to_mongo, "get_document_store", _Store)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        author = Author(full_name="Ada", title="Dr")
+        session.add(author)
+        session.flush()
+        for i in range(7):
+            path = "broken.pdf" if i == 3 else f"{i}.pdf"
+            session.add(
+                ScientificArticle(
+                    title=f"Paper {i}", summary="s", file_path=path, arxiv_id=str(i), author=author
+                )
+            )
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _upsert(
+    session: Session, collection: _MongomockBulk
+) -> transfer_mariadb_to_mongo.BulkExportStats:
+    stmt = (
+        select(ScientificArticle)
+        .options(selectinload(ScientificArticle.author))
+        .order_by(ScientificArticle.id)
+    )
+    return _bulk_upsert(collection, session, stmt, batch_size=3, max_workers=2)  # type: ignore[arg-type]
+
+
+def test_bulk_upsert_inserts_then_updates_by_arxiv_id(session: Session) -> None:
+    mongo = mongomock.MongoClient().db.articles
+    mongo.insert_one({"arxiv_id": "0", "title": "stale"})
+    bulk = _MongomockBulk(mongo)
+
+    stats = _upsert(session, bulk)
+
+    assert sorted(bulk.batches) == [1, 2, 3]
+    assert (stats.batches, stats.upserted, stats.modified) == (3, 5, 1)
+    assert stats.failed == ["3"]
+    assert mongo.count_documents({}) == 6
+    assert mongo.find_one({"arxiv_id": "0"})["title"] == "Paper 0"
+
+    stats = _upsert(session, bulk)
+    assert (stats.upserted, stats.modified) == (0, 0)
+    assert mongo.count_documents({}) == 6
+
+
+def test_bulk_upsert_reports_write_errors_and_failed_batches(session: Session) -> None:
+    mongo = mongomock.MongoClient().db.articles
+    mongo.create_index("file_path", unique=True)
+    mongo.insert_one({"arxiv_id": "other", "file_path": "5.pdf"})
+
+    stats = _upsert(session, _MongomockBulk(mongo))
+
+    assert sorted(stats.failed) == ["3", "5"]
+    assert stats.upserted == 5
+    assert mongo.count_documents({}) == 6
+
+    stats = _upsert(session, _MongomockBulk(mongo, fail_batches=True))
+    assert (stats.upserted, stats.modified) == (0, 0)
+    assert sorted(stats.failed) == ["0", "1", "2", "3", "4", "5", "6"]